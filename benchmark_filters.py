@@ -0,0 +1,102 @@
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+from tabulate import tabulate
+
+sys.path.append(".")
+
+from src.backend.core.filter import FilterEngine
+
+# --- CONFIGURATION ---
+# Synthetic tree: FANOUT^DEPTH leaf directories, FILES_PER_DIR files in each directory
+FANOUT = 8
+DEPTH = 3
+FILES_PER_DIR = 40
+EXTENSIONS = ["pdf", "jpg", "txt", "mp4", "py"]
+FILTERS = {"extension": "pdf", "min_size": "1 kb"}
+
+
+def build_tree(root: Path, depth: int):
+    """Creates a deterministic synthetic tree of small files."""
+    for i in range(FILES_PER_DIR):
+        ext = EXTENSIONS[i % len(EXTENSIONS)]
+        (root / f"file_{i}.{ext}").write_bytes(b"\0" * (512 * (i % 7)))
+    if depth == 0:
+        return
+    for d in range(FANOUT):
+        sub = root / f"dir_{d}"
+        sub.mkdir()
+        build_tree(sub, depth - 1)
+
+
+def simulate_latency(ms: float):
+    """
+    Adds a fixed delay to every directory listing, approximating a network mount
+    where each round-trip dominates. The sleep releases the GIL, like real I/O waits.
+    """
+    real_scandir = os.scandir
+
+    def slow_scandir(path="."):
+        time.sleep(ms / 1000)
+        return real_scandir(path)
+
+    os.scandir = slow_scandir
+
+
+def time_backend(root: Path, backend: str, workers: int, runs: int):
+    """Returns (best seconds, result count) over several runs."""
+    engine = FilterEngine(backend=backend, workers=workers)
+    best = float("inf")
+    count = 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        results = engine.apply_filters(str(root), FILTERS, recursive=True)
+        best = min(best, time.perf_counter() - start)
+        count = len(results)
+    return best, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serial vs parallel FilterEngine walk benchmark.")
+    parser.add_argument("--root", help="Existing directory to scan instead of a synthetic tree "
+                                       "(e.g. a network mount).")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--workers", type=int, nargs="+", default=[4, 8, 16, 32])
+    parser.add_argument("--latency-ms", type=float, default=0,
+                        help="Simulated per-directory listing latency (network mount stand-in).")
+    args = parser.parse_args()
+
+    tmp = None
+    if args.root:
+        root = Path(args.root)
+    else:
+        tmp = Path(tempfile.mkdtemp(prefix="filter_bench_"))
+        root = tmp
+        print(f"Building synthetic tree in {root} ...")
+        build_tree(root, DEPTH)
+
+    if args.latency_ms:
+        simulate_latency(args.latency_ms)
+        print(f"Simulating {args.latency_ms} ms latency per directory listing")
+
+    try:
+        serial_time, serial_count = time_backend(root, "serial", 1, args.runs)
+        rows = [["serial", 1, f"{serial_time * 1000:.1f}", serial_count, "1.00x"]]
+
+        for w in args.workers:
+            t, count = time_backend(root, "parallel", w, args.runs)
+            flag = "" if count == serial_count else " (MISMATCH)"
+            rows.append(["parallel", w, f"{t * 1000:.1f}", f"{count}{flag}", f"{serial_time / t:.2f}x"])
+
+        print(tabulate(rows, headers=["Backend", "Workers", "Best ms", "Matches", "Speedup"]))
+    finally:
+        if tmp:
+            shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    main()
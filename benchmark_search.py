@@ -0,0 +1,80 @@
+import sys
+import time
+import random
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+from tabulate import tabulate
+
+sys.path.append(".")
+
+from src.backend.core.catalog import FileCatalog
+
+# --- CONFIGURATION ---
+# Synthetic names: camera-style, hash-style and "word_word_N.ext" documents
+VOCABULARY = 20_000
+SYLLABLES = ["ka", "lo", "mi", "ne", "ru", "sa", "to", "vi", "ze", "bo", "dan", "fer",
+             "gul", "hin", "jor", "kel", "mar", "nop", "qui", "sel", "tor", "vem", "wix", "yal"]
+EXTENSIONS = ["pdf", "jpg", "txt", "docx"]
+QUERIES = ["report", "budget_", "img_123", "img", "tax", "rpeort", "invocie", "ta", "zzzqqq"]
+
+
+def build_catalog(root: Path, count: int) -> FileCatalog:
+    """Fills a catalog with 'count' synthetic file rows (no files are created on disk)."""
+    rng = random.Random(1)
+    words = ["".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(VOCABULARY)]
+    words += ["report", "invoice", "budget", "holiday", "tax"]
+
+    catalog = FileCatalog(db_path=str(root / "catalog.db"), roots=[str(root)])
+    rows = []
+    for i in range(count):
+        r = rng.random()
+        if r < 0.2:
+            name = f"IMG_{rng.randint(0, 99999):05d}.jpg"
+        elif r < 0.3:
+            name = f"{rng.getrandbits(64):016x}.js"
+        else:
+            name = f"{rng.choice(words)}_{rng.choice(words)}_{rng.randint(0, 999)}.{rng.choice(EXTENSIONS)}"
+        d = str(root / f"dir_{i % 5000}")
+        rows.append((f"{d}/{name}", name, name.lower(), d, 0, 1, None, 0, 0.0, 0.0, i))
+
+    placeholders = ", ".join("?" * len(catalog.COLUMNS))
+    with catalog._conn:
+        catalog._conn.executemany(
+            f"INSERT OR REPLACE INTO files ({', '.join(catalog.COLUMNS)}) VALUES ({placeholders})", rows)
+    return catalog
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ranked filename search latency over a synthetic catalog.")
+    parser.add_argument("--names", type=int, default=1_000_000)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("queries", nargs="*", default=QUERIES)
+    args = parser.parse_args()
+
+    tmp = Path(tempfile.mkdtemp(prefix="search_bench_"))
+    try:
+        print(f"Cataloguing {args.names} synthetic names ...")
+        start = time.perf_counter()
+        catalog = build_catalog(tmp, args.names)
+        print(f"Built in {time.perf_counter() - start:.1f}s")
+
+        rows = []
+        for term in args.queries:
+            best = float("inf")
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                total, hits = catalog.search_ranked(term)
+                best = min(best, time.perf_counter() - start)
+            top = hits[0][2] if hits else "-"
+            rows.append([term, total, f"{top} ({hits[0][0]})" if hits else top, f"{best * 1000:.1f}"])
+
+        print(tabulate(rows, headers=["Term", "Matches", "Top result", "Best ms"]))
+        catalog.close()
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    main()
@@ -19,14 +19,87 @@ function App() {
   // Context Menu State
   const [contextMenu, setContextMenu] = useState(null); // { x, y, item }
   const [actionModal, setActionModal] = useState({ isOpen: false, type: null, item: null });
+  const [activeSearch, setActiveSearch] = useState(null); // search_id of a streaming content search
+  const [runningAction, setRunningAction] = useState(null); // action_id of a confirmed action still executing
 
-  // Expose handleResponse to Python
+  // Expose handleResponse / handleProgress / handleActionResult / handleSearchResults to Python
   useEffect(() => {
     if (window.eel) {
       window.eel.expose(handleResponse, 'handle_response');
+      window.eel.expose(handleProgress, 'handle_progress');
+      window.eel.expose(handleActionResult, 'handle_action_result');
+      window.eel.expose(handleSearchResults, 'handle_search_results');
     }
   }, []);
 
+  // Batch progress pushed from Python while a confirmed action runs
+  const handleProgress = (progress) => {
+    const mbps = (progress.throughput / (1024 * 1024)).toFixed(1);
+    const eta = progress.eta !== null && progress.eta !== undefined ? `${Math.round(progress.eta)}s` : '--';
+    if (progress.unit === 'bytes') {
+      // Single large copy/archive: byte progress instead of item counts
+      const mb = (n) => (n / (1024 * 1024)).toFixed(0);
+      const verb = { compress_item: 'Compressing', extract_archive: 'Extracting', download_file: 'Downloading' }[progress.action] || 'Copying';
+      const amount = progress.total ? `${mb(progress.done)}/${mb(progress.total)}` : mb(progress.done);  // tar: total unknown
+      const item = progress.current ? ` ${progress.current}` : '';
+      setStatus(`${verb}${item} ${amount} MB · ${mbps} MB/s · ETA ${eta}`);
+      return;
+    }
+    setStatus(`Executing ${progress.done}/${progress.total} · ${mbps} MB/s · ETA ${eta}`);
+  };
+
+  // Content-search pages pushed from Python (see start_text_search); one message per search grows as pages arrive
+  const handleSearchResults = (page) => {
+    const lines = page.records.map(r => `${r.path}:${r.line}: ${r.text}`);
+    if (page.status === 'ERROR') lines.push(`Error: ${page.message}`);
+    setMessages(prev => {
+      const index = prev.findIndex(m => m.searchId === page.search_id);
+      if (index < 0) {
+        return [...prev, { role: 'assistant', searchId: page.search_id, content: lines.join('\n') || 'No matches found.' }];
+      }
+      if (!lines.length) return prev;
+      const updated = [...prev];
+      updated[index] = { ...updated[index], content: `${updated[index].content}\n${lines.join('\n')}` };
+      return updated;
+    });
+
+    if (page.done) {
+      setActiveSearch(null);
+      if (page.status === 'ERROR') {
+        setStatus("Error");
+      } else {
+        const verb = page.status === 'CANCELLED' ? 'Search stopped' : 'Search finished';
+        setStatus(`${verb}: ${page.total} lines in ${page.files} files (${page.elapsed}s)`);
+      }
+    } else {
+      setStatus(`Searching... (Esc to stop)`);
+    }
+  };
+
+  const startSearch = async (path, text) => {
+    if (!window.eel) return;
+    setMessages(prev => [...prev, { role: 'user', content: `Searching for "${text}" in ${path.split('/').pop()}...` }]);
+    const result = await window.eel.start_text_search(path, text)();
+    if (result.status === 'STARTED') {
+      // A stale id (search already done) only makes Esc a no-op
+      setActiveSearch(result.search_id);
+    } else {
+      setMessages(prev => [...prev, { role: 'assistant', content: result.message }]);
+    }
+  };
+
+  // Esc stops a running search; results already shown stay
+  useEffect(() => {
+    if (!activeSearch) return;
+    const onKeyDown = async (e) => {
+      if (e.key === 'Escape' && window.eel) {
+        await window.eel.cancel_search(activeSearch)();
+      }
+    };
+    window.addEventListener('keydown', onKeyDown);
+    return () => window.removeEventListener('keydown', onKeyDown);
+  }, [activeSearch]);
+
   // Update cache when files are moved/renamed
   const updateFileCache = (oldPath, newPath) => {
       if (!oldPath || !newPath) return;
@@ -140,7 +213,7 @@ function App() {
       }
 
       // Manual Actions that require Modal
-      if (['move_file', 'copy_file', 'rename_item', 'create_symlink', 'delete_file', 'compress_item'].includes(action)) {
+      if (['move_file', 'copy_file', 'rename_item', 'create_symlink', 'delete_file', 'compress_item', 'search_text'].includes(action)) {
           setActionModal({
               isOpen: true,
               type: action,
@@ -215,6 +288,11 @@ function App() {
 
   const handleModalConfirm = (inputValue) => {
       const { type, item } = actionModal;
+      if (type === 'search_text') {
+          setActionModal({ isOpen: false, type: null, item: null });
+          if (inputValue) startSearch(item.path, inputValue);
+          return;
+      }
       const params = { source: item.path };
       
       if (type === 'rename_item') {
@@ -312,18 +390,18 @@ function App() {
   };
 
   const confirmAction = async (updatedBatchTargets = null) => {
-    if (!pendingConfirmation) return;
+    if (!pendingConfirmation || runningAction) return;
     setStatus("Executing...");
     
     try {
       if (window.eel) {
-        const result = await window.eel.execute_confirmed_action(pendingConfirmation.action_id, updatedBatchTargets)();
-        setMessages(prev => [...prev, { role: 'assistant', content: result.message }]);
-        
-        // Trigger cache update if success
-        if (result.status === 'SUCCESS' && result.intent) {
-             handleFileOperationSuccess(result.intent);
+        // Runs in the background; the report arrives through handleActionResult
+        const started = await window.eel.execute_confirmed_action(pendingConfirmation.action_id, updatedBatchTargets)();
+        if (started.status === 'STARTED') {
+          setRunningAction(started.action_id);
+          return;
         }
+        setMessages(prev => [...prev, { role: 'assistant', content: started.message }]);
       }
     } catch (e) {
         setMessages(prev => [...prev, { role: 'assistant', content: "Execution failed." }]);
@@ -333,8 +411,28 @@ function App() {
     setStatus("Ready");
   };
 
+  // Final report of a confirmed action (including how many items were cancelled)
+  const handleActionResult = (result) => {
+    setMessages(prev => [...prev, { role: 'assistant', content: result.message }]);
+    if (result.status === 'SUCCESS' && result.intent) {
+      handleFileOperationSuccess(result.intent);
+    }
+    setRunningAction(null);
+    setPendingConfirmation(null);
+    setStatus("Ready");
+  };
+
   const cancelAction = async () => {
     if (!pendingConfirmation) return;
+
+    if (runningAction) {
+      // Already executing: ask it to stop and wait for its report
+      if (window.eel) {
+        await window.eel.cancel_action(runningAction)();
+      }
+      setStatus("Stopping...");
+      return;
+    }
     
     if (window.eel) {
         await window.eel.cancel_action(pendingConfirmation.action_id)();
@@ -98,6 +98,7 @@ const ActionModal = ({ action, item, onClose, onConfirm }) => {
       case 'create_symlink': return 'Create Shortcut';
       case 'delete_file': return 'Delete Item';
       case 'compress_item': return 'Compress Item';
+      case 'search_text': return 'Search Contents';
       default: return 'Action';
     }
   };
@@ -110,6 +111,7 @@ const ActionModal = ({ action, item, onClose, onConfirm }) => {
       case 'create_symlink': return `Where should the shortcut be created?`;
       case 'delete_file': return `Are you sure you want to delete "${item.text}"? This cannot be undone.`;
       case 'compress_item': return `Enter format (zip, tar, gztar) for "${item.text}":`;
+      case 'search_text': return `Find text in the files under "${item.text}":`;
       default: return '';
     }
   };
@@ -118,6 +120,7 @@ const ActionModal = ({ action, item, onClose, onConfirm }) => {
   const isRename = action === 'rename_item';
   const isDelete = action === 'delete_file';
   const isCompress = action === 'compress_item';
+  const isSearch = action === 'search_text';
 
   return (
     <div className="fixed inset-0 z-[100] flex items-center justify-center bg-black/60 backdrop-blur-sm animate-in fade-in duration-200">
@@ -141,7 +144,7 @@ const ActionModal = ({ action, item, onClose, onConfirm }) => {
           {!isDelete && (
             <div className="relative">
               <div className="absolute left-3 top-1/2 -translate-y-1/2 text-zinc-500">
-                {isRename ? <Type size={16} /> : <FolderInput size={16} />}
+                {isRename || isSearch ? <Type size={16} /> : <FolderInput size={16} />}
               </div>
               <input
                 ref={inputRef}
@@ -152,6 +155,7 @@ const ActionModal = ({ action, item, onClose, onConfirm }) => {
                 placeholder={
                     isRename ? "New name" : 
                     isCompress ? "zip" :
+                    isSearch ? "Text to find" :
                     "Destination path (e.g. /Users/name/Desktop)"
                 }
                 className="w-full bg-zinc-950 border border-zinc-800 rounded-lg py-2 pl-10 pr-3 text-sm text-zinc-200 focus:outline-none focus:border-indigo-500/50 focus:ring-1 focus:ring-indigo-500/50 placeholder:text-zinc-600"
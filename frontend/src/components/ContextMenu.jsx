@@ -1,5 +1,5 @@
 import React, { useEffect, useRef, useState } from 'react';
-import { FolderOpen, Copy, Trash2, Eye, Terminal, ChevronRight, Move, Link, MoreHorizontal, Edit2, FileText, Info, Archive, Hash } from 'lucide-react';
+import { FolderOpen, Copy, Trash2, Eye, Terminal, ChevronRight, Move, Link, MoreHorizontal, Edit2, FileText, Info, Archive, Hash, Search } from 'lucide-react';
 
 const ContextMenu = ({ x, y, item, onClose, onAction }) => {
   const menuRef = useRef(null);
@@ -70,6 +70,16 @@ const ContextMenu = ({ x, y, item, onClose, onAction }) => {
         <span>Copy Path</span>
       </button>
 
+      {isFolder && (
+        <button 
+          onClick={() => onAction('search_text', item)}
+          className="w-full px-3 py-1.5 text-left text-sm text-zinc-300 hover:bg-zinc-800 hover:text-white flex items-center gap-2 transition-colors"
+        >
+          <Search size={14} />
+          <span>Search Contents...</span>
+        </button>
+      )}
+
       {/* File Operations Submenu */}
       <div 
         className="relative"
@@ -1,9 +1,49 @@
 import React, { useState, useEffect } from 'react';
 import { FileText, Calendar, HardDrive, Folder, Image as ImageIcon, Zap, Terminal, AppWindow, AlertCircle } from 'lucide-react';
 
+const PAGE_SIZE = 200;
+
+const formatSize = (size) => {
+  if (size === null || size === undefined || size < 0) return '';
+  const units = ['B', 'KB', 'MB', 'GB'];
+  let i = 0;
+  while (size >= 1024 && i < units.length - 1) {
+    size /= 1024;
+    i++;
+  }
+  return i === 0 ? `${size} B` : `${size.toFixed(1)} ${units[i]}`;
+};
+
 const ContextPane = ({ selectedItem }) => {
   const [preview, setPreview] = useState(null);
   const [loading, setLoading] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
+
+  const fetchDirectoryPage = async (path, offset) => {
+    const page = await window.eel.list_directory_page(path, offset, PAGE_SIZE, 'name', null, true)();
+    if (page.status !== 'OK') {
+      return { type: 'error', content: page.message || "Failed to list folder" };
+    }
+    return { type: 'directory', ...page };
+  };
+
+  const loadMore = async () => {
+    if (!preview || preview.type !== 'directory' || !preview.has_more || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const next = await fetchDirectoryPage(preview.path, preview.offset + preview.entries.length);
+      if (next.type === 'directory') {
+        // Ignore the page if another item was selected while it loaded.
+        setPreview(prev => (prev?.type === 'directory' && prev.path === next.path
+          ? { ...next, offset: prev.offset, entries: [...prev.entries, ...next.entries] }
+          : prev));
+      }
+    } catch (e) {
+      console.error("Listing error:", e);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
 
   useEffect(() => {
     const fetchPreview = async () => {
@@ -12,7 +52,9 @@ const ContextPane = ({ selectedItem }) => {
         setPreview(null);
         try {
           if (window.eel) {
-            const result = await window.eel.get_file_preview(selectedItem.path)();
+            const result = selectedItem.type === 'folder'
+              ? await fetchDirectoryPage(selectedItem.path, 0)
+              : await window.eel.get_file_preview(selectedItem.path)();
             setPreview(result);
           }
         } catch (e) {
@@ -99,6 +141,34 @@ const ContextPane = ({ selectedItem }) => {
              <div className="w-full h-full p-4 overflow-auto text-xs font-mono text-zinc-400 whitespace-pre-wrap text-left">
                {preview.content}
              </div>
+           ) : preview?.type === 'directory' ? (
+             <div className="w-full h-full p-4 overflow-auto text-left">
+               <h4 className="text-xs font-semibold text-zinc-500 mb-2 uppercase">
+                 Folder Contents ({preview.total})
+               </h4>
+               <ul className="space-y-1">
+                 {preview.entries.map((entry) => (
+                   <li key={entry.name} className="text-xs text-zinc-400 flex items-center gap-2">
+                     {entry.is_dir
+                       ? <Folder size={12} className="text-zinc-500 shrink-0" />
+                       : <span className="w-1 h-1 rounded-full bg-zinc-600 shrink-0"></span>}
+                     <span className="truncate flex-1" title={entry.name}>{entry.name}</span>
+                     {!entry.is_dir && <span className="text-zinc-600 shrink-0">{formatSize(entry.size)}</span>}
+                   </li>
+                 ))}
+               </ul>
+               {preview.has_more && (
+                 <button
+                   onClick={loadMore}
+                   disabled={loadingMore}
+                   className="mt-3 w-full text-xs py-1.5 rounded bg-zinc-800 hover:bg-zinc-700 text-zinc-300 disabled:opacity-50"
+                 >
+                   {loadingMore
+                     ? "Loading..."
+                     : `Load more (${preview.total - preview.offset - preview.entries.length} remaining)`}
+                 </button>
+               )}
+             </div>
            ) : preview?.type === 'list' ? (
              <div className="w-full h-full p-4 overflow-auto text-left">
                <h4 className="text-xs font-semibold text-zinc-500 mb-2 uppercase">Folder Contents</h4>
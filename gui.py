@@ -2,6 +2,7 @@ import sys
 import os
 import eel
 import threading
+import uuid
 import subprocess
 import base64
 import mimetypes
@@ -82,20 +83,29 @@ def process_user_input(user_input):
 def execute_confirmed_action(action_id, updated_batch_targets=None):
     """
     Called when user clicks 'Confirm' in the UI.
+    Runs the action on a background thread (like process_user_input) so the UI,
+    and a Cancel click, are handled while it runs. Progress is pushed through
+    handle_progress and the final report through handle_action_result.
     """
     print(f"Executing confirmed action: {action_id}")
-    try:
-        result = assistant.execute_confirmed_action(action_id, updated_batch_targets)
-        
-        # Log the success
-        # Note: We'd ideally want the original intent here for logging, 
-        # but the assistant handles the execution. 
-        # We can log a generic confirmation message.
-        logger.log_action("User Confirmed Action", {"action_id": action_id}, result.get('message'))
-        
-        return result
-    except Exception as e:
-        return {"status": "ERROR", "message": str(e)}
+
+    def push_progress(progress):
+        # Stream batch progress to the frontend while the action runs
+        eel.handle_progress({**progress, "action_id": action_id})
+
+    def run_action():
+        try:
+            result = assistant.execute_confirmed_action(action_id, updated_batch_targets, push_progress)
+            # Note: We'd ideally want the original intent here for logging,
+            # but the assistant handles the execution.
+            logger.log_action("User Confirmed Action", {"action_id": action_id}, result.get('message'))
+        except Exception as e:
+            result = {"status": "ERROR", "message": str(e)}
+        eel.handle_action_result({**result, "action_id": action_id})
+
+    assistant.register_run(action_id)  # Cancel works from now on, even before the thread starts
+    threading.Thread(target=run_action, daemon=True).start()
+    return {"status": "STARTED", "action_id": action_id}
 
 @eel.expose
 def cancel_action(action_id):
@@ -103,10 +113,56 @@ def cancel_action(action_id):
     Called when user clicks 'Cancel'.
     """
     print(f"Cancelled action: {action_id}")
+    # If the action is already running (e.g. a long batch), stop it
+    if assistant.cancel_running_action(action_id):
+        logger.log_action("User Cancelled Running Action", {"action_id": action_id}, "Cancelled by user")
+        return {"status": "CANCELLED", "message": "Stopping action..."}
+
     # We can just log this
     logger.log_action("User Cancelled Action", {"action_id": action_id}, "Cancelled by user")
     return {"status": "CANCELLED", "message": "Action cancelled."}
 
+@eel.expose
+def start_text_search(path, text, case_sensitive=True, page_size=50, max_results=5000):
+    """
+    Starts a streaming content search and returns its search_id at once.
+    Hits are pushed to the frontend in pages via handle_search_results:
+    {"search_id", "records": [{"path", "line", "text"}], "done": False}, then a
+    final page with "done": True and the summary. cancel_search(search_id) stops it.
+    """
+    if not text:
+        return {"status": "ERROR", "message": "Empty search text"}
+    search_id = str(uuid.uuid4())[:8]
+    print(f"Streaming search {search_id}: '{text}' in {path}")
+
+    def push_page(records):
+        eel.handle_search_results({
+            "search_id": search_id,
+            "records": [{"path": p, "line": n, "text": t} for p, n, t in records],
+            "done": False,
+        })
+
+    def run_search():
+        result = assistant.stream_text_search(search_id, path, text, push_page,
+                                              case_sensitive=case_sensitive,
+                                              page_size=page_size, max_results=max_results)
+        logger.log_action(f"Content search: {text}", {"path": path, "search_id": search_id},
+                          result.get("message") or f"{result.get('records', 0)} lines in {result.get('files', 0)} files")
+        eel.handle_search_results({**result, "search_id": search_id, "total": result.get("records", 0),
+                                   "records": [], "done": True})
+
+    threading.Thread(target=run_search, daemon=True).start()
+    return {"status": "STARTED", "search_id": search_id}
+
+@eel.expose
+def cancel_search(search_id):
+    """
+    Stops a streaming search; pages already sent stay on screen.
+    """
+    if assistant.cancel_running_action(search_id):
+        return {"status": "CANCELLED", "message": "Stopping search..."}
+    return {"status": "ERROR", "message": "Search is not running."}
+
 @eel.expose
 def get_system_stats():
     """
@@ -114,6 +170,26 @@ def get_system_stats():
     """
     return assistant.sys_info.get_system_specs()
 
+@eel.expose
+def get_index_status():
+    """
+    Returns the file catalog watcher's health: backend, backlog and lag.
+    """
+    return assistant.watcher.metrics()
+
+@eel.expose
+def list_directory_page(path, offset=0, limit=200, sort_by="name", ascending=None, details=True):
+    """
+    Returns one page of a folder listing for the file browser:
+    {"status": "OK", "total", "offset", "has_more", "entries": [{"name", "is_dir", "size", "mtime"}], ...}.
+    Pages are cut from a cached scan, so paging through a huge folder stays fast.
+    """
+    try:
+        page = assistant.files.list_directory_page(path, offset, limit, sort_by, ascending, details)
+    except Exception as e:
+        return {"status": "ERROR", "message": str(e)}
+    return {"status": "OK", **page}
+
 @eel.expose
 def get_file_preview(path):
     """
@@ -385,6 +461,8 @@ def start_app():
         # Handle clean exit
         print("Exiting...")
         sys.exit(0)
+    finally:
+        assistant.close()
 
 if __name__ == "__main__":
     start_app()
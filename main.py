@@ -1,4 +1,5 @@
 import sys
+import threading
 
 # Add the current directory to Python path so 'src' imports work correctly
 sys.path.append(".")
@@ -12,6 +13,49 @@ except ImportError:
     from src.backend.utils.logger import AuditLogger
 
 
+def render_progress(progress: dict):
+    """
+    Renders a single, self-overwriting progress line. Batches report item counts;
+    single copies, archives and downloads report bytes (unit="bytes", see ByteProgress).
+    """
+    mb = lambda n: n / (1024 * 1024)
+    rate = mb(progress['throughput'])
+    eta = f"{progress['eta']:.0f}s" if progress.get('eta') is not None else "--"
+    if progress.get('unit') == "bytes":
+        verb = {"compress_item": "Compressing", "extract_archive": "Extracting",
+                "download_file": "Downloading"}.get(progress.get('action'), "Copying")
+        # A tar stream's total is unknown (0): show only what is done
+        amount = f"{mb(progress['done']):.1f}/{mb(progress['total']):.1f}" if progress['total'] \
+            else f"{mb(progress['done']):.1f}"
+        line = f"   {verb} {amount} MB @ {rate:.1f} MB/s | ETA {eta}"
+    else:
+        line = (f"   [{progress['done']}/{progress['total']}] "
+                f"{mb(progress['bytes']):.1f} MB @ {rate:.1f} MB/s | failed: {progress['failed']} | ETA {eta}")
+    end = "\n" if progress['done'] == progress['total'] else ""
+    print(f"\r{line:<79}", end=end, flush=True)
+
+
+def run_with_progress(assistant, action_id: str) -> dict:
+    """
+    Executes a confirmed action in a worker thread so Ctrl+C can cancel it.
+    Cancelling lets in-flight items finish and skips the rest.
+    """
+    outcome = {}
+
+    def worker():
+        outcome.update(assistant.execute_confirmed_action(action_id, progress_callback=render_progress))
+
+    t = threading.Thread(target=worker, daemon=True)
+    t.start()
+    try:
+        t.join()
+    except KeyboardInterrupt:
+        print("\n⏹  Cancelling... (waiting for in-flight items)")
+        assistant.cancel_running_action(action_id)
+        t.join()
+    return outcome
+
+
 def main():
     print("--- OS Assistant Initializing ---")
 
@@ -70,9 +114,9 @@ def main():
                 confirm = input("   Are you sure you want to proceed? (y/n): ").strip().lower()
 
                 if confirm in ['y', 'yes', 'ok', 'confirm']:
-                    print("🔄 Executing confirmed action...")
+                    print("🔄 Executing confirmed action... (Ctrl+C to stop)")
 
-                    final_result = assistant.execute_confirmed_action(action_id)
+                    final_result = run_with_progress(assistant, action_id)
                     final_msg = final_result.get('message')
 
                     logger.log_action(user_input, intent, f"[CONFIRMED] {final_msg}")
@@ -102,6 +146,8 @@ def main():
         except Exception as e:
             print(f"Critical Error: {e}")
 
+    assistant.close()
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
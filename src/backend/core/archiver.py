@@ -0,0 +1,565 @@
+import os
+import zlib
+import shutil
+import tarfile
+import zipfile
+import tempfile
+import threading
+from collections import deque
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Dict, List, Optional, Callable, Iterator
+
+from src.backend.core.copier import ByteProgress
+from src.backend.core.atomic import atomic_rewrite
+
+
+class ArchiveCancelled(Exception):
+    """Raised when archiving or extraction is stopped through its cancel_event; partial output is removed."""
+
+
+class ArchiveRejected(Exception):
+    """Raised when an archive breaks an extraction limit or has unsafe member paths; partial output is removed."""
+
+
+class ArchiveEngine:
+    """
+    Builds zip archives with the deflate work spread over a thread pool.
+
+    Members are cut into pieces: a whole small file, or a CHUNK of a large one.
+    Pieces are read and compressed independently on worker threads (zlib and
+    crc32 release the GIL while they run, so threads use every core without the
+    pickling a process pool would add) and written to the archive strictly in order.
+    The pieces of one large file form a single deflate stream, the way pigz does it:
+    each piece is primed with the previous 32 KiB as a preset dictionary and ends on
+    a sync flush, so the concatenation is one valid deflate stream (nearly as small
+    as a serial one) that any unzip tool reads. Per-piece CRCs are merged with crc32_combine.
+
+    Only a bounded window of pieces is in flight, so memory does not grow with
+    the archive, and nothing is staged in temp files: the archive is written once,
+    front to back, with each local header patched after its data (as zipfile does).
+    The central directory is written by zipfile itself. The archive goes to a temp
+    file beside the destination and replaces it only when complete, so a failed or
+    cancelled run never touches an existing archive.
+
+    Small jobs skip the pool, as does "store" mode, which only copies data and
+    is bound by the disks, not the CPU.
+    """
+
+    CHUNK = 4 * 1024 * 1024               # bytes of a large file per piece
+    BATCH_BYTES = 4 * 1024 * 1024         # small files are sent to workers in batches of this size
+    PARALLEL_BYTES = 8 * 1024 * 1024      # smaller jobs are compressed on the calling thread
+    PROGRESS_INTERVAL = 0.2
+    # Already-compressed formats: deflating them costs CPU and saves nothing
+    STORED_EXTENSIONS = {
+        ".jpg", ".jpeg", ".png", ".gif", ".webp", ".heic", ".mp3", ".aac", ".ogg", ".flac", ".m4a",
+        ".mp4", ".mkv", ".mov", ".avi", ".webm", ".zip", ".gz", ".tgz", ".bz2", ".xz", ".7z", ".rar",
+        ".zst", ".jar", ".apk", ".docx", ".xlsx", ".pptx", ".pdf",
+    }
+
+    # Extraction limits
+    MAX_MEMBERS = 100_000
+    MAX_TOTAL_BYTES = 64 * 1024 ** 3
+    MAX_RATIO = 250                       # uncompressed/compressed, for members of MIN_RATIO_BYTES or more
+    MIN_RATIO_BYTES = 1024 * 1024
+    RESERVE_BYTES = 256 * 1024 * 1024     # disk space extraction always leaves free
+    LARGE_MEMBER = 8 * 1024 * 1024        # zip members this large are written on worker threads
+    BLOCK = 1024 * 1024
+
+    def __init__(self, workers: Optional[int] = None, level: int = 6):
+        """workers: compression threads (default: CPU count). level: zlib level 1-9."""
+        self.workers = workers or os.cpu_count() or 1
+        self.level = level
+
+    def create_zip(self, src: str, archive: str, mode: str = "deflate",
+                   progress_callback: Optional[Callable[[Dict], None]] = None,
+                   cancel_event: Optional[threading.Event] = None) -> Dict:
+        """
+        Zips a file or folder (entries are named from the folder's own name down,
+        like shutil.make_archive). mode: "deflate" compresses everything except
+        STORED_EXTENSIONS; "store" compresses nothing (fast, for media folders).
+        progress_callback receives byte progress (see ByteProgress) over the input size.
+        Returns {"path", "files", "bytes", "compressed", "elapsed", "throughput", "workers"}.
+        """
+        if mode not in ("deflate", "store"):
+            raise ValueError(f"Unknown mode '{mode}'; use 'deflate' or 'store'.")
+        cancel_event = cancel_event or threading.Event()
+        entries = _list_entries(src)
+        total = sum(size for _, _, size, is_dir in entries if not is_dir)
+        progress = ByteProgress(total, progress_callback, self.PROGRESS_INTERVAL, action="compress_item")
+        use_pool = mode == "deflate" and self.workers > 1 and total >= self.PARALLEL_BYTES
+
+        pool = ThreadPoolExecutor(max_workers=self.workers) if use_pool else None
+        try:
+            with atomic_rewrite(archive) as out:
+                with zipfile.ZipFile(out, "w", allowZip64=True) as zf:
+                    files = self._write_entries(zf, entries, mode, pool, progress, cancel_event)
+                compressed = out.tell()
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+
+        progress.finish()
+        return {"path": archive, "files": files, "bytes": progress.done, "compressed": compressed,
+                "elapsed": round(progress.elapsed, 3), "throughput": round(progress.throughput, 1),
+                "workers": self.workers if use_pool else 1}
+
+    # ==========================================
+    # ASSEMBLY (calling thread)
+    # ==========================================
+
+    def _write_entries(self, zf: zipfile.ZipFile, entries: List[tuple], mode: str,
+                       pool: Optional[ThreadPoolExecutor], progress: ByteProgress,
+                       cancel_event: threading.Event) -> int:
+        members = []
+        for path, arcname, size, is_dir in entries:
+            zinfo = zipfile.ZipInfo.from_file(path, arcname, strict_timestamps=False)
+            zinfo.CRC = zinfo.compress_size = 0  # patched in after the data (from_file leaves them unset)
+            if is_dir:
+                zf.mkdir(zinfo)
+                continue
+            stored = mode == "store" or os.path.splitext(path)[1].lower() in self.STORED_EXTENSIONS
+            zinfo.compress_type = zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED
+            members.append((path, zinfo))
+
+        results = self._iter_pieces(members, pool, cancel_event)
+        for path, zinfo in members:
+            self._write_member(zf, zinfo, results, progress, cancel_event)
+        return len(members)
+
+    def _write_member(self, zf: zipfile.ZipFile, zinfo: zipfile.ZipInfo, results: Iterator[tuple],
+                      progress: ByteProgress, cancel_event: threading.Event):
+        """Writes one member from its pieces, then patches the local header."""
+        zip64 = zinfo.file_size * 1.05 > zipfile.ZIP64_LIMIT
+        fp = _begin_raw_member(zf, zinfo, zip64)
+
+        crc, size, compressed = 0, 0, 0
+        while True:
+            piece_crc, piece_size, data, last = next(results)
+            if cancel_event.is_set():
+                raise ArchiveCancelled()
+            fp.write(data)
+            crc = crc32_combine(crc, piece_crc, piece_size)
+            size += piece_size
+            compressed += len(data)
+            progress.advance(piece_size)
+            if last:
+                break
+
+        zinfo.CRC, zinfo.file_size, zinfo.compress_size = crc, size, compressed
+        if not zip64 and (size > zipfile.ZIP64_LIMIT or compressed > zipfile.ZIP64_LIMIT):
+            raise zipfile.LargeZipFile(f"'{zinfo.filename}' grew past 4GB while it was being archived.")
+        _end_raw_member(zf, zinfo, zip64)
+
+    def _iter_pieces(self, members: List[tuple], pool: Optional[ThreadPoolExecutor],
+                     cancel_event: threading.Event) -> Iterator[tuple]:
+        """Yields (crc, size, data, last_of_member) for every piece, in archive order."""
+        batches = _batch_pieces(members, self.CHUNK, self.BATCH_BYTES, self.level)
+        if pool is None:
+            for batch in batches:
+                yield from _compress_batch(batch)
+            return
+
+        window: deque = deque()
+        max_in_flight = self.workers * 2
+        for batch in batches:
+            window.append(pool.submit(_compress_batch, batch))
+            while len(window) >= max_in_flight:
+                yield from self._wait(window.popleft(), cancel_event)
+        while window:
+            yield from self._wait(window.popleft(), cancel_event)
+
+    @staticmethod
+    def _wait(future: Future, cancel_event: threading.Event) -> List[tuple]:
+        while True:
+            if cancel_event.is_set():
+                raise ArchiveCancelled()
+            try:
+                return future.result(timeout=0.1)
+            except TimeoutError:
+                continue
+
+    # ==========================================
+    # EXTRACTION
+    # ==========================================
+
+    def extract(self, archive: str, destination: str, progress_callback: Optional[Callable[[Dict], None]] = None,
+                cancel_event: Optional[threading.Event] = None) -> Dict:
+        """
+        Extracts a zip or tar (.tar, .tar.gz, .tar.bz2, .tar.xz) archive into destination,
+        streaming member by member, within these limits:
+        - at most MAX_MEMBERS members and MAX_TOTAL_BYTES of output, leaving RESERVE_BYTES free on the disk,
+        - no zip member of MIN_RATIO_BYTES or more expanding over MAX_RATIO times (tar: the whole archive),
+        - nothing may land outside destination (absolute paths, "..", links pointing out).
+        A zip's declared sizes are checked before anything is written; every archive is also held
+        to the bytes it actually produces. Only files and folders this call created are removed on
+        failure. Members that would overwrite an existing file are written to a temp file beside it
+        and swapped in only once the whole archive has been extracted, so a rejected, cancelled or
+        failed extraction leaves existing files untouched. Large zip members are written on worker threads
+        (tar is a single stream). progress_callback receives byte progress with the member being
+        written ("current"). Raises ArchiveRejected / ArchiveCancelled after removing what was extracted.
+        Returns {"path", "files", "bytes", "elapsed", "throughput"}.
+        """
+        cancel_event = cancel_event or threading.Event()
+        created: List[str] = []
+        replaced: List[tuple] = []  # (temp file, existing target) swapped in at the end
+        try:
+            _make_dirs(destination, created)
+            budget = _Budget(self, destination, os.path.getsize(archive))
+            if zipfile.is_zipfile(archive):
+                progress, files = self._extract_zip(archive, destination, budget, created, replaced,
+                                                    progress_callback, cancel_event)
+            elif tarfile.is_tarfile(archive):
+                progress, files = self._extract_tar(archive, destination, budget, created, replaced,
+                                                    progress_callback, cancel_event)
+            else:
+                raise ValueError(f"'{os.path.basename(archive)}' is not a zip or tar archive.")
+            for tmp, target in replaced:
+                os.replace(tmp, target)
+        except BaseException:
+            _remove_created(created)
+            raise
+
+        progress.finish()
+        return {"path": destination, "files": files, "bytes": progress.done,
+                "elapsed": round(progress.elapsed, 3), "throughput": round(progress.throughput, 1)}
+
+    def _extract_zip(self, archive: str, destination: str, budget: "_Budget", created: List[str],
+                     replaced: List[tuple], progress_callback, cancel_event: threading.Event) -> tuple:
+        with zipfile.ZipFile(archive) as zf:
+            infos = zf.infolist()
+            budget.check_listing(infos)
+            progress = ByteProgress(sum(i.file_size for i in infos), progress_callback,
+                                    self.PROGRESS_INTERVAL, action="extract_archive")
+            files = 0
+            window: deque = deque()
+            abort = threading.Event()  # stops members still being written on the pool after a failure
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                try:
+                    for info in infos:
+                        target = _safe_target(destination, info.filename)
+                        if target is None:
+                            continue
+                        if info.is_dir():
+                            _make_dirs(target, created)
+                            continue
+                        _make_dirs(os.path.dirname(target), created)
+                        output = _member_output(target, created, replaced)
+                        files += 1
+                        job = (zf.open(info), output, info.filename, budget, progress, cancel_event, abort)
+                        if self.workers > 1 and info.file_size >= self.LARGE_MEMBER:
+                            window.append(pool.submit(self._write_member_data, *job))
+                            while len(window) >= self.workers * 2:
+                                self._wait(window.popleft(), cancel_event)
+                        else:
+                            self._write_member_data(*job)
+                    while window:
+                        self._wait(window.popleft(), cancel_event)
+                except BaseException:
+                    abort.set()
+                    raise
+        return progress, files
+
+    def _extract_tar(self, archive: str, destination: str, budget: "_Budget", created: List[str],
+                     replaced: List[tuple], progress_callback, cancel_event: threading.Event) -> tuple:
+        progress = ByteProgress(0, progress_callback, self.PROGRESS_INTERVAL, action="extract_archive")
+        files = 0
+        data_filter = getattr(tarfile, "data_filter", None)  # Python 3.11.4+
+        with tarfile.open(archive, mode="r|*") as tf:
+            for member in tf:
+                budget.count_member()
+                if cancel_event.is_set():
+                    raise ArchiveCancelled()
+                if data_filter is not None:
+                    try:
+                        member = data_filter(member, destination)
+                    except tarfile.FilterError as e:
+                        raise ArchiveRejected(str(e))
+                target = _safe_target(destination, member.name)
+                if target is None:
+                    continue
+                if member.isdir():
+                    _make_dirs(target, created)
+                    continue
+                _make_dirs(os.path.dirname(target), created)
+                if member.isreg():
+                    output = _member_output(target, created, replaced)
+                    files += 1
+                    self._write_member_data(tf.extractfile(member), output, member.name, budget,
+                                            progress, cancel_event)
+                    if member.mode is not None:
+                        os.chmod(output, member.mode & 0o777)
+                    os.utime(output, (member.mtime, member.mtime))
+                elif member.issym() or member.islnk():
+                    if data_filter is None:
+                        raise ArchiveRejected(f"links need Python 3.11.4+ to be checked: '{member.name}'")
+                    output = _member_output(target, created, replaced)
+                    if output != target:
+                        # tarfile would unlink the existing file: create the link under the temp name
+                        os.unlink(output)
+                        member = member.replace(name=os.path.relpath(output, destination), deep=False)
+                    tf.extract(member, destination, set_attrs=False, filter="data")
+        return progress, files
+
+    def _write_member_data(self, src, target: str, name: str, budget: "_Budget", progress: ByteProgress,
+                           cancel_event: threading.Event, abort: Optional[threading.Event] = None):
+        with src, open(target, "wb") as out:
+            while True:
+                if cancel_event.is_set() or (abort is not None and abort.is_set()):
+                    raise ArchiveCancelled()
+                block = src.read(self.BLOCK)
+                if not block:
+                    break
+                budget.add(len(block), name)
+                out.write(block)
+                progress.advance(len(block), name)
+
+
+def _list_entries(src: str) -> List[tuple]:
+    """(path, arcname, size, is_dir) for a file, or a folder and everything below it (symlinked folders are not entered)."""
+    src = os.path.abspath(src)
+    base = os.path.dirname(src)
+    if not os.path.isdir(src):
+        return [(src, os.path.basename(src), os.path.getsize(src), False)]
+    entries = []
+    for root, dirs, files in os.walk(src):
+        dirs.sort()
+        entries.append((root, os.path.relpath(root, base), 0, True))
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            try:
+                entries.append((path, os.path.relpath(path, base), os.path.getsize(path), False))
+            except OSError:
+                continue  # dangling symlink
+    return entries
+
+
+class _Budget:
+    """Extraction limits, shared by the threads writing members."""
+
+    def __init__(self, engine: ArchiveEngine, destination: str, archive_size: int):
+        self.engine = engine
+        self.destination = destination
+        self.archive_size = archive_size
+        free = shutil.disk_usage(destination).free - engine.RESERVE_BYTES
+        self.limit = min(engine.MAX_TOTAL_BYTES, max(free, 0))
+        self.limit_reason = "the size limit" if self.limit == engine.MAX_TOTAL_BYTES else "the free disk space"
+        self.written = 0
+        self.members = 0
+        self._lock = threading.Lock()
+
+    def check_listing(self, infos: List[zipfile.ZipInfo]):
+        """Rejects a zip from its central directory alone, before anything is written."""
+        for info in infos:
+            _safe_target(self.destination, info.filename)
+        if len(infos) > self.engine.MAX_MEMBERS:
+            raise ArchiveRejected(f"{len(infos)} members (limit {self.engine.MAX_MEMBERS}).")
+        declared = sum(info.file_size for info in infos)
+        if declared > self.limit:
+            raise ArchiveRejected(f"it expands to {_mb(declared)} MB, over {self.limit_reason} ({_mb(self.limit)} MB).")
+        for info in infos:
+            if info.file_size >= self.engine.MIN_RATIO_BYTES and \
+                    info.file_size > max(info.compress_size, 1) * self.engine.MAX_RATIO:
+                raise ArchiveRejected(f"'{info.filename}' expands {info.file_size // max(info.compress_size, 1)}x "
+                                      f"(limit {self.engine.MAX_RATIO}x).")
+
+    def count_member(self):
+        self.members += 1
+        if self.members > self.engine.MAX_MEMBERS:
+            raise ArchiveRejected(f"more than {self.engine.MAX_MEMBERS} members.")
+
+    def add(self, n: int, name: str):
+        with self._lock:
+            self.written += n
+            written = self.written
+        if written > self.limit:
+            raise ArchiveRejected(f"output passed {self.limit_reason} ({_mb(self.limit)} MB) at '{name}'.")
+        if written >= self.engine.MIN_RATIO_BYTES and written > self.archive_size * self.engine.MAX_RATIO:
+            raise ArchiveRejected(f"output passed {self.engine.MAX_RATIO}x the archive size at '{name}'.")
+
+
+def _safe_target(destination: str, name: str) -> Optional[str]:
+    """Path for a member inside destination, None for an empty name; rejects absolute and escaping paths."""
+    name = name.replace("\\", "/")
+    parts = [part for part in name.split("/") if part not in ("", ".")]
+    if name.startswith("/") or ".." in parts or (parts and ":" in parts[0]):
+        raise ArchiveRejected(f"unsafe member path '{name}'.")
+    if not parts:
+        return None
+    root = os.path.realpath(destination)
+    target = os.path.join(root, *parts)
+    if os.path.commonpath([os.path.realpath(os.path.dirname(target)), root]) != root:
+        raise ArchiveRejected(f"'{name}' would be written through a link outside the destination.")
+    return target
+
+
+def _make_dirs(path: str, created: List[str]):
+    """os.makedirs that records the folders it had to create."""
+    missing = []
+    while path and not os.path.isdir(path):
+        missing.append(path)
+        path = os.path.dirname(path)
+    for folder in reversed(missing):
+        os.mkdir(folder)
+        created.append(folder)
+
+
+def _member_output(target: str, created: List[str], replaced: List[tuple]) -> str:
+    """
+    Where to write a member. A new path is written directly (and removed if the extraction fails);
+    an existing file gets a temp file beside it, queued in 'replaced' to be swapped in at the end.
+    """
+    if not os.path.lexists(target):
+        created.append(target)
+        return target
+    if os.path.isdir(target) and not os.path.islink(target):
+        raise IsADirectoryError(f"'{target}' is a folder; a file of the same name cannot be extracted.")
+    fd, tmp = tempfile.mkstemp(prefix=f".{os.path.basename(target)}.", suffix=".part",
+                               dir=os.path.dirname(target))
+    os.close(fd)
+    created.append(tmp)
+    try:
+        shutil.copymode(target, tmp)
+    except OSError:
+        pass  # e.g. a dangling symlink: the temp file keeps its own mode
+    replaced.append((tmp, target))
+    return tmp
+
+
+def _remove_created(created: List[str]):
+    """Undoes a failed extraction: files and links first, then the folders it created (deepest first)."""
+    for path in reversed(created):
+        try:
+            if os.path.isdir(path) and not os.path.islink(path):
+                os.rmdir(path)
+            else:
+                os.unlink(path)
+        except OSError:
+            pass
+
+
+def _mb(n: int) -> str:
+    return f"{n / (1024 * 1024):.0f}"
+
+
+def _batch_pieces(members: List[tuple], chunk: int, batch_bytes: int, level: int) -> Iterator[List[tuple]]:
+    """
+    Cuts members into pieces (path, offset, length, level or None to store, last) and groups
+    consecutive pieces into batches of about batch_bytes, so tiny files do not each cost a round trip.
+    """
+    batch, batch_size = [], 0
+    for path, zinfo in members:
+        piece_level = level if zinfo.compress_type == zipfile.ZIP_DEFLATED else None
+        offset = 0
+        while True:
+            length = min(chunk, max(zinfo.file_size - offset, 0))
+            last = offset + length >= zinfo.file_size
+            # The last piece reads to EOF, so a file that grew since it was listed is still complete
+            batch.append((path, offset, None if last else length, piece_level, last))
+            batch_size += length
+            offset += length
+            if batch_size >= batch_bytes:
+                yield batch
+                batch, batch_size = [], 0
+            if last:
+                break
+    if batch:
+        yield batch
+
+
+# ==========================================
+# ZIPFILE INTERNALS
+# ==========================================
+# zipfile has no public API for adding a member whose data was compressed elsewhere.
+# These two functions are the only code here that touches its private state: they do
+# what ZipFile.mkdir() does in CPython 3.11 (seek to zf.start_dir on zf.fp, write
+# ZipInfo.FileHeader(), register the member and set zf._didModify so close() writes
+# the central directory). Check them first when moving to a new Python version.
+
+def _begin_raw_member(zf: zipfile.ZipFile, zinfo: zipfile.ZipInfo, zip64: bool):
+    """Writes zinfo's local header at the end of the archive; returns the file to write its data to."""
+    fp = zf.fp
+    fp.seek(zf.start_dir)
+    zinfo.header_offset = fp.tell()
+    fp.write(zinfo.FileHeader(zip64))
+    return fp
+
+
+def _end_raw_member(zf: zipfile.ZipFile, zinfo: zipfile.ZipInfo, zip64: bool):
+    """Rewrites the local header with the final CRC and sizes and adds the member to the directory."""
+    fp = zf.fp
+    end = fp.tell()
+    fp.seek(zinfo.header_offset)
+    fp.write(zinfo.FileHeader(zip64))
+    fp.seek(end)
+    zf.filelist.append(zinfo)
+    zf.NameToInfo[zinfo.filename] = zinfo
+    zf.start_dir = end
+    zf._didModify = True
+
+
+# ==========================================
+# WORKER SIDE (runs on pool threads)
+# ==========================================
+
+def _compress_batch(pieces: List[tuple]) -> List[tuple]:
+    return [_compress_piece(*piece) for piece in pieces]
+
+
+def _compress_piece(path: str, offset: int, length: Optional[int], level: Optional[int], last: bool) -> tuple:
+    """
+    Returns (crc, size, data, last). A deflated piece is raw deflate primed with the
+    32 KiB before it and ends with a sync flush (or the final block for the last piece).
+    """
+    with open(path, "rb") as f:
+        zdict = b""
+        if level is not None and offset:
+            f.seek(max(0, offset - 32768))
+            zdict = f.read(offset - f.tell())
+        f.seek(offset)
+        raw = f.read() if length is None else f.read(length)
+    crc = zlib.crc32(raw)
+    if level is None:
+        return crc, len(raw), raw, last
+    comp = zlib.compressobj(level, zlib.DEFLATED, -15, zdict=zdict) if zdict else \
+        zlib.compressobj(level, zlib.DEFLATED, -15)
+    data = comp.compress(raw) + comp.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+    return crc, len(raw), data, last
+
+
+def crc32_combine(crc1: int, crc2: int, len2: int) -> int:
+    """CRC-32 of A+B from crc32(A), crc32(B) and len(B) (zlib's crc32_combine, which Python does not expose)."""
+    # crc(A+B) = crc(A) advanced over len2 zero bytes, xor crc(B); the advance is linear over GF(2)
+    k = 0
+    while len2 and crc1:
+        if len2 & 1:
+            crc1 = _gf2_times(_zeros_operator(k), crc1)
+        len2 >>= 1
+        k += 1
+    return crc1 ^ crc2
+
+
+@lru_cache(maxsize=64)
+def _zeros_operator(k: int) -> tuple:
+    """GF(2) matrix that advances a CRC-32 register over 2**k zero bytes."""
+    if k == 0:
+        one_bit = [0xEDB88320] + [1 << n for n in range(31)]
+        op = one_bit
+        for _ in range(3):  # 1 -> 2 -> 4 -> 8 bits
+            op = _gf2_square(op)
+        return tuple(op)
+    return tuple(_gf2_square(_zeros_operator(k - 1)))
+
+
+def _gf2_times(mat, vec: int) -> int:
+    total, i = 0, 0
+    while vec:
+        if vec & 1:
+            total ^= mat[i]
+        vec >>= 1
+        i += 1
+    return total
+
+
+def _gf2_square(mat) -> List[int]:
+    return [_gf2_times(mat, row) for row in mat]
@@ -1,5 +1,8 @@
 import uuid
+import time
+import threading
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Imports
 from src.llm.Client import LocalLLMClient
@@ -7,6 +10,9 @@ from src.backend.tools.files import FileManager
 from src.backend.tools.system_ops import SystemOps
 from src.backend.tools.sys_info import SystemInfo
 from src.backend.core.filter import FilterEngine
+from src.backend.core.catalog import FileCatalog
+from src.backend.core.watcher import CatalogWatcher
+from src.backend.core.hash_cache import HashCache
 from src.backend.core.guard import SecurityManager, RiskLevel
 
 
@@ -14,14 +20,41 @@ class OSAssistant:
     def __init__(self):
         self.llm = LocalLLMClient(model_name="llama3.1")
         print(f"--- OS Assistant initialized with model: {self.llm.model_name} ---")
-        self.files = FileManager()
+        # One persistent catalog serves path lookup and ranked name search
+        self.file_index = FileCatalog()
+        self.files = FileManager(catalog=self.file_index, hash_cache=HashCache())
         self.sys_ops = SystemOps()
         self.sys_info = SystemInfo()
+        # Batches (delete/move by size or date) act on what is on disk now, so they scan live
         self.filter_engine = FilterEngine()
+        # Catch the catalog up in the background, then keep it live from filesystem events
+        self.watcher = CatalogWatcher(self.file_index)
+        self.watcher.start()
         self.guard = SecurityManager()
         self._pending_actions = {}
+        self._running_actions = {}
         self.short_term_memory = []
 
+        # Worker threads per batch action. Copies are I/O-bound and scale well;
+        # moves/deletes mostly touch directory metadata, so fewer workers suffice.
+        self.batch_concurrency = {
+            'copy_file': 8,
+            'move_file': 4,
+            'delete_file': 4,
+            'permanently_delete': 4,
+            'compress_item': 2,
+            'download_file': 2,
+        }
+        self.default_batch_concurrency = 4
+        # Per-item results are kept in the batch report only up to this many targets
+        self.batch_report_items = 500
+
+    def close(self):
+        """Stops the catalog watcher and releases the search pool and databases; call once on exit."""
+        self.watcher.stop()
+        self.files.close()
+        self.file_index.close()
+
     def process_request(self, user_input: str) -> dict:
         recent_history = "\n".join(self.short_term_memory[-10:])
         intent = self.llm.parse_intent(user_input, history_context=recent_history)
@@ -38,6 +71,9 @@ class OSAssistant:
                 intent['resolved_dst'] = str(p)
                 intent['destination'] = str(p)
 
+            if action == 'find_duplicates':
+                return self._plan_duplicate_cleanup(intent)
+
             if 'filters' in intent:
                 # Batch Mode
                 search_str = intent.get('source') or intent.get('path') or "."
@@ -45,7 +81,21 @@ class OSAssistant:
                 if search_root == "NOT FOUND":
                     return {"status": "ERROR", "message": f"Folder '{search_str}' not found.", "intent": intent}
 
-                matching_files = self.filter_engine.apply_filters(search_root, intent['filters'])
+                filters = intent['filters']
+                recursive = bool(filters.get('recursive', False))
+                try:
+                    sort_by, limit = self.filter_engine.check_options(filters.get('sort_by'), filters.get('limit'))
+                except ValueError as e:
+                    return {"status": "ERROR", "message": f"Error: {e}", "intent": intent}
+                # Top-level scans keep their old behaviour; deep scans skip dot-files unless asked
+                matching_files = self.filter_engine.apply_filters(
+                    search_root, filters,
+                    recursive=recursive,
+                    max_depth=filters.get('max_depth'),
+                    include_hidden=bool(filters.get('include_hidden', not recursive)),
+                    limit=limit,
+                    sort_by=sort_by,
+                    ascending=bool(filters.get('ascending', False)))
                 if not matching_files:
                     self._add_to_memory(action, "INFO", "No matching files.")
                     return {"status": "SUCCESS", "message": "No matching files.", "intent": intent}
@@ -86,27 +136,105 @@ class OSAssistant:
         except Exception as e:
             return {"status": "ERROR", "message": str(e), "intent": intent}
 
-    def execute_confirmed_action(self, action_id: str, updated_batch_targets: list = None) -> dict:
+    def execute_confirmed_action(self, action_id: str, updated_batch_targets: list = None,
+                                 progress_callback=None) -> dict:
+        """
+        Runs a previously confirmed action.
+        'progress_callback' receives progress dicts during batch runs (see _run_batch);
+        the run can be stopped from another thread with cancel_running_action(action_id).
+        """
         if action_id not in self._pending_actions:
+            self._running_actions.pop(action_id, None)
             return {"status": "ERROR", "message": "Timeout."}
         intent = self._pending_actions.pop(action_id)
         
         # Apply updates from UI if any
         if updated_batch_targets is not None and 'batch_targets' in intent:
             intent['batch_targets'] = updated_batch_targets
-            
+
+        cancel_event = self.register_run(action_id)
+        if cancel_event.is_set():
+            self._running_actions.pop(action_id, None)
+            return {"status": "CANCELLED", "message": "Action cancelled.", "intent": intent}
         try:
-            result = self._run_execution(intent)
-            return {"status": "SUCCESS", "message": result, "intent": intent}
+            result = self._run_execution(intent, progress_callback, cancel_event)
+            status = "CANCELLED" if cancel_event.is_set() else "SUCCESS"
+            return {"status": status, "message": result, "intent": intent}
+        except Exception as e:
+            return {"status": "ERROR", "message": str(e)}
+        finally:
+            self._running_actions.pop(action_id, None)
+
+    def register_run(self, action_id: str) -> threading.Event:
+        """
+        Marks a confirmed action as running and returns its cancel event. Call it before
+        handing the run to another thread, so a Cancel that arrives first still stops it.
+        """
+        return self._running_actions.setdefault(action_id, threading.Event())
+
+    def cancel_running_action(self, action_id: str) -> bool:
+        """Signals a running batch to stop after the items already in flight. Returns False if not running."""
+        event = self._running_actions.get(action_id)
+        if event is None:
+            return False
+        event.set()
+        return True
+
+    def stream_text_search(self, search_id: str, path: str, text, on_page, **options) -> dict:
+        """
+        Streams content-search hits to 'on_page' as lists of (path, line_no, snippet)
+        records (see ContentSearchEngine.stream). The search is registered under
+        'search_id', so cancel_running_action(search_id) stops it.
+        """
+        root = self._resolve_path(path or ".")
+        if root == "NOT FOUND":
+            return {"status": "ERROR", "message": f"Folder '{path}' not found."}
+
+        cancel_event = threading.Event()
+        self._running_actions[search_id] = cancel_event
+        try:
+            summary = self.files.content_search.stream(str(root), text, on_page,
+                                                       cancel_event=cancel_event, **options)
+            status = "CANCELLED" if summary["cancelled"] else "SUCCESS"
+            return {"status": status, "root": str(root), **summary}
         except Exception as e:
             return {"status": "ERROR", "message": str(e)}
+        finally:
+            self._running_actions.pop(search_id, None)
+
+    def _plan_duplicate_cleanup(self, intent) -> dict:
+        """
+        Finds duplicate files and turns every copy but the one to keep into a batch
+        delete_file (Trash) confirmation. The UI can still edit the target list.
+        """
+        search_str = intent.get('path') or intent.get('source') or "."
+        root = self._resolve_path(search_str)
+        if root == "NOT FOUND":
+            return {"status": "ERROR", "message": f"Folder '{search_str}' not found.", "intent": intent}
+
+        filters = dict(intent.get('filters') or {})
+        recursive = bool(filters.pop('recursive', True))
+        include_hidden = bool(filters.pop('include_hidden', False))
+        groups = self.files.duplicates.find(str(root), filters, recursive=recursive, include_hidden=include_hidden)
+        if not groups:
+            self._add_to_memory('find_duplicates', "INFO", "No duplicate files found.")
+            return {"status": "SUCCESS", "message": "No duplicate files found.", "intent": intent}
+
+        extras = [p for g in groups for p in g['paths'][1:]]
+        wasted = sum(g['size'] * (len(g['paths']) - 1) for g in groups)
+        intent['action'] = 'delete_file'
+        intent['duplicate_groups'] = groups
+        intent['batch_targets'] = extras
+        reason = (f"Batch delete_file on {len(extras)} duplicate copies in {len(groups)} groups "
+                  f"({wasted / (1024 * 1024):.2f} MB); the oldest copy of each file is kept.")
+        return self._trigger_confirmation(intent, reason, RiskLevel.HIGH.value)
 
     def _trigger_confirmation(self, intent, reason, risk):
         aid = str(uuid.uuid4())[:8]
         self._pending_actions[aid] = intent
         return {"status": "NEEDS_CONFIRMATION", "message": reason, "action_id": aid, "risk": risk, "intent": intent}
 
-    def _run_execution(self, intent):
+    def _run_execution(self, intent, progress_callback=None, cancel_event=None):
         action = intent.get('action')
         if action == 'chat':
             msg = intent.get('message', "")
@@ -115,51 +243,188 @@ class OSAssistant:
 
         final_msg = ""
         if 'batch_targets' in intent:
-            results = []
-            for fp in intent['batch_targets']:
-                s_intent = intent.copy()
-                s_intent['resolved_src'] = fp
-                s_intent['resolved_path'] = fp
-                results.append(f"{Path(fp).name}: {self._run_single_tool(s_intent)}")
-            final_msg = f"Batch Complete.\n" + "\n".join(results[:5])
+            skip = self._changed_duplicates(intent) if 'duplicate_groups' in intent else {}
+            report = self._run_batch(intent, progress_callback, cancel_event, skip)
+            intent['batch_result'] = report
+            final_msg = self._format_batch_report(report)
         else:
-            final_msg = self._run_single_tool(intent)
+            final_msg = self._run_single_tool(intent, progress_callback, cancel_event)
 
         self._add_to_memory(action, "SUCCESS", final_msg)
         return final_msg
 
-    def _run_single_tool(self, intent):
+    def _changed_duplicates(self, intent) -> dict:
+        """
+        {path: message} for duplicate copies that changed since the scan, or whose kept
+        copy was changed, moved or deleted; those copies are left alone instead of being trashed.
+        """
+        finder, skip = self.files.duplicates, {}
+        for group in intent['duplicate_groups']:
+            if not finder.keeper_unchanged(group):
+                msg = f"Error: Kept copy '{group['paths'][0]}' changed since the scan; duplicate left in place."
+                skip.update((p, msg) for p in group['paths'][1:])
+                continue
+            skip.update((p, "Error: Changed since the scan; no longer a known duplicate, left in place.")
+                        for p in group['paths'][1:] if not finder.copy_unchanged(group, p))
+        return skip
+
+    def _run_batch(self, intent, progress_callback=None, cancel_event=None, skip=None) -> dict:
+        """
+        Runs the intent's action over every batch target on a bounded thread pool.
+        Results are collected in target order and aggregated into a report dict; an item
+        succeeds only when its tool answers "Success", and the per-item "results" list is
+        included only for batches of at most batch_report_items targets.
+
+        progress_callback(progress) is called from the calling thread as items finish,
+        with keys: done, total, failed, bytes, elapsed, throughput (bytes/s), eta (s).
+        Setting cancel_event skips every item that has not started yet; targets in
+        'skip' ({path: message}) are reported as failures without running.
+        """
+        action = intent.get('action')
+        targets = intent['batch_targets']
+        workers = max(1, min(self.batch_concurrency.get(action, self.default_batch_concurrency), len(targets)))
+        cancel_event = cancel_event or threading.Event()
+        skip = skip or {}
+
+        def run_one(fp):
+            if cancel_event.is_set():
+                return {"path": fp, "ok": False, "message": "Cancelled", "bytes": 0, "cancelled": True}
+            if fp in skip:
+                return {"path": fp, "ok": False, "message": skip[fp], "bytes": 0}
+            s_intent = intent.copy()
+            s_intent.pop('batch_targets', None)
+            s_intent['resolved_src'] = fp
+            s_intent['resolved_path'] = fp
+            # Measure before running: deletes and moves make the source disappear
+            size = self._target_size(fp)
+            try:
+                msg = str(self._run_single_tool(s_intent))
+            except Exception as e:
+                return {"path": fp, "ok": False, "message": str(e), "bytes": 0}
+            # Tools report failures in several wordings ("Error: ...", "Download failed: ..."),
+            # so only an explicit "Success" counts as done
+            if msg.startswith("Cancelled"):
+                return {"path": fp, "ok": False, "message": msg, "bytes": 0, "cancelled": True}
+            ok = msg.startswith("Success")
+            return {"path": fp, "ok": ok, "message": msg, "bytes": size if ok else 0}
+
+        results = [None] * len(targets)
+        started = time.monotonic()
+        last_emit = 0.0
+        done = failed = done_bytes = 0
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(run_one, fp): i for i, fp in enumerate(targets)}
+            for future in as_completed(futures):
+                r = future.result()
+                results[futures[future]] = r
+                done += 1
+                done_bytes += r["bytes"]
+                failed += 0 if r["ok"] else 1
+
+                now = time.monotonic()
+                # Throttle UI updates; always report the final item
+                if progress_callback and (now - last_emit >= 0.2 or done == len(targets)):
+                    last_emit = now
+                    elapsed = now - started
+                    rate = done / elapsed if elapsed > 0 else 0.0
+                    progress_callback({
+                        "action": action,
+                        "done": done,
+                        "total": len(targets),
+                        "failed": failed,
+                        "bytes": done_bytes,
+                        "elapsed": round(elapsed, 2),
+                        "throughput": round(done_bytes / elapsed, 1) if elapsed > 0 else 0.0,
+                        "eta": round((len(targets) - done) / rate, 1) if rate > 0 else None,
+                        "cancelled": cancel_event.is_set(),
+                    })
+
+        cancelled = [r for r in results if r.get("cancelled")]
+        failures = [{"path": r["path"], "error": r["message"]}
+                    for r in results if not r["ok"] and not r.get("cancelled")]
+        report = {
+            "action": action,
+            "total": len(results),
+            "succeeded": len(results) - len(failures) - len(cancelled),
+            "failed": len(failures),
+            "cancelled": len(cancelled),
+            "bytes_processed": sum(r["bytes"] for r in results),
+            "failures": failures,
+        }
+        if len(results) <= self.batch_report_items:
+            report["results"] = results
+        return report
+
+    def _format_batch_report(self, report: dict) -> str:
+        mb = report['bytes_processed'] / (1024 * 1024)
+        lines = [f"Batch Complete. {report['succeeded']}/{report['total']} succeeded, "
+                 f"{report['failed']} failed ({mb:.2f} MB processed)."]
+        if report.get('cancelled'):
+            lines[0] = (f"Batch Cancelled. {report['succeeded']}/{report['total']} succeeded, "
+                        f"{report['failed']} failed, {report['cancelled']} skipped ({mb:.2f} MB processed).")
+        for f in report['failures'][:5]:
+            lines.append(f"{Path(f['path']).name}: {f['error']}")
+        if report['failed'] > 5:
+            lines.append(f"...and {report['failed'] - 5} more failures.")
+        return "\n".join(lines)
+
+    def _target_size(self, fp: str) -> int:
+        p = Path(fp)
+        try:
+            return p.stat().st_size if p.is_file() else 0
+        except OSError:
+            return 0
+
+    def _run_single_tool(self, intent, progress_callback=None, cancel_event=None):
+        """Dispatches one action. Long single-file tools (copies) report progress and honour cancel_event."""
         action = intent.get('action')
         path = intent.get('resolved_path')
         src = intent.get('resolved_src')
         dst = intent.get('resolved_dst')
 
         # --- FILES ---
-        if action == 'move_file': return self.files.move_file(src, dst)
-        if action == 'copy_file': return self.files.copy_file(src, dst)
+        if action == 'move_file': return self.files.move_file(src, dst, progress_callback, cancel_event)
+        if action == 'copy_file': return self.files.copy_file(src, dst, progress_callback, cancel_event)
         if action == 'create_file': return self.files.create_file(path, intent.get('content', ''))
         if action == 'create_folder': return self.files.create_folder(path)
         if action == 'rename_item': return self.files.rename_item(path, intent.get('new_name'))
         if action == 'delete_file': return self.files.delete_file(path)
         if action == 'permanently_delete': return self.files.permanently_delete(path)
         if action == 'empty_folder': return self.files.empty_folder(path)
-        if action == 'list_directory': return self.files.list_directory(path)
-        if action == 'read_file': return self.files.read_file(path)
+        if action == 'list_directory': return self.files.list_directory(path, intent.get('offset', 0),
+                                                                        intent.get('limit', 200),
+                                                                        intent.get('sort_by', 'name'),
+                                                                        intent.get('ascending'),
+                                                                        bool(intent.get('details', False)))
+        if action == 'read_file': return self.files.read_file(path, offset=intent.get('offset'),
+                                                              length=intent.get('length'),
+                                                              head=intent.get('head'), tail=intent.get('tail'))
         if action == 'get_file_info': return str(self.files.get_file_info(path))
         if action == 'count_lines': return self.files.count_lines(path)
-        if action == 'get_file_hash': return self.files.get_file_hash(path)
+        if action == 'get_file_hash': return self.files.get_file_hash(path, intent.get('algorithm', 'sha256'))
         if action == 'compare_files': return self.files.compare_files(path, dst)
         if action == 'append_to_file': return self.files.append_to_file(path, intent.get('content', ''))
         if action == 'prepend_to_file': return self.files.prepend_to_file(path, intent.get('content', ''))
         if action == 'replace_text': return self.files.replace_text(path, intent.get('old_text'),
-                                                                    intent.get('new_text'))
+                                                                    intent.get('new_text'),
+                                                                    regex=intent.get('regex', False),
+                                                                    max_replacements=intent.get('max_replacements'))
         if action == 'search_files': return self.files.search_files_ranked(intent.get('term', ''))
         if action == 'find_files_by_name': return self.files.find_files_by_name(path, intent.get('pattern'))
         if action == 'find_files_containing_text': return self.files.find_files_containing_text(path,
                                                                                                 intent.get('text'))
-        if action == 'compress_item': return self.files.compress_item(path, intent.get('format', 'zip'))
-        if action == 'extract_archive': return self.files.extract_archive(path, dst)
-        if action == 'download_file': return self.files.download_file(intent.get('url'), dst)
+        if action == 'find_files_containing_patterns': return self.files.find_files_containing_patterns(
+            path, intent.get('patterns', []), intent.get('case_sensitive', True), intent.get('regex', False),
+            intent.get('match_all', False))
+        if action == 'compress_item': return self.files.compress_item(path, intent.get('format', 'zip'),
+                                                                      intent.get('mode', 'deflate'),
+                                                                      progress_callback, cancel_event)
+        if action == 'extract_archive': return self.files.extract_archive(path, dst, progress_callback, cancel_event)
+        if action == 'download_file': return self.files.download_file(intent.get('url'), dst,
+                                                                      intent.get('expected_size'),
+                                                                      intent.get('checksum'),
+                                                                      progress_callback, cancel_event)
         if action == 'create_symlink': return self.files.create_symlink(src, dst)
 
         # --- SYSTEM OPS ---
@@ -209,8 +474,16 @@ class OSAssistant:
 
     def _find_path_by_name(self, filename: str) -> Path:
         home = Path.home()
-        for d in [home / 'Desktop', home / 'Downloads', home / 'Documents']:
-            if d.exists():
-                found = next(d.rglob(filename), None) or next(d.rglob(f"{filename}.*"), None)
-                if found: return found
+        # Fast path: indexed lookup. A stale hit re-lists only the folder it was in; a miss
+        # re-checks the top level of each root (where new files usually land) rather than
+        # walking everything. Deeper changes reach the index through the watcher.
+        found = self.file_index.lookup(filename)
+        if found and not found.exists():
+            self.file_index.refresh(str(found.parent), max_depth=0)
+            found = self.file_index.lookup(filename)
+        elif not found:
+            for root in self.file_index.roots:
+                self.file_index.refresh(str(root), max_depth=0)
+            found = self.file_index.lookup(filename)
+        if found and found.exists(): return found
         return home / filename if (home / filename).exists() else None
\ No newline at end of file
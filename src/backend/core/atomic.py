@@ -0,0 +1,93 @@
+import os
+import shutil
+import secrets
+from contextlib import contextmanager
+
+CHUNK = 1024 * 1024
+
+
+@contextmanager
+def atomic_rewrite(path: str):
+    """
+    Yields a binary file that replaces 'path' when the block exits cleanly.
+
+    The data goes to a temp file in the same directory (so the final step is a
+    rename on one filesystem), is fsynced, takes over the original's permissions
+    and then os.replace()s it (a new file gets the default mode for the umask).
+    A crash or an exception leaves the original untouched and the temp file removed;
+    readers never see a half-written file.
+    A symlinked path rewrites the file the link points to, not the link.
+    """
+    target = os.path.realpath(path)
+    directory = os.path.dirname(target)
+    fd, tmp = _create_temp(directory, f".{os.path.basename(target)}.", ".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        _copy_owner_and_mode(target, tmp)
+        os.replace(tmp, target)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+    _fsync_dir(directory)
+
+
+def copy_stream(src, dst, limit: int = -1) -> int:
+    """Copies up to 'limit' bytes (all if negative) from src to dst in CHUNK-sized reads. Returns the byte count."""
+    buf = bytearray(CHUNK)
+    view = memoryview(buf)
+    copied = 0
+    while limit < 0 or copied < limit:
+        want = CHUNK if limit < 0 else min(CHUNK, limit - copied)
+        n = src.readinto(view[:want])
+        if not n:
+            break
+        dst.write(view[:n])
+        copied += n
+    return copied
+
+
+def _create_temp(directory: str, prefix: str, suffix: str) -> tuple:
+    """
+    Like tempfile.mkstemp, but created with mode 0o666 so the kernel applies the
+    current umask (mkstemp's 0600 would make a new file private). Returns (fd, path).
+    """
+    flags = os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, "O_BINARY", 0)
+    while True:
+        path = os.path.join(directory, f"{prefix}{secrets.token_hex(4)}{suffix}")
+        try:
+            return os.open(path, flags, 0o666), path
+        except FileExistsError:
+            continue
+
+
+def _copy_owner_and_mode(original: str, tmp: str):
+    try:
+        st = os.stat(original)
+    except FileNotFoundError:
+        return  # a new file keeps the umask-based mode it was created with
+    shutil.copymode(original, tmp)
+    if hasattr(os, "chown"):
+        try:
+            os.chown(tmp, st.st_uid, st.st_gid)
+        except OSError:
+            pass  # not permitted unless we own it / are root; the mode is what matters
+
+
+def _fsync_dir(directory: str):
+    """Makes the rename itself durable. Not supported on Windows, where it is skipped."""
+    try:
+        dfd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dfd)
+    except OSError:
+        pass
+    finally:
+        os.close(dfd)
@@ -0,0 +1,328 @@
+import os
+import sys
+import time
+import sqlite3
+import fnmatch
+from pathlib import Path
+from typing import List, Dict, Optional, Iterator, Tuple
+
+from src.backend.core.index import FileIndex
+
+
+class FileCatalog(FileIndex):
+    """
+    Persistent file metadata catalog for the home folders.
+    Extends the filename index with extension, size, mtime, ctime and inode
+    per file, indexed so filter queries become SQL range scans instead of walks.
+
+    Freshness works like FileIndex: each directory's mtime is stored and
+    refresh() only re-lists directories that changed.
+
+    Names are also kept in an FTS5 trigram index (maintained by triggers on
+    'files'), so substring and fuzzy name searches intersect posting lists
+    instead of scanning every row.
+    """
+
+    DEFAULT_DB = Path.home() / ".os_assistant" / "catalog.db"
+    DEFAULT_ROOTS = ["Desktop", "Downloads", "Documents", "Pictures", "Music", "Videos"]
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS dirs (
+            path TEXT PRIMARY KEY,
+            mtime_ns INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS files (
+            path TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            name_lower TEXT NOT NULL,
+            dir TEXT NOT NULL,
+            is_dir INTEGER NOT NULL,
+            is_file INTEGER NOT NULL,
+            ext TEXT,
+            size INTEGER,
+            mtime REAL,
+            ctime REAL,
+            inode INTEGER
+        );
+        CREATE INDEX IF NOT EXISTS idx_files_name_kind ON files(name_lower, is_file);
+        CREATE INDEX IF NOT EXISTS idx_files_dir ON files(dir);
+        CREATE INDEX IF NOT EXISTS idx_files_ext ON files(ext);
+        CREATE INDEX IF NOT EXISTS idx_files_size ON files(size);
+        CREATE INDEX IF NOT EXISTS idx_files_mtime ON files(mtime);
+    """
+    COLUMNS = ("path", "name", "name_lower", "dir", "is_dir", "is_file",
+               "ext", "size", "mtime", "ctime", "inode")
+
+    # External-content FTS5 table over the names of regular files, keyed by files.rowid.
+    # Rows are only ever inserted or deleted (refreshes use INSERT OR REPLACE), never updated.
+    NAME_INDEX_SCHEMA = """
+        CREATE VIRTUAL TABLE IF NOT EXISTS names_fts USING fts5(
+            name_lower, content='files', content_rowid='rowid', tokenize='trigram'
+        );
+        CREATE TRIGGER IF NOT EXISTS files_names_insert AFTER INSERT ON files
+        WHEN new.is_file = 1 BEGIN
+            INSERT INTO names_fts (rowid, name_lower) VALUES (new.rowid, new.name_lower);
+        END;
+        CREATE TRIGGER IF NOT EXISTS files_names_delete AFTER DELETE ON files
+        WHEN old.is_file = 1 BEGIN
+            INSERT INTO names_fts (names_fts, rowid, name_lower) VALUES ('delete', old.rowid, old.name_lower);
+        END;
+    """
+    # Bounds that keep a ranked search fast when a term is very common
+    CONTAINS_SCAN = 20_000   # 'contains' matches examined for the shortest names
+    FUZZY_BUDGET = 0.04      # seconds the typo-tolerant pass may spend before returning what it has
+
+    def _init_schema(self):
+        super()._init_schema()
+        with self._lock:
+            # INSERT OR REPLACE only fires the delete trigger for replaced rows with this on
+            self._conn.execute("PRAGMA recursive_triggers = ON")
+            try:
+                with self._conn:
+                    existed = self._conn.execute(
+                        "SELECT 1 FROM sqlite_master WHERE name = 'names_fts'").fetchone()
+                    self._conn.executescript(self.NAME_INDEX_SCHEMA)
+                    if not existed:
+                        # Catalogs created before the name index: index the rows already there
+                        self._conn.execute("INSERT INTO names_fts (rowid, name_lower) "
+                                           "SELECT rowid, name_lower FROM files WHERE is_file = 1")
+                self.has_name_index = True
+            except sqlite3.OperationalError as e:
+                # SQLite builds without FTS5 / the trigram tokenizer (< 3.34)
+                print(f"Catalog Warning: trigram name index unavailable ({e}); name searches will scan.")
+                self.has_name_index = False
+
+    def _entry_row(self, entry: os.DirEntry, d: str, is_dir: bool) -> tuple:
+        name = entry.name
+        dot = name.rfind(".")
+        ext = name[dot:].lower() if dot > 0 else None
+        is_file = False
+        size = mtime = ctime = inode = None
+        if not is_dir:
+            # Follow symlinks, matching what a FilterEngine walk would see
+            try:
+                is_file = entry.is_file()
+                if is_file:
+                    st = entry.stat()
+                    size, mtime, ctime, inode = st.st_size, st.st_mtime, st.st_ctime, st.st_ino
+            except OSError:
+                is_file = False
+        return (entry.path, name, name.lower(), d, int(is_dir), int(is_file),
+                ext, size, mtime, ctime, inode)
+
+    # ==========================================
+    # FILTER QUERIES
+    # ==========================================
+
+    def query(self, root: str, compiled, recursive: bool = False, max_depth: Optional[int] = None,
+              exclude: Optional[List[str]] = None, include_hidden: bool = True,
+              sort_by: Optional[str] = None, ascending: bool = False) -> Iterator[str]:
+        """
+        Yields paths of catalogued files under 'root' matching a CompiledFilter.
+        Size/time/extension constraints run as indexed SQL; hidden, exclude and
+        depth rules (path-shape checks) are applied while streaming the rows.
+        """
+        root = str(Path(root))
+        where = ["is_file = 1"]
+        params: list = []
+
+        if recursive:
+            # dir == root, or dir inside root: 'root/' <= dir < 'root0' ('0' follows '/')
+            where.append("(dir = ? OR (dir >= ? AND dir < ?))")
+            params += [root, root + os.sep, root + chr(ord(os.sep) + 1)]
+        else:
+            where.append("dir = ?")
+            params.append(root)
+
+        if compiled.extensions is not None:
+            where.append(f"ext IN ({', '.join('?' * len(compiled.extensions))})")
+            params += sorted(compiled.extensions)
+        if compiled.name_exact is not None:
+            where.append("name = ?")
+            params.append(compiled.name_exact)
+        if compiled.name_contains is not None:
+            where.append("instr(name_lower, ?) > 0")
+            params.append(compiled.name_contains)
+
+        for column, op, value in (("size", ">=", compiled.min_size), ("size", "<=", compiled.max_size),
+                                  ("mtime", ">=", compiled.modified_after),
+                                  ("mtime", "<=", compiled.modified_before),
+                                  ("ctime", ">=", compiled.created_after),
+                                  ("ctime", "<=", compiled.created_before)):
+            if value is not None:
+                where.append(f"{column} {op} ?")
+                params.append(value)
+
+        sql = f"SELECT path FROM files WHERE {' AND '.join(where)}"
+        if sort_by:
+            if sort_by not in ("size", "mtime"):
+                raise ValueError(f"Cannot sort by '{sort_by}'. Use 'size' or 'mtime'.")
+            sql += f" ORDER BY {sort_by} {'ASC' if ascending else 'DESC'}"
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        exclude = exclude or []
+        for (path,) in rows:
+            if self._path_allowed(root, path, max_depth, exclude, include_hidden):
+                yield path
+
+    def _path_allowed(self, root: str, path: str, max_depth: Optional[int],
+                      exclude: List[str], include_hidden: bool) -> bool:
+        """Applies the walker's depth/hidden/exclude rules to a catalogued path."""
+        parts = path[len(root):].lstrip(os.sep).split(os.sep)
+        if max_depth is not None and len(parts) - 1 > max_depth:
+            return False
+        for part in parts:
+            if not include_hidden and part.startswith("."):
+                return False
+            if exclude and any(fnmatch.fnmatch(part, pat) for pat in exclude):
+                return False
+        return True
+
+    def search_names(self, pattern: str, root: Optional[str] = None, case_sensitive: bool = True) -> List[str]:
+        """Glob match on file names (like rglob(pattern)), optionally scoped to a subtree."""
+        where, params = [], []
+        if case_sensitive:
+            where.append("name GLOB ?")
+            params.append(pattern)
+        else:
+            where.append("name_lower GLOB ?")
+            params.append(pattern.lower())
+        if root is not None:
+            root = str(Path(root))
+            where.append("(dir = ? OR (dir >= ? AND dir < ?))")
+            params += [root, root + os.sep, root + chr(ord(os.sep) + 1)]
+        with self._lock:
+            rows = self._conn.execute(f"SELECT path FROM files WHERE {' AND '.join(where)}", params).fetchall()
+        return [r[0] for r in rows]
+
+    def search_ranked(self, term: str, limit: int = 15, fuzzy: bool = True) -> Tuple[int, List[tuple]]:
+        """
+        Ranked file name search: Exact (100) > Starts With (80) > Contains (50),
+        shorter names first within a tier. Exact and prefix matches are a range scan
+        on the name index; substring matches of 3+ characters come from the trigram
+        index. When fewer than 'limit' names contain the term, names that contain it
+        with one typo fill the list at rank 30 (terms of 6+ characters).
+        Returns (total matches, [(score, path, name), ...] best first).
+        """
+        term = term.lower()
+        if not term:
+            return 0, []
+        params = {"term": term, "hi": term + chr(0x10FFFF), "limit": limit, "scan": self.CONTAINS_SCAN}
+        if self.has_name_index and len(term) >= 3:
+            params["needle"] = _fts_phrase(term)
+            count_sql = "SELECT COUNT(*) FROM names_fts WHERE names_fts MATCH :needle"
+            contains_sql = "SELECT rowid FROM names_fts WHERE names_fts MATCH :needle LIMIT :scan"
+        else:
+            # Shorter than one trigram: nothing to intersect, scan the names
+            params["needle"] = term
+            count_sql = "SELECT COUNT(*) FROM files WHERE is_file = 1 AND instr(name_lower, :needle) > 0"
+            contains_sql = ("SELECT rowid FROM files WHERE is_file = 1 "
+                            "AND instr(name_lower, :needle) > 0 LIMIT :scan")
+
+        with self._lock:
+            total = self._conn.execute(count_sql, params).fetchone()[0]
+            # Exact names are the shortest in the prefix range, so length order ranks them first.
+            # Rowids come from the covering index; paths are only read for the winners.
+            hits = self._conn.execute("""
+                SELECT CASE WHEN f.name_lower = :term THEN 100 ELSE 80 END, f.path, f.name
+                FROM (SELECT rowid AS id FROM files INDEXED BY idx_files_name_kind
+                      WHERE name_lower >= :term AND name_lower < :hi AND is_file = 1
+                      ORDER BY length(name_lower), name_lower LIMIT :limit)
+                JOIN files f ON f.rowid = id""", params).fetchall()
+            if len(hits) < limit and total > len(hits):
+                # Shortest 'contains' names among (at most CONTAINS_SCAN) substring matches
+                params["limit"] = limit - len(hits)
+                hits += self._conn.execute(f"""
+                    SELECT 50, path, name FROM files
+                    WHERE rowid IN ({contains_sql}) AND substr(name_lower, 1, length(:term)) != :term
+                    ORDER BY length(name_lower), name_lower LIMIT :limit""", params).fetchall()
+
+        if fuzzy and len(hits) < limit and self.has_name_index:
+            near = self._search_near_misses(term)
+            total += len(near)
+            hits += near[:limit - len(hits)]
+        return total, hits
+
+    def _search_near_misses(self, term: str) -> List[tuple]:
+        """
+        Names containing 'term' with one typo (substitution, insertion, deletion or
+        transposition). Each typo variant becomes a GLOB ('rep?rt', 'rpeort', ...),
+        which the trigram index answers from the literal runs around the wildcard.
+        Variants run most selective first until FUZZY_BUDGET is spent.
+        """
+        variants = _typo_variants(term)
+        if not variants:
+            return []
+        deadline = time.monotonic() + self.FUZZY_BUDGET
+        found = {}
+        with self._lock:
+            # Abort a long-running variant once the budget is gone
+            self._conn.set_progress_handler(lambda: time.monotonic() > deadline, 10_000)
+            try:
+                for pattern in variants:
+                    if time.monotonic() > deadline:
+                        break
+                    for path, name, name_lower in self._conn.execute("""
+                            SELECT path, name, name_lower FROM files WHERE rowid IN
+                                (SELECT rowid FROM names_fts WHERE name_lower GLOB ?)""", (pattern,)):
+                        if term not in name_lower:  # exact/prefix/substring hits are ranked already
+                            found[path] = name
+            except sqlite3.OperationalError:
+                pass  # interrupted: keep the matches gathered so far
+            finally:
+                self._conn.set_progress_handler(None, 0)
+        return sorted(((30, path, name) for path, name in found.items()),
+                      key=lambda r: (len(r[2]), r[2].lower(), r[1]))
+
+    def stats(self) -> Dict:
+        with self._lock:
+            dirs = self._conn.execute("SELECT COUNT(*) FROM dirs").fetchone()[0]
+            files, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM files WHERE is_file = 1").fetchone()
+        return {"directories": dirs, "files": files, "total_bytes": total, "db_path": str(self.db_path)}
+
+
+def _fts_phrase(text: str) -> str:
+    """Quotes text as an FTS5 phrase; with the trigram tokenizer a phrase is a substring match."""
+    return '"' + text.replace('"', '""') + '"'
+
+
+def _typo_variants(term: str) -> List[str]:
+    """
+    GLOB patterns for every single-edit variant of 'term', most selective first
+    (longest literal run). Variants whose literal runs are all shorter than a
+    trigram cannot use the index, so terms that produce one get no fuzzy pass.
+    """
+    def esc(text: str) -> str:
+        return "".join(f"[{ch}]" if ch in "*?[" else ch for ch in text)
+
+    variants = set()
+    for i in range(len(term)):
+        head, tail = term[:i], term[i + 1:]
+        variants.add((head, tail, True))            # substitution: 'rep?rt'
+        variants.add((head + tail, "", False))      # deletion:     'reprt'
+        variants.add((head, term[i:], True))        # insertion:    'rep?ort'
+        if tail:
+            variants.add((head + tail[0] + term[i] + tail[1:], "", False))  # transposition: 'rpeort'
+    variants.add((term, "", True))                  # insertion at the end
+    variants.discard((term, "", False))
+
+    ranked = []
+    for head, tail, wildcard in variants:
+        longest = max(len(head), len(tail))
+        if longest < 3:
+            return []
+        pattern = esc(head) + ("?" if wildcard else "") + esc(tail)
+        ranked.append((-longest, pattern))
+    return [f"*{p}*" for _, p in sorted(ranked)]
+
+
+if __name__ == "__main__":
+    # Usage: python -m src.backend.core.catalog [refresh|stats]
+    command = sys.argv[1] if len(sys.argv) > 1 else "refresh"
+    catalog = FileCatalog()
+    if command == "refresh":
+        print(f"Catalog refresh: re-listed {catalog.refresh()} directories.")
+    print(catalog.stats())
@@ -0,0 +1,538 @@
+import os
+import re
+import mmap
+import multiprocessing
+import time
+import heapq
+import threading
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Optional, Iterator, Union, Callable
+
+from src.backend.core.filter import FilterEngine
+
+
+class ContentSearchEngine:
+    """
+    Grep-style search over file contents.
+
+    Files are memory-mapped and searched as bytes, so nothing is decoded except
+    the lines that match. Binary files (a NUL byte in the first block) and files
+    above max_file_size are skipped. Batches of files are searched on a process
+    pool, so the byte scanning runs on every core instead of one interpreter;
+    small trees are searched in-process to avoid the pool start-up cost.
+    """
+
+    MAX_FILE_SIZE = 512 * 1024 ** 2
+    BATCH_FILES = 64      # files per pool task; amortizes inter-process overhead
+    FIRST_BATCH = 4       # pool batches start this small and double, so first hits arrive early
+    SNIFF_BYTES = 8192    # leading bytes checked for NUL (binary detection)
+    CANCEL_POLL = 0.1     # seconds between cancel checks while waiting on the pool
+
+    def __init__(self, backend: str = "process", workers: Optional[int] = None,
+                 max_file_size: Optional[int] = None, filter_engine: Optional[FilterEngine] = None):
+        """
+        backend: "process" searches batches on a process pool; "serial" searches
+                 on the calling thread.
+        workers: pool size (default: CPU count).
+        max_file_size: larger files are skipped (bytes, default MAX_FILE_SIZE).
+        filter_engine: lists the candidate files; pass a catalog-backed engine to
+                       skip the directory walk for catalogued folders.
+        """
+        if backend not in ("process", "serial"):
+            raise ValueError(f"Unknown search backend '{backend}'. Use 'process' or 'serial'.")
+        self.backend = backend
+        self.workers = workers or os.cpu_count() or 1
+        self.max_file_size = max_file_size or self.MAX_FILE_SIZE
+        self.filter_engine = filter_engine or FilterEngine()
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    # ==========================================
+    # 1. SEARCH API
+    # ==========================================
+
+    def search(self, root: str, text: str, limit: Optional[int] = None, **kwargs) -> List[Dict]:
+        """Runs iter_search to completion (or 'limit' files) and returns the hits sorted by path."""
+        hits = []
+        for hit in self.iter_search(root, text, **kwargs):
+            hits.append(hit)
+            if limit is not None and len(hits) >= limit:
+                break
+        return sorted(hits, key=lambda h: h["path"])
+
+    def iter_search(self, root: str, text: Union[str, List[str]], case_sensitive: bool = True,
+                    regex: bool = False, require_all: bool = False, context: int = 0,
+                    max_matches_per_file: int = 5, recursive: bool = True,
+                    include_hidden: bool = True, exclude: Optional[List[str]] = None,
+                    cancel_event: Optional[threading.Event] = None) -> Iterator[Dict]:
+        """
+        Yields one dict per file containing 'text', as files are found:
+            {"path": str, "matches": [{"line": int, "text": str, "before": [str], "after": [str]}]}
+        Scanning a file stops after max_matches_per_file matching lines (1 = stop at
+        the first hit). 'context' adds that many surrounding lines to each match.
+        Stop iterating, or set cancel_event, to end the search early; queued
+        batches are cancelled.
+
+        Multi-pattern mode: pass a list of patterns to scan each file once for all
+        of them. Each match then lists the "patterns" found on its line, and the
+        file dict gains "patterns": {pattern: first line}. require_all keeps only
+        files containing every pattern; regex treats the patterns as regular expressions.
+        """
+        multi = not isinstance(text, str)
+        patterns = [p for p in (text if multi else [text]) if p]
+        if not patterns:
+            return
+        if multi or regex:
+            matcher = _MultiMatcher(patterns, case_sensitive, regex)
+        else:
+            matcher = _LiteralMatcher(patterns[0], case_sensitive)
+        options = {"context": context, "max_matches": max_matches_per_file, "multi": multi,
+                   "require_all": require_all, "max_size": self.max_file_size, "sniff": self.SNIFF_BYTES}
+        cancel_event = cancel_event or threading.Event()
+        candidates = self.filter_engine.iter_filters(
+            root, {"min_size": "1", "max_size": str(self.max_file_size)},
+            recursive=recursive, exclude=exclude, include_hidden=include_hidden)
+        paths = (str(p) for p in candidates)
+
+        head = list(islice(paths, self.BATCH_FILES + 1))
+        if self.backend == "serial" or len(head) <= self.BATCH_FILES:
+            # Serial backend, or a single batch: a pool would cost more than it saves.
+            # Files are searched one at a time so each hit is yielded as soon as it is found.
+            for path in _chain(head, paths):
+                if cancel_event.is_set():
+                    return
+                hit = _search_file(path, matcher, options)
+                if hit:
+                    yield hit
+            return
+
+        batches = _batched(_chain(head, paths), self.BATCH_FILES, first=self.FIRST_BATCH)
+        yield from self._iter_pool(batches, matcher, options, cancel_event)
+
+    def iter_lines(self, root: str, text: Union[str, List[str]], **kwargs) -> Iterator[tuple]:
+        """
+        Flat form of iter_search: yields a (path, line_no, snippet) record per
+        matching line, in the order files are found.
+        """
+        for hit in self.iter_search(root, text, **kwargs):
+            for match in hit["matches"]:
+                yield hit["path"], match["line"], match["text"]
+
+    def stream(self, root: str, text: Union[str, List[str]], on_page: Callable[[List[tuple]], None],
+               page_size: int = 50, interval: float = 0.25, max_results: Optional[int] = None,
+               cancel_event: Optional[threading.Event] = None, **kwargs) -> Dict:
+        """
+        Runs iter_lines and hands the records to on_page in pages, for pushing to a UI.
+        A page is sent when it holds page_size records or 'interval' seconds have passed
+        since the last one, so the first hit goes out at once and a slow trickle still
+        shows up. Stops after max_results records or when cancel_event is set.
+        Returns a summary: {"records", "files", "cancelled", "truncated", "elapsed"}.
+        """
+        cancel_event = cancel_event or threading.Event()
+        started = time.monotonic()
+        last_sent = started - interval
+        page, files = [], set()
+        records, truncated = 0, False
+
+        for record in self.iter_lines(root, text, cancel_event=cancel_event, **kwargs):
+            if cancel_event.is_set():
+                break
+            if max_results is not None and records >= max_results:
+                truncated = True
+                break
+            page.append(record)
+            files.add(record[0])
+            records += 1
+            now = time.monotonic()
+            if len(page) >= page_size or now - last_sent >= interval:
+                on_page(page)
+                page, last_sent = [], now
+        if page:
+            on_page(page)
+
+        return {"records": records, "files": len(files), "cancelled": cancel_event.is_set(),
+                "truncated": truncated, "elapsed": round(time.monotonic() - started, 3)}
+
+    def _iter_pool(self, batches: Iterator[List[str]], matcher, options: Dict,
+                   cancel_event: threading.Event) -> Iterator[Dict]:
+        """
+        Keeps a bounded number of batches in flight. Finished batches are yielded each
+        time another one is submitted, not only once the window is full; the walk
+        blocks only while the window is full.
+        """
+        try:
+            pool = self._get_pool()
+        except OSError as e:
+            print(f"Search Warning: process pool unavailable ({e}); searching in-process.")
+            for batch in batches:
+                if cancel_event.is_set():
+                    return
+                yield from _search_batch(batch, matcher, options)
+            return
+
+        in_flight = set()
+        max_in_flight = self.workers * 2
+        try:
+            for batch in batches:
+                in_flight.add(pool.submit(_search_batch, batch, matcher, options))
+                while not cancel_event.is_set():
+                    full = len(in_flight) >= max_in_flight
+                    done, in_flight = wait(in_flight, timeout=self.CANCEL_POLL if full else 0,
+                                           return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield from future.result()
+                    if not full:
+                        break
+                if cancel_event.is_set():
+                    return
+            while in_flight and not cancel_event.is_set():
+                done, in_flight = wait(in_flight, timeout=self.CANCEL_POLL, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+        except BrokenProcessPool:
+            # A worker died (e.g. a mapped file was truncated under it); start fresh next time
+            print("Search Warning: a search worker crashed; results may be incomplete.")
+            self._pool = None
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=pool_context())
+        return self._pool
+
+
+def pool_context():
+    """
+    Start method for worker processes. Forking copies a process whose other threads
+    (watcher, GUI loop, SQLite) may hold locks, so workers come from a forkserver
+    (spawn where that is unavailable, e.g. Windows); worker functions are module-level.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+class _LiteralMatcher:
+    """Finds a literal (UTF-8 encoded) string in a buffer; picklable for pool workers."""
+
+    CHUNK = 4 * 1024 * 1024
+
+    def __init__(self, text: str, case_sensitive: bool = True):
+        self.patterns = [text]
+        self.needle = text.encode("utf-8")
+        self.folded = None
+        self.regex = None
+        if not case_sensitive:
+            if self.needle.isascii():
+                # bytes.lower() + find on chunks runs at memory speed; IGNORECASE regexes do not
+                self.folded = self.needle.lower()
+            else:
+                # Bytes regexes only fold ASCII, so spell out each letter's case variants
+                self.regex = re.compile(b"".join(_case_variants(ch) for ch in text))
+
+    def iter_hits(self, buf) -> Iterator[tuple]:
+        """Yields (start, pattern ids) for every occurrence, in order."""
+        if self.folded is not None:
+            for offset, chunk, limit in _folded_chunks(buf, len(self.needle), self.CHUNK):
+                at = chunk.find(self.folded)
+                while 0 <= at < limit:
+                    yield offset + at, (0,)
+                    at = chunk.find(self.folded, at + 1)
+        elif self.regex is not None:
+            for m in self.regex.finditer(buf):
+                yield m.start(), (0,)
+        else:
+            at = buf.find(self.needle)
+            while at >= 0:
+                yield at, (0,)
+                at = buf.find(self.needle, at + 1)
+
+
+class _MultiMatcher:
+    """
+    Finds many patterns in one pass over each mapped file, reporting every
+    occurrence of every pattern (Aho-Corasick semantics, overlaps included).
+
+    A pure-Python automaton would step the interpreter once per byte, so matching
+    stays in C: up to FIND_LIMIT literals are each located with bytes.find (memchr
+    speed) over the same mapping and merged in position order; larger sets use the
+    pattern trie compiled into one regex, which reports the longest pattern at each
+    start (shorter ones that are its prefixes come from the trie) and is re-tried
+    inside each match so overlapping occurrences are not skipped.
+
+    With regex=True the patterns are regular expressions, combined as one
+    alternation; where several match at the same place the first one is reported.
+    Wrapping shifts group numbers, so patterns that refer to their own groups
+    (\\1, named groups, (?(1)...)) are compiled on their own and merged in instead.
+    """
+
+    CHUNK = 4 * 1024 * 1024
+    FIND_LIMIT = 16
+
+    def __init__(self, patterns: List[str], case_sensitive: bool = True, regex: bool = False):
+        self.patterns = list(patterns)
+        self.fold = not case_sensitive and not regex
+        self.group_ids = None  # regex mode: outer group number -> pattern id
+        if regex:
+            # MULTILINE: '^' and '$' anchor at line boundaries, as in grep
+            flags = re.MULTILINE | (0 if case_sensitive else re.IGNORECASE)
+            groups, self.group_ids, self.separate, index = [], {}, [], 1
+            for i, p in enumerate(self.patterns):
+                compiled = re.compile(p.encode("utf-8"), flags)
+                if compiled.groupindex or _GROUP_REF.search(compiled.pattern):
+                    self.separate.append((compiled, (i,)))
+                    continue
+                self.group_ids[index] = i
+                index += compiled.groups + 1
+                groups.append(b"(" + compiled.pattern + b")")
+            self.regex = re.compile(b"|".join(groups), flags) if groups else None
+            return
+
+        # Distinct (case-folded) patterns, each with the ids of the patterns it stands for
+        self.key_ids: Dict[str, tuple] = {}
+        for i, p in enumerate(self.patterns):
+            self.key_ids[self._key(p)] = self.key_ids.get(self._key(p), ()) + (i,)
+        self.overlap = max(len(k.encode("utf-8")) for k in self.key_ids)
+
+        if len(self.key_ids) <= self.FIND_LIMIT:
+            # bytes.find needs the exact bytes; folded non-ASCII letters need a case-variant regex
+            self.finders = [(key.encode("utf-8") if not self.fold or key.isascii()
+                             else re.compile(b"".join(_case_variants(ch) for ch in key)), ids)
+                            for key, ids in self.key_ids.items()]
+            self.trie = None
+        else:
+            trie: Dict = {}
+            for key in self.key_ids:
+                node = trie
+                for ch in key:
+                    node = node.setdefault(ch, {})
+                node[""] = True
+            self.prefix_ids = {key: tuple(i for k, ids in self.key_ids.items() if key.startswith(k) for i in ids)
+                               for key in self.key_ids}
+            self.trie = re.compile(self._trie_regex(trie))
+
+    def _key(self, text: str) -> str:
+        return text.lower() if self.fold else text
+
+    def _emit(self, ch: str) -> bytes:
+        if self.fold and not ch.isascii():
+            return _case_variants(ch)
+        # Folded chunks are lowercased by bytes.lower(), which covers ASCII
+        return re.escape(ch.encode("utf-8"))
+
+    def _trie_regex(self, node: Dict) -> bytes:
+        branches = [self._emit(ch) + self._trie_regex(child)
+                    for ch, child in sorted(node.items()) if ch != ""]
+        if not branches:
+            return b""
+        body = branches[0] if len(branches) == 1 else b"(?:" + b"|".join(branches) + b")"
+        # A pattern ends here but longer ones continue: greedy '?' prefers the longest
+        return b"(?:" + body + b")?" if "" in node else body
+
+    def iter_hits(self, buf) -> Iterator[tuple]:
+        """Yields (start, pattern ids) for every pattern occurrence, in position order."""
+        if self.group_ids is not None:
+            streams = [_find_all(buf, compiled, ids, len(buf)) for compiled, ids in self.separate]
+            if self.regex is not None:
+                streams.append((m.start(), (self.group_ids[m.lastindex],)) for m in self.regex.finditer(buf))
+            yield from heapq.merge(*streams, key=lambda hit: hit[0])
+            return
+        if not self.fold:
+            yield from self._hits_in(buf, len(buf))
+            return
+        for offset, chunk, limit in _folded_chunks(buf, self.overlap, self.CHUNK):
+            for start, ids in self._hits_in(chunk, limit):
+                yield offset + start, ids
+
+    def _hits_in(self, buf, limit: int) -> Iterator[tuple]:
+        """Occurrences starting before 'limit' in one buffer (a mapping or a folded chunk)."""
+        if self.trie is None:
+            yield from heapq.merge(*(_find_all(buf, finder, ids, limit) for finder, ids in self.finders),
+                                   key=lambda hit: hit[0])
+            return
+        pos = 0
+        while pos < limit:
+            m = self.trie.search(buf, pos, limit + self.overlap)
+            if m is None or m.start() >= limit:
+                return
+            yield m.start(), self.prefix_ids[self._key(m.group().decode("utf-8"))]
+            # Patterns starting inside this match were skipped by the search: try each spot
+            for inner in range(m.start() + 1, min(m.end(), limit)):
+                n = self.trie.match(buf, inner, limit + self.overlap)
+                if n is not None and n.end() > inner:
+                    yield inner, self.prefix_ids[self._key(n.group().decode("utf-8"))]
+            pos = max(m.end(), m.start() + 1)
+
+
+# A numbered backreference or conditional; a false positive only costs the pattern its own pass
+_GROUP_REF = re.compile(rb"\\[1-9]|\(\?\(")
+
+
+def _find_all(buf, finder, ids: tuple, limit: int) -> Iterator[tuple]:
+    """(start, ids) for every occurrence of one literal (bytes) or compiled regex."""
+    if isinstance(finder, bytes):
+        at = buf.find(finder)
+        while 0 <= at < limit:
+            yield at, ids
+            at = buf.find(finder, at + 1)
+    else:
+        for m in finder.finditer(buf):
+            if m.start() >= limit:
+                return
+            yield m.start(), ids
+
+
+def _folded_chunks(buf, overlap: int, chunk_size: int) -> Iterator[tuple]:
+    """
+    Yields (offset, lowercased chunk, limit) over buf. Chunks overlap by 'overlap'
+    bytes so a match straddling a boundary is seen whole; only matches starting
+    before 'limit' belong to a chunk, so none is reported twice.
+    """
+    size = len(buf)
+    for offset in range(0, size, chunk_size):
+        end = min(size, offset + chunk_size)
+        yield offset, buf[offset:end + overlap].lower(), end - offset
+
+
+def _case_variants(ch: str) -> bytes:
+    """Regex (bytes) matching one character in any case, e.g. 'é' -> (?:\xc3\x89|\xc3\xa9)."""
+    forms = sorted({v.encode("utf-8") for v in (ch, ch.lower(), ch.upper()) if len(v) == 1})
+    if len(forms) == 1:
+        return re.escape(forms[0])
+    return b"(?:" + b"|".join(re.escape(f) for f in forms) + b")"
+
+
+# ==========================================
+# WORKER SIDE (runs in pool processes)
+# ==========================================
+
+MAX_SNIPPET = 240
+
+
+def _search_batch(paths: List[str], matcher, options: Dict) -> List[Dict]:
+    results = []
+    for path in paths:
+        hit = _search_file(path, matcher, options)
+        if hit:
+            results.append(hit)
+    return results
+
+
+def _search_file(path: str, matcher, options: Dict) -> Optional[Dict]:
+    try:
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0 or size > options["max_size"]:
+                return None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if mm.find(b"\0", 0, options["sniff"]) >= 0:
+                    return None  # binary
+                matches, first_lines = _scan(mm, matcher, options["context"], options["max_matches"],
+                                             options["multi"])
+    except (OSError, ValueError):
+        return None
+
+    if not matches or (options["require_all"] and len(first_lines) < len(matcher.patterns)):
+        return None
+    hit = {"path": path, "matches": matches}
+    if options["multi"]:
+        hit["patterns"] = {matcher.patterns[i]: line for i, line in sorted(first_lines.items())}
+    return hit
+
+
+def _scan(mm, matcher, context: int, max_matches: int, multi: bool = False) -> tuple:
+    """
+    Collects matching lines, one record per line, counting newlines only up to
+    each hit. Once max_matches lines are recorded, scanning continues only until
+    every pattern has been seen. Returns (records, {pattern id: first line}).
+    """
+    matches = []
+    first_lines: Dict[int, int] = {}
+    line_no, counted_to, line_end = 1, 0, -1
+    record = None
+    wanted = len(matcher.patterns)
+    size = len(mm)
+
+    for start, ids in matcher.iter_hits(mm):
+        if start > line_end:
+            if len(matches) >= max_matches and len(first_lines) >= wanted:
+                break
+            line_start = mm.rfind(b"\n", 0, start) + 1
+            line_end = mm.find(b"\n", start)
+            if line_end < 0:
+                line_end = size
+            line_no += mm[counted_to:line_start].count(b"\n")
+            counted_to = line_start
+
+            record = None
+            if len(matches) < max_matches:
+                record = {"line": line_no, "text": _snippet(mm, line_start, line_end, start),
+                          "before": [], "after": []}
+                if context:
+                    record["before"] = _lines_before(mm, line_start, context)
+                    record["after"] = _lines_after(mm, line_end, context)
+                if multi:
+                    record["patterns"] = []
+                matches.append(record)
+
+        for i in ids:
+            first_lines.setdefault(i, line_no)
+            if multi and record is not None and matcher.patterns[i] not in record["patterns"]:
+                record["patterns"].append(matcher.patterns[i])
+    return matches, first_lines
+
+
+def _snippet(mm, line_start: int, line_end: int, hit: int) -> str:
+    """The matching line, decoded; very long lines (minified files) are cut around the hit."""
+    if line_end - line_start > MAX_SNIPPET:
+        line_start = max(line_start, hit - MAX_SNIPPET // 3)
+        line_end = min(line_end, line_start + MAX_SNIPPET)
+    return mm[line_start:line_end].decode("utf-8", errors="replace").rstrip("\r")
+
+
+def _lines_before(mm, line_start: int, count: int) -> List[str]:
+    lines = []
+    end = line_start - 1  # the '\n' ending the previous line
+    while end >= 0 and len(lines) < count:
+        start = mm.rfind(b"\n", 0, end) + 1
+        lines.append(_snippet(mm, start, end, start))
+        end = start - 1
+    return lines[::-1]
+
+
+def _lines_after(mm, line_end: int, count: int) -> List[str]:
+    lines = []
+    start = line_end + 1
+    while start < len(mm) and len(lines) < count:
+        end = mm.find(b"\n", start)
+        if end < 0:
+            end = len(mm)
+        lines.append(_snippet(mm, start, end, start))
+        start = end + 1
+    return lines
+
+
+def _batched(items: Iterator[str], size: int, first: Optional[int] = None) -> Iterator[List[str]]:
+    """Groups items into lists of 'size'; with 'first', sizes start there and double up to 'size'."""
+    batch = []
+    target = min(first or size, size)
+    for item in items:
+        batch.append(item)
+        if len(batch) >= target:
+            yield batch
+            batch = []
+            target = min(target * 2, size)
+    if batch:
+        yield batch
+
+
+def _chain(head: List, rest: Iterator) -> Iterator:
+    yield from head
+    yield from rest
@@ -0,0 +1,133 @@
+import os
+import heapq
+import stat
+import time
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+
+class DirectoryLister:
+    """
+    Paged listings of a single directory.
+
+    One os.scandir pass yields each entry's type from the directory data itself
+    (no extra syscall per entry); lstat is only called when size or mtime is
+    needed for sorting or display. The scanned rows are cached per directory and
+    reused while the directory's mtime is unchanged and the snapshot is younger
+    than CACHE_TTL, so paging through a 200k-entry folder scans it once.
+
+    A page is offset..offset+limit of the sorted order. Sorting uses a bounded
+    heap (heapq.nsmallest/nlargest) for the first offset+limit rows instead of
+    sorting everything (deep pages fall back to a full sort); directories always
+    come before files.
+    """
+
+    SORT_KEYS = ("name", "size", "mtime")
+    CACHE_TTL = 5.0          # seconds a snapshot is trusted (file sizes change without touching the dir mtime)
+    CACHE_DIRS = 8           # snapshots kept (LRU)
+    MAX_LIMIT = 1000         # largest page served
+
+    def __init__(self):
+        self._cache: "OrderedDict[str, Tuple[int, float, bool, List[Tuple]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def list_page(self, path: str, offset: int = 0, limit: int = 100, sort_by: str = "name",
+                  ascending: Optional[bool] = None, details: bool = False,
+                  include_hidden: bool = True) -> Dict:
+        """
+        Returns {"path", "total", "offset", "limit", "sort_by", "ascending", "has_more", "entries"}.
+        Each entry is {"name", "is_dir"} plus "size" and "mtime" when details=True
+        (or sort_by needs them); size is None for directories and -1 when lstat failed.
+        ascending defaults to True for name and False (largest/newest first) for size/mtime.
+        Raises FileNotFoundError, NotADirectoryError, PermissionError, ValueError (bad sort_by).
+        """
+        if sort_by not in self.SORT_KEYS:
+            raise ValueError(f"Cannot sort by '{sort_by}'. Use one of: {', '.join(self.SORT_KEYS)}.")
+        if ascending is None:
+            ascending = sort_by == "name"
+        offset = max(0, int(offset))
+        limit = max(1, min(int(limit), self.MAX_LIMIT))
+
+        rows = self._rows(os.path.abspath(path), with_stat=details or sort_by != "name")
+        if not include_hidden:
+            rows = [r for r in rows if not r[0].startswith(".")]
+
+        page = self._sorted_prefix(rows, offset + limit, sort_by, ascending)[offset:]
+        entries = []
+        for name, is_dir, size, mtime in page:
+            entry = {"name": name, "is_dir": is_dir}
+            if details or sort_by != "name":
+                entry["size"] = None if is_dir else size
+                entry["mtime"] = mtime
+            entries.append(entry)
+        return {"path": os.path.abspath(path), "total": len(rows), "offset": offset, "limit": limit,
+                "sort_by": sort_by, "ascending": ascending,
+                "has_more": offset + len(entries) < len(rows), "entries": entries}
+
+    def invalidate(self, path: Optional[str] = None):
+        """Drops the snapshot of one directory, or all of them."""
+        with self._lock:
+            if path is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(os.path.abspath(path), None)
+
+    # ==========================================
+    # SCANNING & SORTING
+    # ==========================================
+
+    def _rows(self, path: str, with_stat: bool) -> List[Tuple]:
+        """(name, is_dir, size, mtime) per entry, from the cache when it is still valid."""
+        st = os.stat(path)
+        if not stat.S_ISDIR(st.st_mode):
+            raise NotADirectoryError(f"'{path}' is not a directory.")
+        dir_mtime = st.st_mtime_ns
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(path)
+            if cached and cached[0] == dir_mtime and now - cached[1] < self.CACHE_TTL and \
+                    (cached[2] or not with_stat):
+                self._cache.move_to_end(path)
+                return cached[3]
+
+        rows = []
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                size = mtime = None
+                if with_stat:
+                    try:
+                        info = entry.stat(follow_symlinks=False)
+                        size, mtime = info.st_size, info.st_mtime
+                    except OSError:
+                        size, mtime = -1, -1
+                rows.append((entry.name, is_dir, size, mtime))
+
+        with self._lock:
+            self._cache[path] = (dir_mtime, now, with_stat, rows)
+            self._cache.move_to_end(path)
+            while len(self._cache) > self.CACHE_DIRS:
+                self._cache.popitem(last=False)
+        return rows
+
+    @staticmethod
+    def _sorted_prefix(rows: List[Tuple], k: int, sort_by: str, ascending: bool) -> List[Tuple]:
+        """The first k rows in order: directories first, then by sort_by (ties broken by name)."""
+        column = {"size": 2, "mtime": 3}.get(sort_by)
+        # nlargest reverses the whole key, so the directory flag is flipped to keep folders on top
+        dir_rank = 0 if ascending else 1
+        if column is None:
+            def key(r):
+                return (dir_rank if r[1] else 1 - dir_rank, r[0].lower(), r[0])
+        else:
+            def key(r):
+                return (dir_rank if r[1] else 1 - dir_rank, r[column] or 0, r[0].lower())
+
+        if k * 8 >= len(rows):  # deep pages: a full sort beats a heap that large
+            return sorted(rows, key=key, reverse=not ascending)[:k]
+        pick = heapq.nsmallest if ascending else heapq.nlargest
+        return pick(k, rows, key=key)
@@ -0,0 +1,361 @@
+import os
+import json
+import base64
+import queue
+import hashlib
+import threading
+import http.client
+import urllib.request
+from urllib.parse import urlsplit, urljoin, unquote
+from concurrent.futures import ThreadPoolExecutor, FIRST_EXCEPTION, wait
+from typing import Dict, Optional, Callable
+
+from src.backend.core.copier import ByteProgress
+
+
+class DownloadCancelled(Exception):
+    """
+    Raised when a download is stopped through its cancel_event. 'resumable' tells whether the
+    .part file was kept for a later call to continue (ranged downloads with a validator only).
+    """
+
+    def __init__(self, resumable: bool = False):
+        super().__init__("Download cancelled.")
+        self.resumable = resumable
+
+
+class DownloadError(Exception):
+    """Raised for HTTP errors and failed size/checksum verification."""
+
+
+class DownloadEngine:
+    """
+    HTTP(S) downloads that are parallel, resumable and verified.
+
+    A first GET asks for a single byte ("Range: bytes=0-0"). A 206 reply proves
+    the server serves ranges and gives the size; the file is then fetched as
+    CHUNK-sized ranges by a few worker threads, each reusing a keep-alive
+    connection from a small pool, and written in place into "<name>.part".
+    Finished chunks are recorded in "<name>.part.json", so an interrupted
+    download (cancel, crash, network loss) resumes with only the missing chunks,
+    provided the server still reports the same ETag/Last-Modified and size.
+    Servers without range support are streamed in one request instead (and
+    restart from zero). The .part file becomes the destination only after the
+    size and the optional checksum have been verified.
+    """
+
+    CHUNK = 8 * 1024 * 1024               # bytes per ranged request
+    PARALLEL_BYTES = 16 * 1024 * 1024     # smaller files are fetched over one connection
+    WORKERS = 4                           # concurrent connections
+    BLOCK = 256 * 1024                    # bytes per socket read
+    TIMEOUT = 30.0                        # seconds per connect/read
+    RETRIES = 3                           # per chunk, on network errors
+    RETRY_DELAY = 0.5                     # seconds before the first retry; doubles with each attempt
+    MAX_REDIRECTS = 5
+    PROGRESS_INTERVAL = 0.2
+    USER_AGENT = "OSAssistant/1.0"
+
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = workers or self.WORKERS
+
+    def download(self, url: str, destination: str, expected_size: Optional[int] = None,
+                 checksum: Optional[str] = None, progress_callback: Optional[Callable[[Dict], None]] = None,
+                 cancel_event: Optional[threading.Event] = None) -> Dict:
+        """
+        Downloads url to destination (a file path). checksum is "algorithm:hex" (e.g.
+        "sha256:ab12...") or a bare sha256 hex digest. Raises DownloadError on HTTP or
+        verification errors (a corrupt .part is discarded), DownloadCancelled on cancel.
+        Returns {"path", "bytes", "elapsed", "throughput", "resumed", "connections", "ranged"}.
+        """
+        cancel_event = cancel_event or threading.Event()
+        part, state_path = destination + ".part", destination + ".part.json"
+        pools: Dict[tuple, _ConnectionPool] = {}
+        try:
+            final_url, response, conn = self._probe(url, pools)
+            if response.status == 206:
+                size = _total_from_content_range(response.getheader("Content-Range"))
+                validator = response.getheader("ETag") or response.getheader("Last-Modified")
+                response.read()
+                pools[_origin(final_url)].put(conn)
+                if expected_size is not None and size != expected_size:
+                    raise DownloadError(f"Server reports {size} bytes, expected {expected_size}.")
+                stats = self._fetch_ranges(final_url, size, validator, part, state_path, pools,
+                                           progress_callback, cancel_event)
+            else:
+                stats = self._fetch_stream(response, part, state_path, progress_callback, cancel_event)
+                conn.close()
+        finally:
+            for pool in pools.values():
+                pool.close()
+
+        try:
+            self._verify(part, expected_size if expected_size is not None else stats["bytes"], checksum)
+        except DownloadError:
+            _discard(part, state_path)
+            raise
+        os.replace(part, destination)
+        _discard(state_path)
+        stats["path"] = destination
+        return stats
+
+    # ==========================================
+    # REQUESTS
+    # ==========================================
+
+    def _probe(self, url: str, pools: Dict[tuple, "_ConnectionPool"]) -> tuple:
+        """GET with 'Range: bytes=0-0', following redirects. Returns (final url, response, connection)."""
+        for _ in range(self.MAX_REDIRECTS + 1):
+            origin = _origin(url)
+            if origin not in pools:
+                pools[origin] = _ConnectionPool(origin, self.TIMEOUT)
+            conn = pools[origin].get()
+            response = self._request(pools[origin], conn, url, {"Range": "bytes=0-0"})
+            if response.status in (301, 302, 303, 307, 308) and response.getheader("Location"):
+                response.read()
+                pools[origin].put(conn)
+                url = urljoin(url, response.getheader("Location"))
+                continue
+            if response.status not in (200, 206):
+                conn.close()
+                raise DownloadError(f"HTTP {response.status} {response.reason} for {url}")
+            return url, response, conn
+        raise DownloadError(f"Too many redirects for {url}")
+
+    def _request(self, pool: "_ConnectionPool", conn: http.client.HTTPConnection, url: str,
+                 headers: Dict) -> http.client.HTTPResponse:
+        conn.request("GET", pool.target(url), headers={"User-Agent": self.USER_AGENT,
+                                                       "Accept-Encoding": "identity",
+                                                       **pool.proxy_headers, **headers})
+        return conn.getresponse()
+
+    def _fetch_stream(self, response: http.client.HTTPResponse, part: str, state_path: str,
+                      progress_callback, cancel_event: threading.Event) -> Dict:
+        """No range support: one sequential request from byte 0 (any old .part is overwritten)."""
+        _discard(state_path)
+        length = response.getheader("Content-Length")
+        progress = ByteProgress(int(length) if length else 0, progress_callback, self.PROGRESS_INTERVAL,
+                                action="download_file")
+        with open(part, "wb") as out:
+            while True:
+                if cancel_event.is_set():
+                    out.close()
+                    _discard(part)  # cannot be resumed without range support
+                    raise DownloadCancelled(resumable=False)
+                block = response.read(self.BLOCK)
+                if not block:
+                    break
+                out.write(block)
+                progress.advance(len(block))
+        progress.finish()
+        return _stats(progress, resumed=0, connections=1, ranged=False)
+
+    def _fetch_ranges(self, url: str, size: int, validator: Optional[str], part: str, state_path: str,
+                      pools: Dict[tuple, "_ConnectionPool"], progress_callback,
+                      cancel_event: threading.Event) -> Dict:
+        chunk = self.CHUNK if size >= self.PARALLEL_BYTES else max(size, 1)
+        chunks = [(start, min(start + chunk, size) - 1) for start in range(0, size, chunk)]
+        state = {"url": url, "size": size, "validator": validator, "chunk": chunk, "done": []}
+        previous = _load_state(state_path)
+        # A .part of the wrong size (truncated, or not ours) cannot hold the recorded chunks
+        if previous and validator and os.path.isfile(part) and os.path.getsize(part) == size and \
+                all(previous.get(k) == state[k] for k in ("size", "validator", "chunk")):
+            state["done"] = previous["done"]
+        else:
+            with open(part, "wb") as f:
+                f.truncate(size)
+        done = set(state["done"])
+        todo = [i for i in range(len(chunks)) if i not in done]
+        resumed = sum(chunks[i][1] - chunks[i][0] + 1 for i in done)
+
+        progress = ByteProgress(size, progress_callback, self.PROGRESS_INTERVAL, action="download_file")
+        progress.advance(resumed)
+        lock = threading.Lock()
+        abort = threading.Event()
+
+        def fetch(index: int):
+            start, end = chunks[index]
+            self._fetch_range(url, start, end, part, pools, progress, cancel_event, abort)
+            with lock:
+                state["done"].append(index)
+                _save_state(state_path, state)
+
+        connections = min(self.workers, len(todo)) or 1
+        with ThreadPoolExecutor(max_workers=connections) as pool:
+            futures = [pool.submit(fetch, i) for i in todo]
+            finished, _ = wait(futures, return_when=FIRST_EXCEPTION)
+            failed = [f for f in finished if f.exception() is not None]
+            if failed:
+                abort.set()
+                for f in futures:
+                    f.cancel()
+                wait(futures)
+                error = failed[0].exception()
+                if isinstance(error, DownloadCancelled):
+                    error.resumable = bool(validator)  # without a validator the next call starts over
+                raise error
+        progress.finish()
+        return _stats(progress, resumed=resumed, connections=connections, ranged=True)
+
+    def _fetch_range(self, url: str, start: int, end: int, part: str, pools: Dict[tuple, "_ConnectionPool"],
+                     progress: ByteProgress, cancel_event: threading.Event, abort: threading.Event):
+        """
+        Fetches bytes [start, end] into the .part file. Network errors are retried
+        from where the transfer stopped, after RETRY_DELAY, 2x, 4x... seconds.
+        """
+        pool = pools[_origin(url)]
+        attempt = 0
+        with open(part, "r+b") as out:
+            while start <= end:
+                conn = pool.get()
+                try:
+                    response = self._request(pool, conn, url, {"Range": f"bytes={start}-{end}"})
+                    if response.status != 206 or \
+                            not (response.getheader("Content-Range") or "").startswith(f"bytes {start}-"):
+                        conn.close()
+                        raise DownloadError(f"Server ignored the range request (HTTP {response.status}).")
+                    out.seek(start)
+                    while start <= end:
+                        if cancel_event.is_set() or abort.is_set():
+                            conn.close()
+                            raise DownloadCancelled()
+                        block = response.read(min(self.BLOCK, end - start + 1))
+                        if not block:
+                            break
+                        out.write(block)
+                        start += len(block)
+                        progress.advance(len(block))
+                    if start <= end:
+                        raise http.client.IncompleteRead(b"", end - start + 1)
+                    pool.put(conn)
+                except (OSError, http.client.HTTPException) as e:
+                    conn.close()
+                    attempt += 1
+                    if attempt > self.RETRIES:
+                        raise DownloadError(f"Network error at byte {start}: {e}")
+                    if cancel_event.wait(self.RETRY_DELAY * 2 ** (attempt - 1)) or abort.is_set():
+                        raise DownloadCancelled()
+
+    def _verify(self, part: str, expected_size: int, checksum: Optional[str]):
+        actual = os.path.getsize(part)
+        if actual != expected_size:
+            raise DownloadError(f"Size mismatch: got {actual} bytes, expected {expected_size}.")
+        if not checksum:
+            return
+        algorithm, _, digest = checksum.rpartition(":")
+        h = hashlib.new(algorithm.lower() or "sha256")
+        with open(part, "rb") as f:
+            while True:
+                block = f.read(1024 * 1024)
+                if not block:
+                    break
+                h.update(block)
+        if h.hexdigest() != digest.lower():
+            raise DownloadError(f"Checksum mismatch: {h.name} is {h.hexdigest()}, expected {digest.lower()}.")
+
+
+class _ConnectionPool:
+    """
+    Keep-alive connections to one origin, handed out to one thread at a time.
+
+    Proxies are taken from the environment like urllib does (HTTP_PROXY, HTTPS_PROXY,
+    NO_PROXY; the system settings on Windows/macOS): https goes through a CONNECT
+    tunnel, plain http sends absolute-form requests to the proxy.
+    """
+
+    def __init__(self, origin: tuple, timeout: float):
+        self.origin = origin
+        self.timeout = timeout
+        self._idle: "queue.Queue[http.client.HTTPConnection]" = queue.Queue()
+        self.proxy: Optional[tuple] = None  # (host, port)
+        self.proxy_headers: Dict[str, str] = {}
+        self._tunnel_headers: Dict[str, str] = {}
+
+        scheme, host, _ = origin
+        proxy_url = urllib.request.getproxies().get(scheme)
+        if proxy_url and not urllib.request.proxy_bypass(host):
+            if "://" not in proxy_url:
+                proxy_url = "http://" + proxy_url
+            parts = urlsplit(proxy_url)
+            self.proxy = (parts.hostname, parts.port or 80)
+            auth = {}
+            if parts.username is not None:
+                credentials = f"{unquote(parts.username)}:{unquote(parts.password or '')}"
+                auth["Proxy-Authorization"] = "Basic " + base64.b64encode(credentials.encode()).decode()
+            if scheme == "https":
+                self._tunnel_headers = auth
+            else:
+                self.proxy_headers = auth
+
+    def target(self, url: str) -> str:
+        """Request target: the absolute URL for a plain-http proxy, else path and query."""
+        if self.proxy and self.origin[0] == "http":
+            return url.split("#", 1)[0]
+        parts = urlsplit(url)
+        return (parts.path or "/") + ("?" + parts.query if parts.query else "")
+
+    def get(self) -> http.client.HTTPConnection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            scheme, host, port = self.origin
+            cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            if self.proxy is None:
+                return cls(host, port, timeout=self.timeout)
+            conn = cls(*self.proxy, timeout=self.timeout)
+            if scheme == "https":
+                conn.set_tunnel(host, port, headers=self._tunnel_headers)
+            return conn
+
+    def put(self, conn: http.client.HTTPConnection):
+        self._idle.put(conn)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+def _origin(url: str) -> tuple:
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https"):
+        raise DownloadError(f"Unsupported URL scheme '{parts.scheme}'.")
+    return parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == "https" else 80)
+
+
+def _total_from_content_range(value: Optional[str]) -> int:
+    """'bytes 0-0/12345' -> 12345."""
+    try:
+        return int(value.rsplit("/", 1)[1])
+    except (AttributeError, IndexError, ValueError):
+        raise DownloadError(f"Server sent an unusable Content-Range: {value!r}")
+
+
+def _stats(progress: ByteProgress, resumed: int, connections: int, ranged: bool) -> Dict:
+    return {"bytes": progress.done, "elapsed": round(progress.elapsed, 3),
+            "throughput": round(progress.throughput, 1), "resumed": resumed,
+            "connections": connections, "ranged": ranged}
+
+
+def _load_state(path: str) -> Optional[Dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_state(path: str, state: Dict):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+
+def _discard(*paths: str):
+    for path in paths:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,129 @@
+import os
+import stat
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Callable, Tuple
+
+from src.backend.core.filter import FilterEngine
+from src.backend.core.hash_cache import HashCache
+
+
+class DuplicateFinder:
+    """
+    Finds files with identical content under a folder.
+
+    Candidates are narrowed in stages so most files are never read in full:
+    1. group by size (stat only; a unique size cannot have a duplicate),
+    2. hash the first and last PARTIAL_BYTES of each same-size file,
+    3. fully hash only files whose partial hashes still collide.
+    Hashing runs on a thread pool (hashlib releases the GIL, and the reads are
+    I/O-bound); full hashes go through the HashCache, so unchanged files are
+    free on the next run. Hard links to one inode count as a single file.
+    """
+
+    PARTIAL_BYTES = 64 * 1024
+
+    def __init__(self, filter_engine: Optional[FilterEngine] = None,
+                 hash_cache: Optional[HashCache] = None, workers: Optional[int] = None):
+        self.filter_engine = filter_engine or FilterEngine()
+        self.hash_cache = hash_cache if hash_cache is not None else HashCache(db_path=":memory:")
+        self.workers = workers or min(16, (os.cpu_count() or 1) * 4)
+
+    def find(self, root: str, filters: Optional[Dict] = None, recursive: bool = True,
+             include_hidden: bool = False, exclude: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Returns the duplicate groups, largest reclaimable space first:
+            [{"size": int, "paths": [str], "mtimes": [int], "digest": str}]
+        Within a group the copy to keep comes first: the oldest, then the shortest path.
+        mtimes are the paths' st_mtime_ns as scanned; with digest they let
+        keeper_unchanged() and copy_unchanged() re-check a group before acting on it.
+        'filters' is a FilterEngine filters dict (extension, min_size, modified_after, ...).
+        """
+        filters = dict(filters or {})
+        filters.setdefault("min_size", "1")  # empty files are all "identical"; not worth reporting
+        candidates = self.filter_engine.iter_filters(root, filters, recursive=recursive, exclude=exclude,
+                                                     include_hidden=include_hidden)
+
+        # Stage 1: size
+        by_size: Dict[int, List[tuple]] = {}
+        seen_inodes = set()
+        for path in candidates:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            if not stat.S_ISREG(st.st_mode) or (st.st_dev, st.st_ino) in seen_inodes:
+                continue
+            seen_inodes.add((st.st_dev, st.st_ino))
+            by_size.setdefault(st.st_size, []).append((str(path), st.st_mtime_ns, st.st_size))
+        groups = [g for g in by_size.values() if len(g) > 1]
+        if not groups:
+            return []
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            # Stage 2: first/last block. Small files are read whole here, so this hash is final.
+            hashed = self._split(pool, groups, self._partial_hash)
+            # Stage 3: full content, for files larger than the two sampled blocks
+            final = [(d, g) for d, g in hashed if g[0][2] <= 2 * self.PARTIAL_BYTES]
+            large = [g for d, g in hashed if g[0][2] > 2 * self.PARTIAL_BYTES]
+            final += self._split(pool, large, self.hash_cache.file_hash)
+
+        results = []
+        for digest, group in final:
+            keep_first = sorted(group, key=lambda item: (item[1], len(item[0]), item[0]))
+            results.append({"size": group[0][2], "paths": [item[0] for item in keep_first],
+                            "mtimes": [item[1] for item in keep_first], "digest": digest})
+        results.sort(key=lambda r: (-r["size"] * (len(r["paths"]) - 1), r["paths"][0]))
+        return results
+
+    def keeper_unchanged(self, group: Dict) -> bool:
+        """
+        True if the copy a find() group keeps (paths[0]) still has the size, mtime and
+        digest it was grouped by, so deleting the other copies cannot lose the content.
+        """
+        keeper = group["paths"][0]
+        try:
+            st = os.stat(keeper)
+        except OSError:
+            return False
+        if (st.st_size, st.st_mtime_ns) != (group["size"], group["mtimes"][0]):
+            return False
+        hasher = self._partial_hash if st.st_size <= 2 * self.PARTIAL_BYTES else self.hash_cache.file_hash
+        return self._safe(hasher, keeper) == group["digest"]
+
+    @staticmethod
+    def copy_unchanged(group: Dict, path: str) -> bool:
+        """True if 'path', one of the group's copies, still has the size and mtime it was scanned with."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        return (st.st_size, st.st_mtime_ns) == (group["size"], group["mtimes"][group["paths"].index(path)])
+
+    def _split(self, pool: ThreadPoolExecutor, groups: List[List[tuple]],
+               hasher: Callable[[str], Optional[str]]) -> List[Tuple[str, List[tuple]]]:
+        """Sub-divides each group by 'hasher'; returns (digest, sub-group) for those that still have 2+ files."""
+        items = [item for g in groups for item in g]
+        digests = pool.map(lambda item: self._safe(hasher, item[0]), items)
+        buckets: Dict[tuple, List[tuple]] = {}
+        for item, digest in zip(items, digests):
+            if digest is not None:
+                buckets.setdefault((item[2], digest), []).append(item)
+        return [(key[1], b) for key, b in buckets.items() if len(b) > 1]
+
+    def _partial_hash(self, path: str) -> str:
+        h = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            h.update(f.read(self.PARTIAL_BYTES))
+            if size > self.PARTIAL_BYTES:
+                f.seek(max(self.PARTIAL_BYTES, size - self.PARTIAL_BYTES))
+                h.update(f.read(self.PARTIAL_BYTES))
+        return h.hexdigest()
+
+    @staticmethod
+    def _safe(hasher: Callable[[str], str], path: str) -> Optional[str]:
+        try:
+            return hasher(path)
+        except (OSError, ValueError):
+            return None  # vanished or unreadable: cannot be proven a duplicate
@@ -1,7 +1,13 @@
 import os
+import heapq
+import queue
+import fnmatch
+import itertools
+import threading
+from contextlib import closing
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Union
+from typing import List, Dict, Union, Optional, Iterator
 
 
 class FilterEngine:
@@ -10,133 +16,290 @@ class FilterEngine:
     Decouples selection logic from the LLM, ensuring 100% accurate sorting/filtering.
     """
 
-    def apply_filters(self, source_dir: str, filters: Dict) -> List[Path]:
+    # Directory names never descended into during recursive scans (glob patterns)
+    DEFAULT_EXCLUDES = ["node_modules", ".git", "__pycache__", ".cache", ".venv", "venv", ".Trash*"]
+    # Words the LLM uses for the two sort keys
+    SORT_ALIASES = {"size": "size", "bytes": "size", "largest": "size", "biggest": "size",
+                    "mtime": "mtime", "date": "mtime", "modified": "mtime", "time": "mtime", "newest": "mtime"}
+
+    def __init__(self, backend: str = "serial", workers: Optional[int] = None, catalog=None):
+        """
+        backend: "serial" walks on the calling thread; "parallel" spreads directory
+                 listing and stat() calls over a thread pool, which pays off on
+                 slow or network-backed disks where each syscall is latency-bound;
+                 "catalog" answers queries from a FileCatalog (SQL range scans) for
+                 folders it covers and falls back to a serial walk elsewhere.
+        workers: thread count for the parallel backend (default: 4x CPU count, max 32).
+        catalog: the FileCatalog used by the "catalog" backend.
+        """
+        if backend not in ("serial", "parallel", "catalog"):
+            raise ValueError(f"Unknown filter backend '{backend}'. Use 'serial', 'parallel' or 'catalog'.")
+        if backend == "catalog" and catalog is None:
+            raise ValueError("The 'catalog' backend needs a FileCatalog.")
+        self.backend = backend
+        self.workers = workers or min(32, (os.cpu_count() or 1) * 4)
+        self.catalog = catalog
+
+    def apply_filters(self, source_dir: str, filters: Union[Dict, "CompiledFilter"], recursive: bool = False,
+                      max_depth: Optional[int] = None, exclude: Optional[List[str]] = None,
+                      include_hidden: bool = True, limit: Optional[int] = None,
+                      sort_by: Optional[str] = None, ascending: bool = False,
+                      count_only: bool = False) -> Union[List[Path], int]:
         """
         Scans source_dir and returns a list of paths that match ALL provided filters.
+        'filters' may be a raw filters dict or the result of compile().
+
+        recursive: descend into subdirectories (default: only the top level).
+        max_depth: how many levels below source_dir to descend (None = unlimited).
+        exclude: glob patterns for names to skip; matching directories are pruned
+                 entirely. Defaults to DEFAULT_EXCLUDES when recursive.
+        include_hidden: whether dot-files and dot-directories are considered.
+        limit: stop after this many results (or keep the top 'limit' when sorting).
+        sort_by: "size" or "mtime"; largest/newest first unless ascending=True.
+                 With a limit, a bounded heap keeps only the top-k in memory.
+        count_only: return the number of matches instead of the paths.
+        Raises ValueError for an unknown sort_by or a limit that is not a positive integer
+        (see check_options); scan errors are logged and give an empty result.
         """
-        root = Path(source_dir).expanduser().resolve()
-
-        if not root.exists():
-            print(f"Filter Warning: Source directory '{root}' not found.")
-            return []
-
-        matched_files = []
-
+        sort_by, limit = self.check_options(sort_by, limit)
         try:
-            for item in root.iterdir():
-                if not item.is_file():
-                    continue
-
-                # Check 1: Name & Extension (Updated for Lists)
-                if not self._check_name_and_type(item, filters):
-                    continue
-
-                # Get stats once
-                try:
-                    stats = item.stat()
-                except FileNotFoundError:
-                    continue
-
-                    # Check 2: Size
-                if not self._check_size(stats, filters):
-                    continue
-
-                # Check 3: Time
-                if not self._check_time(stats, filters):
-                    continue
-
-                matched_files.append(item)
-
-            return matched_files
+            indexed = self._iter_catalog(source_dir, filters, recursive, max_depth, exclude,
+                                         include_hidden, sort_by, ascending)
+            if indexed is not None:
+                # Already filtered and ordered by SQL
+                if count_only:
+                    return sum(1 for _ in indexed)
+                return [Path(p) for p in itertools.islice(indexed, limit)]
+
+            # Closing the generator stops the parallel backend's workers when the limit ends the scan early
+            with closing(self._iter_matches(source_dir, filters, recursive, max_depth, exclude,
+                                            include_hidden)) as matches:
+                if count_only:
+                    return sum(1 for _ in matches)
+
+                if sort_by:
+                    key = self._sort_key(sort_by)
+                    if limit is not None:
+                        pick = heapq.nsmallest if ascending else heapq.nlargest
+                        top = pick(limit, matches, key=key)
+                    else:
+                        top = sorted(matches, key=key, reverse=not ascending)
+                    return [Path(e.path) for e in top]
+
+                return [Path(e.path) for e in itertools.islice(matches, limit)]
 
         except Exception as e:
             print(f"Critical Filter Error: {str(e)}")
-            return []
+            return 0 if count_only else []
 
-    # ==========================================
-    # 1. NAME & TYPE CHECKS (UPDATED)
-    # ==========================================
-    def _check_name_and_type(self, item: Path, filters: Dict) -> bool:
+    def check_options(self, sort_by, limit) -> tuple:
         """
-        Checks file name and extension.
-        Supports both 'extension': 'jpg' AND 'extensions': ['jpg', 'png']
+        Normalises apply_filters' sort_by and limit as they come from the LLM:
+        sort_by may be an alias such as "date" or "largest", limit a numeric string.
+        Returns (sort_by or None, limit or None); raises ValueError for anything else.
         """
-        # Gather all allowed extensions into one list
-        allowed_exts = []
-
-        # Case A: Plural list from LLM (e.g. ["jpg", "png"])
-        if 'extensions' in filters and isinstance(filters['extensions'], list):
-            allowed_exts.extend(filters['extensions'])
-
-        # Case B: Singular string from LLM (e.g. "jpg")
-        if 'extension' in filters and isinstance(filters['extension'], str):
-            allowed_exts.append(filters['extension'])
-
-        # If we have any extension constraints, check them
-        if allowed_exts:
-            # Normalize input: strip spaces, lowercase, ensure dot
-            cleaned_exts = []
-            for ext in allowed_exts:
-                ext = ext.lower().strip()
-                if not ext.startswith("."):
-                    ext = "." + ext
-                cleaned_exts.append(ext)
-
-            # The Check: Does the file end with ANY of the allowed extensions?
-            if item.suffix.lower() not in cleaned_exts:
-                return False
-
-        # Filter: Name Contains
-        if 'name_contains' in filters:
-            if filters['name_contains'].lower() not in item.name.lower():
-                return False
-
-        # Filter: Exact Name
-        if 'name_exact' in filters:
-            if item.name != filters['name_exact']:
-                return False
+        if sort_by is not None and str(sort_by).strip():
+            key = str(sort_by).strip().lower()
+            if key not in self.SORT_ALIASES:
+                raise ValueError(f"Cannot sort by '{sort_by}'. Use 'size' or 'mtime'.")
+            sort_by = self.SORT_ALIASES[key]
+        else:
+            sort_by = None
+
+        if limit is not None and str(limit).strip():
+            try:
+                limit = int(str(limit).strip())
+            except ValueError:
+                raise ValueError(f"Limit must be a whole number, not '{limit}'.") from None
+            if limit < 1:
+                raise ValueError(f"Limit must be at least 1, not {limit}.")
+        else:
+            limit = None
+        return sort_by, limit
+
+    def iter_filters(self, source_dir: str, filters: Union[Dict, "CompiledFilter"], recursive: bool = False,
+                     max_depth: Optional[int] = None, exclude: Optional[List[str]] = None,
+                     include_hidden: bool = True) -> Iterator[Path]:
+        """
+        Streaming variant of apply_filters: yields matching paths as they are found.
+        Stop iterating (or close the generator) to end the scan early.
+        """
+        indexed = self._iter_catalog(source_dir, filters, recursive, max_depth, exclude, include_hidden)
+        if indexed is not None:
+            for p in indexed:
+                yield Path(p)
+            return
+
+        for entry in self._iter_matches(source_dir, filters, recursive, max_depth, exclude, include_hidden):
+            yield Path(entry.path)
+
+    def _iter_catalog(self, source_dir: str, filters: Union[Dict, "CompiledFilter"], recursive: bool,
+                      max_depth: Optional[int], exclude: Optional[List[str]], include_hidden: bool,
+                      sort_by: Optional[str] = None, ascending: bool = False) -> Optional[Iterator[str]]:
+        """
+        Catalog-backed query, or None when the catalog backend is off or does not
+        cover source_dir. Stale directories under source_dir are re-listed first.
+        """
+        if self.backend != "catalog":
+            return None
+        root = Path(source_dir).expanduser().resolve()
+        if not self.catalog.covers(str(root)):
+            return None
+
+        if exclude is None:
+            exclude = self.DEFAULT_EXCLUDES if recursive else []
+        predicate = filters if isinstance(filters, CompiledFilter) else self.compile(filters)
+
+        self.catalog.ensure_fresh(str(root))
+        return self.catalog.query(str(root), predicate, recursive=recursive, max_depth=max_depth,
+                                  exclude=exclude, include_hidden=include_hidden,
+                                  sort_by=sort_by, ascending=ascending)
+
+    def _iter_matches(self, source_dir: str, filters: Union[Dict, "CompiledFilter"], recursive: bool,
+                      max_depth: Optional[int], exclude: Optional[List[str]],
+                      include_hidden: bool) -> Iterator[os.DirEntry]:
+        """Yields matching DirEntries from whichever backend is configured."""
+        root = Path(source_dir).expanduser().resolve()
 
-        return True
+        if not root.exists():
+            print(f"Filter Warning: Source directory '{root}' not found.")
+            return
 
-    # ==========================================
-    # 2. SIZE CHECKS
-    # ==========================================
-    def _check_size(self, stats, filters: Dict) -> bool:
-        if 'min_size' in filters:
-            min_bytes = self._parse_size(filters['min_size'])
-            if stats.st_size < min_bytes:
-                return False
+        if exclude is None:
+            exclude = self.DEFAULT_EXCLUDES if recursive else []
 
-        if 'max_size' in filters:
-            max_bytes = self._parse_size(filters['max_size'])
-            if stats.st_size > max_bytes:
-                return False
+        predicate = filters if isinstance(filters, CompiledFilter) else self.compile(filters)
+        if self.backend == "parallel" and recursive:
+            yield from self._scan_parallel(root, predicate, max_depth, exclude, include_hidden)
+            return
 
-        return True
+        for entry in self._scan(root, recursive, max_depth, exclude, include_hidden):
+            if predicate(entry):
+                yield entry
 
-    # ==========================================
-    # 3. TIME CHECKS
-    # ==========================================
-    def _check_time(self, stats, filters: Dict) -> bool:
-        # MODIFIED TIME
-        if 'modified_after' in filters:
-            limit = self._parse_date(filters['modified_after'])
-            if stats.st_mtime < limit: return False
+    def _sort_key(self, sort_by: str):
+        if sort_by not in ("size", "mtime"):
+            raise ValueError(f"Cannot sort by '{sort_by}'. Use 'size' or 'mtime'.")
+        attr = "st_size" if sort_by == "size" else "st_mtime"
 
-        if 'modified_before' in filters:
-            limit = self._parse_date(filters['modified_before'])
-            if stats.st_mtime > limit: return False
+        def key(entry):
+            try:
+                return getattr(entry.stat(), attr)
+            except OSError:
+                return -1
+        return key
 
-        # CREATED TIME
-        if 'created_after' in filters:
-            limit = self._parse_date(filters['created_after'])
-            if stats.st_ctime < limit: return False
+    def compile(self, filters: Dict) -> "CompiledFilter":
+        """
+        Parses a filters dict once into a reusable predicate.
+        Sizes become byte counts, dates become epoch timestamps and the
+        extension list becomes a frozenset, so per-entry checks are plain comparisons.
+        """
+        return CompiledFilter(self, filters)
 
-        if 'created_before' in filters:
-            limit = self._parse_date(filters['created_before'])
-            if stats.st_ctime > limit: return False
+    def _scan(self, root: Path, recursive: bool, max_depth: Optional[int],
+              exclude: List[str], include_hidden: bool) -> Iterator[os.DirEntry]:
+        """
+        Yields file DirEntries under root using os.scandir.
+        Excluded or hidden directories are pruned without being listed.
+        """
+        stack = [(str(root), 0)]
+        while stack:
+            current, depth = stack.pop()
+            descend = recursive and (max_depth is None or depth < max_depth)
+            files, subdirs = self._list_dir(current, descend, exclude, include_hidden)
+            stack.extend((d, depth + 1) for d in subdirs)
+            yield from files
+
+    def _scan_parallel(self, root: Path, predicate: "CompiledFilter", max_depth: Optional[int],
+                       exclude: List[str], include_hidden: bool) -> Iterator[os.DirEntry]:
+        """
+        Recursive scan on a thread pool. Workers pull directories off a shared
+        queue, evaluate the predicate on their files (stat included) and push
+        subdirectories back, so idle workers pick up whatever is pending.
+        Matches are yielded as workers find them; the same set as the serial
+        scan, possibly in a different order. Closing the generator stops the walk.
+        """
+        pending = queue.Queue()
+        found_q = queue.Queue()
+        stop = threading.Event()
+        pending.put((str(root), 0))
+
+        def worker():
+            while True:
+                item = pending.get()
+                if item is None:
+                    return
+                try:
+                    if stop.is_set():
+                        continue
+                    current, depth = item
+                    descend = max_depth is None or depth < max_depth
+                    files, subdirs = self._list_dir(current, descend, exclude, include_hidden)
+                    # Queue children before marking this directory done so join() can't return early
+                    for d in subdirs:
+                        pending.put((d, depth + 1))
+                    # The predicate skips entries it cannot stat, as in the serial scan
+                    found = [e for e in files if predicate(e)]
+                    if found:
+                        found_q.put(found)
+                except BaseException as e:
+                    # Not a filesystem hiccup (those are skipped above): stop and re-raise it in the consumer
+                    stop.set()
+                    found_q.put(e)
+                finally:
+                    pending.task_done()
+
+        def finisher():
+            # Once every queued directory is processed, release the workers and the consumer
+            pending.join()
+            for _ in threads:
+                pending.put(None)
+            found_q.put(None)
+
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(self.workers)]
+        for t in threads:
+            t.start()
+        threading.Thread(target=finisher, daemon=True).start()
 
-        return True
+        try:
+            while True:
+                batch = found_q.get()
+                if batch is None:
+                    return
+                if isinstance(batch, BaseException):
+                    raise batch
+                yield from batch
+        finally:
+            # Early exit: workers drain the remaining queue without listing anything
+            stop.set()
+
+    def _list_dir(self, current: str, descend: bool, exclude: List[str],
+                  include_hidden: bool):
+        """Lists one directory. Returns (file DirEntries, subdirectory paths to descend into)."""
+        files, subdirs = [], []
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    name = entry.name
+                    if not include_hidden and name.startswith('.'):
+                        continue
+                    if exclude and any(fnmatch.fnmatch(name, pat) for pat in exclude):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if descend:
+                                subdirs.append(entry.path)
+                            continue
+                        if not entry.is_file():
+                            continue
+                    except OSError:
+                        continue
+                    files.append(entry)
+        except (PermissionError, FileNotFoundError, NotADirectoryError):
+            # Unreadable or vanished subtree: skip it, keep scanning the rest
+            pass
+        return files, subdirs
 
     # ==========================================
     # HELPERS
@@ -166,6 +329,91 @@ class FilterEngine:
             return 0.0
 
 
+class CompiledFilter:
+    """
+    A filters dict pre-parsed into a fast predicate.
+    Call it with an os.DirEntry (or anything with .name and .stat()).
+    """
+
+    def __init__(self, engine: FilterEngine, filters: Dict):
+        # ==========================================
+        # 1. NAME & TYPE
+        # ==========================================
+        # Supports both 'extension': 'jpg' AND 'extensions': ['jpg', 'png']
+        allowed_exts = []
+        if 'extensions' in filters and isinstance(filters['extensions'], list):
+            allowed_exts.extend(filters['extensions'])
+        if 'extension' in filters and isinstance(filters['extension'], str):
+            allowed_exts.append(filters['extension'])
+
+        # Normalize: strip spaces, lowercase, ensure dot
+        cleaned = set()
+        for ext in allowed_exts:
+            ext = ext.lower().strip()
+            cleaned.add(ext if ext.startswith(".") else "." + ext)
+        self.extensions = frozenset(cleaned) if cleaned else None
+
+        self.name_contains = filters['name_contains'].lower() if 'name_contains' in filters else None
+        self.name_exact = filters.get('name_exact')
+
+        # ==========================================
+        # 2. SIZE (bytes)
+        # ==========================================
+        self.min_size = engine._parse_size(str(filters['min_size'])) if 'min_size' in filters else None
+        self.max_size = engine._parse_size(str(filters['max_size'])) if 'max_size' in filters else None
+
+        # ==========================================
+        # 3. TIME (epoch seconds)
+        # ==========================================
+        self.modified_after = engine._parse_date(filters['modified_after']) if 'modified_after' in filters else None
+        self.modified_before = engine._parse_date(filters['modified_before']) if 'modified_before' in filters else None
+        self.created_after = engine._parse_date(filters['created_after']) if 'created_after' in filters else None
+        self.created_before = engine._parse_date(filters['created_before']) if 'created_before' in filters else None
+
+        # Only stat() entries when a size or time constraint actually needs it
+        self.needs_stat = any(v is not None for v in (
+            self.min_size, self.max_size, self.modified_after, self.modified_before,
+            self.created_after, self.created_before))
+
+    def __call__(self, entry) -> bool:
+        if not self.match_name(entry.name):
+            return False
+        if not self.needs_stat:
+            return True
+        # DirEntry caches its stat result, so this is at most one syscall
+        try:
+            stats = entry.stat()
+        except OSError:
+            return False  # vanished or unreadable: skipped, not fatal to the scan
+        return self.match_stat(stats)
+
+    def match_name(self, name: str) -> bool:
+        if self.extensions is not None:
+            dot = name.rfind(".")
+            if dot <= 0 or name[dot:].lower() not in self.extensions:
+                return False
+        if self.name_contains is not None and self.name_contains not in name.lower():
+            return False
+        if self.name_exact is not None and name != self.name_exact:
+            return False
+        return True
+
+    def match_stat(self, stats) -> bool:
+        size = stats.st_size
+        if self.min_size is not None and size < self.min_size: return False
+        if self.max_size is not None and size > self.max_size: return False
+
+        mtime = stats.st_mtime
+        if self.modified_after is not None and mtime < self.modified_after: return False
+        if self.modified_before is not None and mtime > self.modified_before: return False
+
+        ctime = stats.st_ctime
+        if self.created_after is not None and ctime < self.created_after: return False
+        if self.created_before is not None and ctime > self.created_before: return False
+
+        return True
+
+
 if __name__ == "__main__":
     # Test the multi-extension logic
     engine = FilterEngine()
@@ -20,6 +20,8 @@ class SecurityManager:
             'compare_files': RiskLevel.SAFE,
             'find_files_by_name': RiskLevel.SAFE,
             'find_files_containing_text': RiskLevel.SAFE,
+            'find_files_containing_patterns': RiskLevel.SAFE,
+            'find_duplicates': RiskLevel.SAFE,
             'get_system_specs': RiskLevel.SAFE,
             'get_disk_usage': RiskLevel.SAFE,
             'get_user_context': RiskLevel.SAFE,
@@ -0,0 +1,147 @@
+import os
+import mmap
+import time
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional
+
+
+class HashCache:
+    """
+    Persistent content-hash cache for get_file_hash and compare_files.
+
+    Entries are keyed by (st_dev, st_ino, st_size, st_mtime_ns) and algorithm,
+    so a file is hashed once and served from the cache until it is written,
+    truncated or replaced. The least recently used entries are evicted once
+    max_entries is exceeded.
+
+    Hashing memory-maps the file and feeds the whole mapping to hashlib in one
+    call, which releases the GIL and avoids copying the data through Python.
+    """
+
+    DEFAULT_DB = Path.home() / ".os_assistant" / "hash_cache.db"
+    MAX_ENTRIES = 50_000
+    ALGORITHMS = ("sha256", "blake2b", "sha512", "sha1", "md5")
+    # A file modified within this many seconds of being hashed may change again within
+    # the same mtime tick without changing its key, so its digest is not stored
+    RACY_WINDOW = 2.0
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS hashes (
+            dev INTEGER NOT NULL,
+            ino INTEGER NOT NULL,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            algorithm TEXT NOT NULL,
+            digest TEXT NOT NULL,
+            last_used REAL NOT NULL,
+            PRIMARY KEY (dev, ino, size, mtime_ns, algorithm)
+        );
+        CREATE INDEX IF NOT EXISTS idx_hashes_last_used ON hashes(last_used);
+    """
+
+    def __init__(self, db_path: str = None, max_entries: Optional[int] = None):
+        """db_path: SQLite file (default DEFAULT_DB); ':memory:' keeps the cache for this process only."""
+        self.db_path = str(db_path) if db_path else str(self.DEFAULT_DB)
+        if self.db_path != ":memory:":
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries or self.MAX_ENTRIES
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.executescript(self.SCHEMA)
+        self.hits = 0
+        self.misses = 0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM hashes").fetchone()[0]
+
+    # ==========================================
+    # 1. LOOKUP
+    # ==========================================
+
+    def file_hash(self, path: str, algorithm: str = "sha256") -> str:
+        """
+        Returns the hex digest of 'path', from the cache when the file is unchanged.
+        Raises ValueError for an unsupported algorithm and OSError if the file cannot be read.
+        """
+        algorithm = algorithm.lower()
+        if algorithm not in self.ALGORITHMS:
+            raise ValueError(f"Unsupported hash algorithm '{algorithm}'. Use one of: {', '.join(self.ALGORITHMS)}.")
+
+        with open(path, "rb") as f:
+            st = os.fstat(f.fileno())
+            key = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, algorithm)
+            digest = self._get(key)
+            if digest is not None:
+                self.hits += 1
+                return digest
+
+            self.misses += 1
+            digest = _hash_fd(f.fileno(), st.st_size, algorithm)
+            after = os.fstat(f.fileno())
+
+        # Only cache a digest that certainly belongs to this key
+        unchanged = (after.st_size, after.st_mtime_ns) == (st.st_size, st.st_mtime_ns)
+        if unchanged and time.time() - st.st_mtime_ns / 1e9 > self.RACY_WINDOW:
+            self._put(key, digest)
+        return digest
+
+    def cached(self, path: str, algorithm: str = "sha256") -> Optional[str]:
+        """The cached digest for the file as it is now, or None (never hashes)."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return self._get((st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, algorithm.lower()))
+
+    # ==========================================
+    # 2. STORAGE & EVICTION
+    # ==========================================
+
+    def _get(self, key: tuple) -> Optional[str]:
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT digest FROM hashes WHERE dev = ? AND ino = ? AND size = ? AND mtime_ns = ? "
+                "AND algorithm = ?", key).fetchone()
+            if row is not None:
+                self._conn.execute(
+                    "UPDATE hashes SET last_used = ? WHERE dev = ? AND ino = ? AND size = ? AND mtime_ns = ? "
+                    "AND algorithm = ?", (time.time(),) + key)
+        return row[0] if row else None
+
+    def _put(self, key: tuple, digest: str):
+        with self._lock, self._conn:
+            # A new version of a file replaces the stale entries for the same inode
+            self._conn.execute("DELETE FROM hashes WHERE dev = ? AND ino = ? AND algorithm = ?",
+                               (key[0], key[1], key[4]))
+            self._conn.execute("INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?, ?, ?)",
+                               key + (digest, time.time()))
+            excess = self._conn.execute("SELECT COUNT(*) FROM hashes").fetchone()[0] - self.max_entries
+            if excess > 0:
+                self._conn.execute(
+                    "DELETE FROM hashes WHERE rowid IN "
+                    "(SELECT rowid FROM hashes ORDER BY last_used LIMIT ?)", (excess,))
+
+
+def _hash_fd(fd: int, size: int, algorithm: str) -> str:
+    h = hashlib.new(algorithm)
+    if size:
+        try:
+            with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+                h.update(mm)
+            return h.hexdigest()
+        except (OSError, ValueError):
+            # Not mappable (e.g. some network or special files): fall back to large reads
+            h = hashlib.new(algorithm)
+            os.lseek(fd, 0, os.SEEK_SET)
+            for chunk in iter(lambda: os.read(fd, 1024 * 1024), b""):
+                h.update(chunk)
+    return h.hexdigest()
@@ -0,0 +1,342 @@
+import os
+import stat
+import sqlite3
+import threading
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+
+class FileIndex:
+    """
+    Persistent basename -> path index for the user's home folders.
+    Backed by SQLite so lookups are B-tree range scans instead of rglob walks.
+
+    The index is refreshed incrementally: every directory's mtime is stored,
+    and only directories whose mtime changed are re-listed. Unchanged
+    directories cost a single stat() during a refresh.
+    """
+
+    DEFAULT_DB = Path.home() / ".os_assistant" / "file_index.db"
+    DEFAULT_ROOTS = ["Desktop", "Downloads", "Documents"]
+    WRITE_BATCH = 256  # re-listed directories written per transaction during refresh()
+
+    def __init__(self, db_path: str = None, roots: List[str] = None):
+        self.db_path = Path(db_path) if db_path else self.DEFAULT_DB
+        home = Path.home()
+        self.roots = [Path(r) if Path(r).is_absolute() else home / r
+                      for r in (roots or self.DEFAULT_ROOTS)]
+        self._lock = threading.Lock()
+        # Set by a watcher (see watcher.py) that keeps the index live; replaces mtime polling
+        self.freshness_hook = None
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._init_schema()
+
+    # ==========================================
+    # 1. SCHEMA
+    # ==========================================
+
+    # Subclasses extend the 'files' table by overriding SCHEMA, COLUMNS and _entry_row
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS dirs (
+            path TEXT PRIMARY KEY,
+            mtime_ns INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS files (
+            path TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            name_lower TEXT NOT NULL,
+            dir TEXT NOT NULL,
+            is_dir INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_files_name ON files(name_lower);
+        CREATE INDEX IF NOT EXISTS idx_files_dir ON files(dir);
+    """
+    COLUMNS = ("path", "name", "name_lower", "dir", "is_dir")
+
+    def _init_schema(self):
+        with self._lock, self._conn:
+            self._conn.executescript(self.SCHEMA)
+
+    def _entry_row(self, entry: os.DirEntry, d: str, is_dir: bool) -> tuple:
+        """Builds the 'files' row for one directory entry, in COLUMNS order."""
+        return (entry.path, entry.name, entry.name.lower(), d, int(is_dir))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ==========================================
+    # 2. QUERIES
+    # ==========================================
+
+    def lookup(self, filename: str) -> Optional[Path]:
+        """
+        Returns the best match for a bare filename, or None (see find for the order).
+        """
+        matches = self.find(filename)
+        return matches[0] if matches else None
+
+    def find(self, filename: str) -> List[Path]:
+        """
+        Returns all indexed paths for 'filename' (exact or 'filename.*'), matched
+        case-insensitively. Order: exact names from every root before 'name.*'
+        matches; within each, roots in priority order, then names with the exact
+        case, then shorter paths. (This is not the old per-root rglob order.)
+        """
+        key = filename.lower()
+        with self._lock:
+            exact = self._conn.execute(
+                "SELECT path, name FROM files WHERE name_lower = ?", (key,)).fetchall()
+            # 'name.' <= x < 'name/' is the index-friendly form of LIKE 'name.%'
+            stem = self._conn.execute(
+                "SELECT path, name FROM files WHERE name_lower >= ? AND name_lower < ?",
+                (key + ".", key + "/")).fetchall()
+
+        ranked = []
+        for tier, rows in enumerate([exact, stem]):
+            for path, name in rows:
+                case_penalty = 0 if name == filename or name.startswith(filename + ".") else 1
+                ranked.append((tier, self._root_rank(path), case_penalty, len(path), path))
+        ranked.sort()
+        return [Path(r[-1]) for r in ranked]
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM dirs LIMIT 1").fetchone() is None
+
+    def _root_rank(self, path: str) -> int:
+        for i, root in enumerate(self.roots):
+            if path.startswith(str(root) + os.sep) or path == str(root):
+                return i
+        return len(self.roots)
+
+    # ==========================================
+    # 3. INCREMENTAL REFRESH
+    # ==========================================
+
+    def refresh(self, root: str = None, max_depth: Optional[int] = None) -> int:
+        """
+        Brings the index up to date. Returns the number of directories re-listed.
+        Directories whose mtime is unchanged are skipped; their subdirectories
+        are taken from the index and checked in turn.
+        'root' limits the refresh to one indexed subtree, 'max_depth' to that many
+        levels below each starting directory (0 = the directory itself).
+
+        The walk runs without the lock; it is only taken to read the stored state
+        and to write re-listed directories in batches of WRITE_BATCH, so lookups
+        are served while a large refresh (e.g. the first build) is running.
+        """
+        if root is not None:
+            root = str(Path(root))
+            if not self.covers(root):
+                return 0
+            starts = [root]
+        else:
+            starts = [str(r) for r in self.roots]
+
+        with self._lock:
+            known = dict(self._conn.execute("SELECT path, mtime_ns FROM dirs").fetchall())
+        known = {k: v for k, v in known.items() if _depth_below(k, starts) is not None}
+        if max_depth is not None:
+            known = {k: v for k, v in known.items() if _depth_below(k, starts) <= max_depth}
+
+        rescanned = 0
+        pending = []
+        stack = [(d, 0) for d in starts]
+        seen = set()
+        while stack:
+            d, depth = stack.pop()
+            try:
+                mtime_ns = os.stat(d).st_mtime_ns
+            except OSError:
+                continue
+            seen.add(d)
+
+            if known.get(d) == mtime_ns:
+                with self._lock:
+                    subdirs = [row[0] for row in self._conn.execute(
+                        "SELECT path FROM files WHERE dir = ? AND is_dir = 1", (d,))]
+            else:
+                rows, subdirs = self._list_dir(d)
+                if rows is not None:
+                    pending.append((d, mtime_ns, rows))
+                    rescanned += 1
+                    if len(pending) >= self.WRITE_BATCH:
+                        self._write_dirs(pending)
+                        pending = []
+            if max_depth is None or depth < max_depth:
+                stack.extend((sd, depth + 1) for sd in subdirs)
+
+        self._write_dirs(pending)
+        # Anything we knew about but did not reach has been removed
+        gone = set(known) - seen
+        if gone:
+            with self._lock, self._conn:
+                for d in gone:
+                    self._forget_dir(d)
+        return rescanned
+
+    def ensure_fresh(self, root: str = None):
+        """
+        Makes the index current before a query. With a watcher attached this only
+        applies its pending events; otherwise it is an incremental refresh().
+        """
+        if self.freshness_hook is not None:
+            return self.freshness_hook(root)
+        return self.refresh(root)
+
+    def update_dir(self, d: str) -> List[str]:
+        """
+        Re-lists one directory now, regardless of its mtime (used for watcher events).
+        Removed subdirectories are dropped, new ones are indexed recursively.
+        Returns the directories that are new to the index.
+        """
+        d = str(Path(d))
+        if not self.covers(d):
+            return []
+        try:
+            mtime_ns = os.stat(d).st_mtime_ns
+        except OSError:
+            with self._lock, self._conn:
+                self._forget_tree(d)
+            return []
+        rows, subdirs = self._list_dir(d)
+        with self._lock, self._conn:
+            before = {row[0] for row in self._conn.execute(
+                "SELECT path FROM files WHERE dir = ? AND is_dir = 1", (d,))}
+            if rows is not None:
+                self._write_dir(d, mtime_ns, rows)
+            for gone in before - set(subdirs):
+                self._forget_tree(gone)
+            added = [sd for sd in subdirs if sd not in before]
+
+        new_dirs = []
+        for sd in added:
+            self.refresh(sd)
+            new_dirs.extend(self.list_dirs(sd))
+        return new_dirs
+
+    def update_entry(self, path: str):
+        """Re-reads a single entry (e.g. after a content modification) without re-listing its directory."""
+        path = str(Path(path))
+        d = os.path.dirname(path)
+        if not self.covers(d):
+            return
+        entry = _PathEntry(path)
+        with self._lock, self._conn:
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                self._conn.execute("DELETE FROM files WHERE path = ?", (path,))
+                return
+            placeholders = ", ".join("?" * len(self.COLUMNS))
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO files ({', '.join(self.COLUMNS)}) VALUES ({placeholders})",
+                self._entry_row(entry, d, is_dir))
+
+    def list_dirs(self, root: str = None) -> List[str]:
+        """Indexed directories, optionally limited to one subtree."""
+        with self._lock:
+            if root is None:
+                return [r[0] for r in self._conn.execute("SELECT path FROM dirs")]
+            root = str(Path(root))
+            return [r[0] for r in self._conn.execute(
+                "SELECT path FROM dirs WHERE path = ? OR (path >= ? AND path < ?)",
+                (root, root + os.sep, root + chr(ord(os.sep) + 1)))]
+
+    def is_stale(self, directory: str) -> bool:
+        """True if 'directory' was never indexed or its mtime changed since it was listed."""
+        d = str(Path(directory))
+        with self._lock:
+            row = self._conn.execute("SELECT mtime_ns FROM dirs WHERE path = ?", (d,)).fetchone()
+        try:
+            return row is None or os.stat(d).st_mtime_ns != row[0]
+        except OSError:
+            return True
+
+    def covers(self, path: str) -> bool:
+        """True if 'path' lies inside one of the indexed roots."""
+        return self._root_rank(str(Path(path))) < len(self.roots)
+
+    def _forget_dir(self, d: str):
+        self._conn.execute("DELETE FROM dirs WHERE path = ?", (d,))
+        self._conn.execute("DELETE FROM files WHERE dir = ?", (d,))
+
+    def _forget_tree(self, d: str):
+        """Drops a directory and everything indexed below it."""
+        lo, hi = d + os.sep, d + chr(ord(os.sep) + 1)
+        self._conn.execute("DELETE FROM dirs WHERE path = ? OR (path >= ? AND path < ?)", (d, lo, hi))
+        self._conn.execute("DELETE FROM files WHERE dir = ? OR (dir >= ? AND dir < ?)", (d, lo, hi))
+        self._conn.execute("DELETE FROM files WHERE path = ?", (d,))
+
+    def _list_dir(self, d: str) -> Tuple[Optional[List[tuple]], List[str]]:
+        """Lists one directory (no lock needed). Returns (rows, subdirectories); rows is None if unreadable."""
+        rows = []
+        subdirs = []
+        try:
+            with os.scandir(d) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    rows.append(self._entry_row(entry, d, is_dir))
+                    if is_dir:
+                        subdirs.append(entry.path)
+        except OSError:
+            return None, []
+        return rows, subdirs
+
+    def _write_dirs(self, listings: List[tuple]):
+        """Stores (dir, mtime_ns, rows) listings in one transaction."""
+        if not listings:
+            return
+        with self._lock, self._conn:
+            for d, mtime_ns, rows in listings:
+                self._write_dir(d, mtime_ns, rows)
+
+    def _write_dir(self, d: str, mtime_ns: int, rows: List[tuple]):
+        """Replaces one directory's rows. Caller holds the lock and the transaction."""
+        placeholders = ", ".join("?" * len(self.COLUMNS))
+        self._conn.execute("DELETE FROM files WHERE dir = ?", (d,))
+        self._conn.executemany(
+            f"INSERT OR REPLACE INTO files ({', '.join(self.COLUMNS)}) VALUES ({placeholders})",
+            rows)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO dirs (path, mtime_ns) VALUES (?, ?)", (d, mtime_ns))
+
+
+def _depth_below(path: str, starts: List[str]) -> Optional[int]:
+    """Levels between path and the start directory containing it, or None if it is under none of them."""
+    for start in starts:
+        if path == start:
+            return 0
+        if path.startswith(start + os.sep):
+            return path[len(start):].count(os.sep)
+    return None
+
+
+class _PathEntry:
+    """Minimal os.DirEntry stand-in for a single path, so _entry_row works outside scandir."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.name = os.path.basename(path)
+        self._stat = None
+
+    def stat(self, follow_symlinks: bool = True):
+        if follow_symlinks:
+            if self._stat is None:
+                self._stat = os.stat(self.path)
+            return self._stat
+        return os.lstat(self.path)
+
+    def is_dir(self, follow_symlinks: bool = True) -> bool:
+        return stat.S_ISDIR(self.stat(follow_symlinks).st_mode)
+
+    def is_file(self, follow_symlinks: bool = True) -> bool:
+        try:
+            return stat.S_ISREG(self.stat(follow_symlinks).st_mode)
+        except FileNotFoundError:
+            return False
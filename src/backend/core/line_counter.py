@@ -0,0 +1,120 @@
+import os
+import time
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional
+
+from src.backend.core.content_search import pool_context
+
+
+class LineCounter:
+    """
+    Counts lines in a file of any size or encoding by counting b"\n" bytes.
+
+    Nothing is decoded: the file is read in BLOCK-sized binary pieces and
+    bytes.count / bytes.split run in C, so a single core keeps up with most disks.
+    Files above PARALLEL_BYTES are cut into byte ranges that are scanned on a
+    process pool (bytes.count holds the GIL, so threads would not help) and the
+    per-range results are stitched together, including lines that span two ranges.
+    The pool is started on first use and kept for later calls (see close()).
+    """
+
+    BLOCK = 8 * 1024 * 1024             # bytes per read
+    PARALLEL_BYTES = 256 * 1024 * 1024  # files at least this large are split across processes
+
+    def __init__(self, workers: Optional[int] = None):
+        """workers: processes for large files (default: CPU count; 1 disables the pool)."""
+        self.workers = workers or os.cpu_count() or 1
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    def close(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    def count(self, path: str) -> Dict:
+        """
+        Returns {"lines", "bytes", "longest_line", "longest_line_number", "elapsed"}.
+        A last line without a trailing newline still counts (like iterating the file);
+        line lengths are in bytes, without the newline.
+        """
+        start = time.perf_counter()
+        size = os.path.getsize(path)
+        if self.workers > 1 and size >= self.PARALLEL_BYTES:
+            step = -(-size // self.workers)
+            ranges = [(path, lo, min(lo + step, size), self.BLOCK) for lo in range(0, size, step)]
+            parts = list(self._get_pool().map(_scan_range, *zip(*ranges)))
+        else:
+            parts = [_scan_range(path, 0, size, self.BLOCK)]
+
+        stats = _merge(parts)
+        stats.update(bytes=size, elapsed=round(time.perf_counter() - start, 3))
+        return stats
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=pool_context())
+            return self._pool
+
+
+# ==========================================
+# WORKER SIDE (runs in pool processes)
+# ==========================================
+
+def _scan_range(path: str, start: int, end: int, block: int) -> tuple:
+    """
+    Scans bytes [start, end) and returns (newlines, head, longest, longest_index, tail):
+    head = bytes before the first newline (the end of a line that may have started
+    in an earlier range; None if the range has no newline), longest = longest line
+    entirely inside the range and longest_index its newline-count offset from the
+    first newline, tail = bytes after the last newline.
+    """
+    newlines, head, longest, longest_index, run = 0, None, -1, 0, 0
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            data = f.read(min(block, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            found = data.count(b"\n")
+            if not found:
+                run += len(data)
+                continue
+            lines = data.split(b"\n")
+            if head is None:
+                head = run + len(lines[0])
+            elif run + len(lines[0]) > longest:
+                longest, longest_index = run + len(lines[0]), newlines
+            if len(lines) > 2:
+                inner = max(map(len, lines[1:-1]))
+                if inner > longest:
+                    longest = inner
+                    longest_index = newlines + 1 + [len(line) for line in lines[1:-1]].index(inner)
+            newlines += found
+            run = len(lines[-1])
+    return newlines, head, longest, longest_index, run
+
+
+def _merge(parts) -> Dict:
+    """Stitches per-range results in file order into whole-file statistics."""
+    lines, longest, longest_line, run = 0, -1, 0, 0
+    for newlines, head, inner, inner_index, tail in parts:
+        if head is None:
+            run += tail
+            continue
+        if run + head > longest:
+            longest, longest_line = run + head, lines + 1
+        if inner > longest:
+            longest, longest_line = inner, lines + 1 + inner_index
+        lines += newlines
+        run = tail
+    if run:
+        if run > longest:
+            longest, longest_line = run, lines + 1
+        lines += 1
+    return {"lines": lines, "longest_line": max(longest, 0), "longest_line_number": longest_line}
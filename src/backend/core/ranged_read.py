@@ -0,0 +1,78 @@
+"""
+Partial reads of files of any size through mmap.
+
+Only the pages that are actually looked at are read: head_lines scans forward
+from the start, tail_lines scans backwards from the end with mmap.rfind (which
+searches from the right), and read_range copies just the requested slice. Each
+scan is capped at 'max_bytes', so a pathological file (one 20GB line) costs the
+same as a normal one. The results are raw bytes plus the byte span they cover,
+so callers can tell whether anything was left out.
+
+Files that cannot be mapped but still have content (procfs/sysfs files report a
+size of 0, pipes and character devices have none) are read with plain buffered
+reads instead, up to FALLBACK_LIMIT bytes.
+"""
+
+import mmap
+from contextlib import contextmanager
+from typing import Tuple
+
+FALLBACK_LIMIT = 64 * 1024 * 1024  # most bytes read from a file that cannot be mapped
+
+
+def read_range(path: str, offset: int, length: int) -> Tuple[bytes, int, int]:
+    """Returns (data, start, end) for bytes [offset, offset + length). A negative offset counts from the end."""
+    with _mapped(path, offset + max(0, length) if offset >= 0 else FALLBACK_LIMIT) as mm:
+        size = len(mm)
+        start = max(0, size + offset) if offset < 0 else min(offset, size)
+        end = min(size, start + max(0, length))
+        return mm[start:end], start, end
+
+
+def head_lines(path: str, count: int, max_bytes: int) -> Tuple[bytes, int, int]:
+    """Returns (data, 0, end) for the first 'count' lines (newline included), at most max_bytes."""
+    with _mapped(path, max_bytes) as mm:
+        limit = min(len(mm), max_bytes)
+        end = 0
+        for _ in range(count):
+            nl = mm.find(b"\n", end, limit)
+            if nl < 0:
+                end = limit
+                break
+            end = nl + 1
+        return mm[:end], 0, end
+
+
+def tail_lines(path: str, count: int, max_bytes: int) -> Tuple[bytes, int, int]:
+    """Returns (data, start, size) for the last 'count' lines, at most max_bytes. A final newline does not start a line."""
+    with _mapped(path) as mm:
+        size = len(mm)
+        if count <= 0:
+            return b"", size, size
+        limit = max(0, size - max_bytes)
+        start = size - 1 if mm[size - 1:size] == b"\n" else size
+        for _ in range(count):
+            nl = mm.rfind(b"\n", limit, start)
+            if nl < 0:
+                start = limit
+                break
+            start = nl
+        else:
+            start += 1
+        return mm[start:size], start, size
+
+
+@contextmanager
+def _mapped(path: str, limit: int = FALLBACK_LIMIT):
+    """
+    Read-only map of the whole file. A file that cannot be mapped (empty, or a special
+    file such as /proc/version that reports size 0) yields its first 'limit' bytes instead.
+    """
+    with open(path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            yield f.read(limit)
+            return
+        with mm:
+            yield mm
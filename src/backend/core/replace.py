@@ -0,0 +1,163 @@
+import io
+import re
+from typing import Optional
+
+from src.backend.core.atomic import atomic_rewrite
+
+
+class _Unchanged(Exception):
+    """Aborts the rewrite when nothing matched, so the original file is left as it was."""
+
+
+class ReplaceEngine:
+    """
+    Find-and-replace over a file of any size with bounded memory.
+
+    The file is read in CHUNK-character pieces and written to a temp file that
+    atomically replaces the original (see atomic_rewrite), so at most one chunk
+    plus a small carry-over is in memory and a crash never leaves a half-written file.
+
+    Matches that straddle a chunk boundary are handled with a sliding window:
+    text near the end of a chunk is only rewritten once enough of the next chunk
+    has been read to see the whole match. For a literal search the window is the
+    search text's length; a regex match is assumed to be at most WINDOW characters
+    (longer matches are still found, just not across a chunk boundary). The
+    window is kept as context too, so lookbehinds and ^ see the preceding text.
+    Results are the same as str.replace / re.sub (leftmost, non-overlapping).
+
+    Text is UTF-8, and line endings (LF or CRLF) are written back as they were read.
+    """
+
+    CHUNK = 1024 * 1024     # characters read per step
+    WINDOW = 64 * 1024      # longest regex match that may cross a chunk boundary
+
+    def replace(self, path: str, old: str, new: str, regex: bool = False,
+                max_replacements: Optional[int] = None) -> int:
+        """
+        Replaces occurrences of 'old' (a literal string, or a regex with regex=True,
+        in which case 'new' may use \\1 / \\g<name> references) and returns how many
+        were replaced. The file is not rewritten when nothing matched.
+        max_replacements: stop after this many (None = all).
+        Raises re.error for an invalid pattern, ValueError for an empty search,
+        UnicodeDecodeError for non-UTF-8 files.
+        """
+        if not old:
+            raise ValueError("Search text cannot be empty.")
+        pattern = re.compile(old if regex else re.escape(old))
+        window = self.WINDOW if regex else len(old)
+        expand = _Expander(new) if regex and "\\" in new else (lambda m: new)
+        limit = max_replacements if max_replacements is not None else -1
+
+        try:
+            with open(path, 'r', encoding='utf-8', newline='') as src, atomic_rewrite(path) as raw:
+                out = io.TextIOWrapper(raw, encoding='utf-8', newline='')
+                if regex or _overlaps_itself(old):
+                    count = self._stream(src, out, pattern, expand, window, limit)
+                else:
+                    count = self._stream_literal(src, out, old, new, limit)
+                out.flush()
+                out.detach()
+                if count == 0:
+                    raise _Unchanged()
+        except _Unchanged:
+            return 0
+        return count
+
+    def _stream(self, src, out, pattern: re.Pattern, expand, window: int, limit: int) -> int:
+        count = 0
+        buf = ""
+        pos = 0                 # buf[:pos] is context that has already been written
+        skip_empty = False      # an empty match at 'pos' was already replaced
+        eof = False
+        while not eof:
+            chunk = src.read(self.CHUNK)
+            eof = not chunk
+            buf += chunk
+            safe_end = len(buf) if eof else len(buf) - window
+            written = pos
+            parts = []
+            pending = None          # start of a match that may continue in the next chunk
+            for m in pattern.finditer(buf, pos):
+                if count == limit:
+                    break
+                if not eof and m.end() > safe_end and m.start() >= safe_end - window:
+                    pending = m.start()
+                    break
+                if m.start() == m.end() == pos and skip_empty:
+                    continue
+                parts += (buf[written:m.start()], expand(m))
+                written = m.end()
+                count += 1
+                skip_empty = m.start() == m.end()
+            out.write("".join(parts))
+            if count == limit:
+                out.write(buf[written:])
+                self._copy_rest(src, out)
+                return count
+            # Everything before 'keep' is final; up to 'window' chars before it stay as context
+            keep = pending if pending is not None else max(written, safe_end)
+            if keep > written:
+                skip_empty = False
+            out.write(buf[written:keep])
+            start = max(0, keep - window)
+            buf, pos = buf[start:], keep - start
+        return count
+
+    def _stream_literal(self, src, out, old: str, new: str, limit: int) -> int:
+        """
+        Fast path for a literal that cannot overlap itself: whole chunks go through
+        str.count / str.replace. Every occurrence is then a match, so the last one
+        (rfind) tells where the carry-over for the next chunk has to start.
+        """
+        count = 0
+        carry = ""
+        while True:
+            chunk = src.read(self.CHUNK)
+            buf = carry + chunk
+            found = buf.count(old)
+            if limit >= 0 and count + found >= limit:
+                out.write(buf.replace(old, new, limit - count))
+                self._copy_rest(src, out)
+                return limit
+            if not chunk:
+                out.write(buf.replace(old, new))
+                return count + found
+            last_end = buf.rfind(old) + len(old) if found else 0
+            keep = max(last_end, len(buf) - len(old) + 1)
+            out.write(buf[:keep].replace(old, new))
+            count += found
+            carry = buf[keep:]
+
+    def _copy_rest(self, src, out):
+        while True:
+            chunk = src.read(self.CHUNK)
+            if not chunk:
+                return
+            out.write(chunk)
+
+
+def _overlaps_itself(text: str) -> bool:
+    """True when a prefix of 'text' is also its suffix ("aba"): occurrences can overlap."""
+    return any(text[:k] == text[-k:] for k in range(1, len(text)))
+
+
+class _Expander:
+    """
+    m.expand(template) re-parses the template on every call. The result only depends
+    on the matched groups, which repeat a lot in logs and configs, so it is memoized.
+    """
+
+    MAX_ENTRIES = 4096
+
+    def __init__(self, template: str):
+        self.template = template
+        self.cache = {}
+
+    def __call__(self, m: re.Match) -> str:
+        key = (m.group(0),) + m.groups()
+        value = self.cache.get(key)
+        if value is None:
+            if len(self.cache) >= self.MAX_ENTRIES:
+                self.cache.clear()
+            value = self.cache[key] = m.expand(self.template)
+        return value
@@ -0,0 +1,350 @@
+import os
+import sys
+import time
+import ctypes
+import ctypes.util
+import select
+import struct
+import threading
+from typing import Dict, Optional, Callable
+
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+STRUCTURE_EVENTS = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE_SELF | IN_MOVE_SELF
+CONTENT_EVENTS = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE
+WATCH_MASK = STRUCTURE_EVENTS | CONTENT_EVENTS | IN_ONLYDIR
+
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+class CatalogWatcher:
+    """
+    Background service that keeps a FileIndex/FileCatalog current.
+
+    Backends:
+    - "inotify" (Linux): a watch per indexed directory; events are applied incrementally.
+    - "polling" (everywhere else, or when inotify is unavailable): periodic refresh().
+
+    Events are coalesced: a burst of changes in one directory within the debounce
+    window becomes a single re-list, and repeated writes to one file a single re-stat.
+    While running, the watcher becomes the catalog's freshness hook, so queries
+    only apply the pending backlog (draining the kernel queue first) instead of
+    stat()ing every directory. With polling, or once any directory could not be
+    watched, queries still run the incremental refresh() for their subtree.
+    """
+
+    def __init__(self, catalog, backend: str = "auto", debounce: float = 0.25,
+                 poll_interval: float = 30.0):
+        if backend == "auto":
+            backend = "inotify" if _Inotify.available() else "polling"
+        if backend not in ("inotify", "polling"):
+            raise ValueError(f"Unknown watcher backend '{backend}'. Use 'inotify' or 'polling'.")
+        self.catalog = catalog
+        self.backend = backend
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+
+        self._cond = threading.Condition()
+        self._dirty_dirs: Dict[str, float] = {}   # dir -> time of first pending event
+        self._dirty_files: Dict[str, float] = {}  # file -> time of first pending event
+        self._full_refresh = False
+        self._stop = threading.Event()
+        self._threads = []
+        self._inotify: Optional[_Inotify] = None
+
+        self._metrics = {
+            "events_received": 0,
+            "events_coalesced": 0,
+            "batches_applied": 0,
+            "last_lag": 0.0,
+            "max_lag": 0.0,
+            "watch_errors": 0,
+            "overflows": 0,
+        }
+
+    # ==========================================
+    # 1. LIFECYCLE
+    # ==========================================
+
+    def start(self):
+        """Catches the catalog up with changes made while we were not running, then watches."""
+        self._stop.clear()
+        target = self._run_inotify if self.backend == "inotify" else self._run_polling
+        self._threads = [threading.Thread(target=target, daemon=True)]
+        if self.backend == "inotify":
+            self._threads.append(threading.Thread(target=self._apply_loop, daemon=True))
+        for t in self._threads:
+            t.start()
+
+    def stop(self):
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        for t in self._threads:
+            t.join(timeout=2)
+        if self.catalog.freshness_hook == self._freshness_hook:
+            self.catalog.freshness_hook = None
+        if self._inotify:
+            self._inotify.close()
+            self._inotify = None
+
+    @property
+    def running(self) -> bool:
+        return any(t.is_alive() for t in self._threads)
+
+    def metrics(self) -> Dict:
+        """Backlog and lag figures, for status displays and tuning."""
+        now = time.monotonic()
+        with self._cond:
+            pending = list(self._dirty_dirs.values()) + list(self._dirty_files.values())
+            m = dict(self._metrics)
+        m.update({
+            "backend": self.backend,
+            "running": self.running,
+            "backlog": len(pending),
+            "backlog_age": round(now - min(pending), 3) if pending else 0.0,
+            "watches": self._inotify.watch_count() if self._inotify else 0,
+        })
+        return m
+
+    # ==========================================
+    # 2. EVENT INTAKE & COALESCING
+    # ==========================================
+
+    def _mark(self, bucket: Dict[str, float], path: str):
+        with self._cond:
+            self._metrics["events_received"] += 1
+            if path in bucket:
+                self._metrics["events_coalesced"] += 1
+            else:
+                bucket[path] = time.monotonic()
+            self._cond.notify()
+
+    def _handle_event(self, directory: str, name: str, mask: int):
+        if mask & IN_Q_OVERFLOW:
+            # The kernel dropped events; only a full incremental refresh is safe
+            with self._cond:
+                self._metrics["overflows"] += 1
+                self._full_refresh = True
+                self._cond.notify()
+            return
+        if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+            # Re-checking the directory itself drops it (and its subtree) from the catalog
+            self._mark(self._dirty_dirs, directory)
+            self._mark(self._dirty_dirs, os.path.dirname(directory))
+        elif mask & STRUCTURE_EVENTS:
+            self._mark(self._dirty_dirs, directory)
+        elif mask & CONTENT_EVENTS and not mask & IN_ISDIR and name:
+            self._mark(self._dirty_files, os.path.join(directory, name))
+
+    # ==========================================
+    # 3. APPLYING CHANGES
+    # ==========================================
+
+    def _apply_loop(self):
+        while not self._stop.is_set():
+            with self._cond:
+                while not (self._dirty_dirs or self._dirty_files or self._full_refresh) \
+                        and not self._stop.is_set():
+                    self._cond.wait()
+                if self._stop.is_set():
+                    return
+            # Let a burst settle so it lands in one batch
+            time.sleep(self.debounce)
+            self.flush()
+
+    def flush(self, root: str = None):
+        """
+        Applies pending changes now (only those under 'root' when given). Events the
+        kernel has queued but the reader thread has not picked up yet are read first.
+        Safe to call from any thread.
+        """
+        if self._inotify:
+            self._inotify.read_events(timeout=0)
+        with self._cond:
+            full = self._full_refresh
+            if root is None or full:
+                dirs, files = self._dirty_dirs, self._dirty_files
+                self._dirty_dirs, self._dirty_files, self._full_refresh = {}, {}, False
+            else:
+                dirs = _take_under(self._dirty_dirs, root)
+                files = _take_under(self._dirty_files, root)
+        if not (dirs or files or full):
+            return
+
+        oldest = min(list(dirs.values()) + list(files.values()) or [time.monotonic()])
+        if full:
+            self.catalog.refresh()
+            if self._inotify:
+                self._inotify.watch_all(self.catalog.list_dirs())
+        else:
+            # Parents first, so a new subtree is indexed before its children's events are replayed
+            for d in sorted(dirs, key=lambda p: p.count(os.sep)):
+                for new_dir in self.catalog.update_dir(d):
+                    if self._inotify:
+                        self._inotify.watch(new_dir)
+            for f in files:
+                if os.path.dirname(f) not in dirs:
+                    self.catalog.update_entry(f)
+
+        lag = time.monotonic() - oldest
+        with self._cond:
+            self._metrics["batches_applied"] += 1
+            self._metrics["last_lag"] = round(lag, 3)
+            self._metrics["max_lag"] = round(max(self._metrics["max_lag"], lag), 3)
+
+    def _freshness_hook(self, root: str = None):
+        self.flush(root)
+        if self.backend != "inotify" or self._inotify is None or self._inotify.errors:
+            # Polling, or some directories could not be watched: events do not cover
+            # everything, so the incremental mtime refresh is still needed
+            self.catalog.refresh(root)
+
+    # ==========================================
+    # 4. BACKENDS
+    # ==========================================
+
+    def _run_inotify(self):
+        try:
+            self._inotify = _Inotify(self._handle_event)
+        except OSError as e:
+            print(f"Watcher Warning: inotify unavailable ({e}); falling back to polling.")
+            self.backend = "polling"
+            return self._run_polling()
+
+        # Watch what we already know, then catch up, so changes made in between are seen;
+        # re-adding a watch on the same directory is a no-op for the kernel
+        self._inotify.watch_all(self.catalog.list_dirs())
+        self.catalog.refresh()
+        self._inotify.watch_all(self.catalog.list_dirs())
+        with self._cond:
+            self._metrics["watch_errors"] = self._inotify.errors
+        self.catalog.freshness_hook = self._freshness_hook
+
+        while not self._stop.is_set():
+            self._inotify.read_events(timeout=0.5)
+            if self._inotify.errors:
+                with self._cond:
+                    self._metrics["watch_errors"] = self._inotify.errors
+
+    def _run_polling(self):
+        self.catalog.freshness_hook = self._freshness_hook
+        while not self._stop.is_set():
+            started = time.monotonic()
+            self.catalog.refresh()
+            with self._cond:
+                self._metrics["batches_applied"] += 1
+                self._metrics["last_lag"] = round(self.poll_interval + time.monotonic() - started, 3)
+                self._metrics["max_lag"] = max(self._metrics["max_lag"], self._metrics["last_lag"])
+            self._stop.wait(self.poll_interval)
+
+
+def _take_under(bucket: Dict[str, float], root: str) -> Dict[str, float]:
+    """Removes and returns the entries of bucket at or below root."""
+    root = os.path.normpath(root)
+    prefix = root.rstrip(os.sep) + os.sep
+    taken = {p: t for p, t in bucket.items() if p == root or p.startswith(prefix)}
+    for p in taken:
+        del bucket[p]
+    return taken
+
+
+class _Inotify:
+    """Thin ctypes wrapper over inotify_init1/inotify_add_watch (Linux only)."""
+
+    def __init__(self, callback: Callable[[str, str, int], None]):
+        self._libc = self._load_libc()
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.callback = callback
+        self._wd_to_dir: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._read_lock = threading.Lock()  # a flush() drain waits for a batch being dispatched
+        self.errors = 0
+
+    @staticmethod
+    def _load_libc():
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        return libc
+
+    @staticmethod
+    def available() -> bool:
+        if not sys.platform.startswith("linux"):
+            return False
+        try:
+            return hasattr(_Inotify._load_libc(), "inotify_init1")
+        except OSError:
+            return False
+
+    def watch(self, directory: str):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            # Usually ENOSPC (fs.inotify.max_user_watches); that subtree goes unwatched
+            self.errors += 1
+            return
+        with self._lock:
+            self._wd_to_dir[wd] = directory
+
+    def watch_all(self, directories):
+        for d in directories:
+            self.watch(d)
+
+    def watch_count(self) -> int:
+        with self._lock:
+            return len(self._wd_to_dir)
+
+    def read_events(self, timeout: float):
+        """Reads and dispatches the queued events; timeout=0 drains without waiting."""
+        if timeout:
+            select.select([self.fd], [], [], timeout)
+        with self._read_lock:
+            while True:
+                try:
+                    data = os.read(self.fd, 256 * 1024)
+                except OSError:  # BlockingIOError: nothing left; EBADF: closed
+                    return
+                if not data:
+                    return
+                self._dispatch(data)
+
+    def _dispatch(self, data: bytes):
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0").decode(errors="surrogateescape")
+            offset += length
+
+            with self._lock:
+                directory = self._wd_to_dir.get(wd)
+                if mask & IN_IGNORED:
+                    self._wd_to_dir.pop(wd, None)
+            if mask & IN_Q_OVERFLOW:
+                self.callback("", "", mask)
+            elif directory is not None and not mask & IN_IGNORED:
+                self.callback(directory, name, mask)
+
+    def close(self):
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
@@ -0,0 +1,198 @@
+import unittest
+import shutil
+import os
+import sys
+import zipfile
+import threading
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+
+from src.backend.core.archiver import ArchiveEngine, ArchiveCancelled, ArchiveRejected
+from src.backend.tools.files import FileManager
+
+
+class TestArchiveEngine(unittest.TestCase):
+
+    def setUp(self):
+        """A project folder with a multi-piece text file, small files, media, an empty file and folder."""
+        self.test_dir = Path("archiver_sandbox").resolve()
+        if self.test_dir.exists():
+            shutil.rmtree(self.test_dir)
+        self.src = self.test_dir / "project"
+        (self.src / "src" / "pkg").mkdir(parents=True)
+        (self.src / "empty_dir").mkdir()
+        (self.src / "data.csv").write_bytes(b"".join(b"%d,row,%d\n" % (i, i * 7) for i in range(60_000)))
+        (self.src / "photo.jpg").write_bytes(os.urandom(100_000))
+        (self.src / "empty.txt").touch()
+        for i in range(30):
+            (self.src / "src" / "pkg" / f"mod{i}.py").write_text(f"def f{i}():\n    return {i}\n" * 20)
+        self.archive = self.test_dir / "project.zip"
+
+        self.engine = ArchiveEngine(workers=2)
+        self.engine.PARALLEL_BYTES = 0                  # use the pool even for this small tree
+        self.engine.CHUNK = self.engine.BATCH_BYTES = 64 * 1024  # data.csv spans many pieces
+
+    def tearDown(self):
+        if self.test_dir.exists():
+            shutil.rmtree(self.test_dir)
+
+    def _check_archive(self):
+        reference = shutil.make_archive(str(self.test_dir / "reference"), "zip", self.test_dir, "project")
+        with zipfile.ZipFile(self.archive) as zf, zipfile.ZipFile(reference) as ref:
+            self.assertIsNone(zf.testzip())
+            self.assertEqual(sorted(zf.namelist()), sorted(ref.namelist()))
+            for name in ref.namelist():
+                self.assertEqual(zf.read(name), ref.read(name), name)
+            return {info.filename: info.compress_type for info in zf.infolist()}
+
+    def test_parallel_zip_matches_make_archive(self):
+        events = []
+        self.engine.PROGRESS_INTERVAL = 0
+        stats = self.engine.create_zip(str(self.src), str(self.archive), progress_callback=events.append)
+
+        types = self._check_archive()
+        self.assertEqual(types["project/data.csv"], zipfile.ZIP_DEFLATED)
+        self.assertEqual(types["project/photo.jpg"], zipfile.ZIP_STORED)
+        self.assertEqual((stats["files"], stats["workers"]), (33, 2))
+        self.assertLess(stats["compressed"], stats["bytes"] / 2)
+        done = [e["done"] for e in events]
+        self.assertEqual(done, sorted(done))
+        self.assertEqual((events[-1]["done"], events[-1]["action"]), (stats["bytes"], "compress_item"))
+
+    def test_store_mode(self):
+        stats = ArchiveEngine(workers=1).create_zip(str(self.src), str(self.archive), mode="store")
+        types = self._check_archive()
+        self.assertEqual(set(t for name, t in types.items() if not name.endswith("/")), {zipfile.ZIP_STORED})
+        self.assertGreater(stats["compressed"], stats["bytes"])
+
+    def test_cancel_removes_partial_archive(self):
+        cancel = threading.Event()
+        self.engine.PROGRESS_INTERVAL = 0
+        with self.assertRaises(ArchiveCancelled):
+            self.engine.create_zip(str(self.src), str(self.archive), progress_callback=lambda p: cancel.set(),
+                                   cancel_event=cancel)
+        self.assertFalse(self.archive.exists())
+
+    def test_failed_run_keeps_existing_archive(self):
+        self.archive.write_bytes(b"previous archive")
+        siblings = sorted(os.listdir(self.archive.parent))
+        cancel = threading.Event()
+        cancel.set()
+        with self.assertRaises(ArchiveCancelled):
+            self.engine.create_zip(str(self.src), str(self.archive), cancel_event=cancel)
+        self.assertEqual(self.archive.read_bytes(), b"previous archive")
+        self.assertEqual(sorted(os.listdir(self.archive.parent)), siblings)
+
+        self.archive.unlink()
+        self.engine.create_zip(str(self.src), str(self.archive))
+        self._check_archive()
+        umask = os.umask(0)
+        os.umask(umask)
+        self.assertEqual(self.archive.stat().st_mode & 0o777, 0o666 & ~umask)
+
+    def test_file_manager_compress_item(self):
+        msg = FileManager().compress_item(str(self.src / "data.csv"))
+        self.assertTrue(msg.startswith("Success: Created archive 'data.csv.zip' (1 files"))
+        with zipfile.ZipFile(self.src / "data.csv.zip") as zf:
+            self.assertEqual(zf.read("data.csv"), (self.src / "data.csv").read_bytes())
+
+
+class TestExtraction(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = Path("extract_sandbox").resolve()
+        if self.test_dir.exists():
+            shutil.rmtree(self.test_dir)
+        self.src = self.test_dir / "project"
+        (self.src / "docs").mkdir(parents=True)
+        (self.src / "big.bin").write_bytes(os.urandom(300_000))
+        (self.src / "docs" / "readme.md").write_text("# readme\n")
+        (self.src / "empty").mkdir()
+        self.out = self.test_dir / "out"
+        self.engine = ArchiveEngine(workers=2)
+        self.engine.LARGE_MEMBER = self.engine.BLOCK = 64 * 1024  # big.bin goes to the pool, in several blocks
+
+    def tearDown(self):
+        if self.test_dir.exists():
+            shutil.rmtree(self.test_dir)
+
+    def _zip(self, members: dict) -> str:
+        path = self.test_dir / "crafted.zip"
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+            for name, data in members.items():
+                zf.writestr(name, data)
+        return str(path)
+
+    def _same_tree(self, extracted: Path):
+        for p in self.src.rglob("*"):
+            q = extracted / p.relative_to(self.src)
+            self.assertEqual(q.is_dir(), p.is_dir(), q)
+            if p.is_file():
+                self.assertEqual(q.read_bytes(), p.read_bytes())
+
+    def test_zip_round_trip_with_progress(self):
+        archive = shutil.make_archive(str(self.test_dir / "project"), "zip", self.test_dir, "project")
+        events = []
+        self.engine.PROGRESS_INTERVAL = 0
+        stats = self.engine.extract(archive, str(self.out), progress_callback=events.append)
+        self._same_tree(self.out / "project")
+        self.assertEqual(stats["files"], 2)
+        self.assertEqual(events[-1]["done"], events[-1]["total"])
+        self.assertIn(events[0]["current"], ("project/big.bin", "project/docs/readme.md"))
+
+    def test_tar_stream_with_symlink(self):
+        os.symlink("docs/readme.md", self.src / "README")
+        archive = shutil.make_archive(str(self.test_dir / "project"), "gztar", self.test_dir, "project")
+        self.engine.extract(archive, str(self.out))
+        self._same_tree(self.out / "project")
+        self.assertEqual(os.readlink(self.out / "project" / "README"), "docs/readme.md")
+
+    def test_compression_ratio_limit(self):
+        bomb = self._zip({"ok.txt": b"fine", "zeros.bin": bytes(5 * 1024 * 1024)})
+        with self.assertRaises(ArchiveRejected):
+            self.engine.extract(bomb, str(self.out))
+        self.assertFalse(self.out.exists())  # the destination it created is removed as well
+
+    def test_path_traversal_is_refused(self):
+        self.out.mkdir()
+        evil = self._zip({"a.txt": b"a", "../evil.txt": b"x"})
+        msg = FileManager().extract_archive(evil, str(self.out))
+        self.assertTrue(msg.startswith("Error: Refused"))
+        self.assertEqual(list(self.out.iterdir()), [])
+        self.assertFalse((self.test_dir / "evil.txt").exists())
+
+    def test_rejection_keeps_existing_files(self):
+        self.out.mkdir()
+        (self.out / "keep.txt").write_bytes(b"mine")
+        evil = self._zip({"keep.txt": b"theirs", "ok/other.txt": b"x", "../evil.txt": b"x"})
+        with self.assertRaises(ArchiveRejected):
+            self.engine.extract(evil, str(self.out))
+        self.assertEqual(os.listdir(self.out), ["keep.txt"])
+        self.assertEqual((self.out / "keep.txt").read_bytes(), b"mine")  # refused before anything was written
+
+        archive = shutil.make_archive(str(self.test_dir / "project"), "tar", self.test_dir, "project")
+        (self.out / "project").mkdir()
+        (self.out / "project" / "big.bin").write_bytes(b"old")
+        self.engine.MAX_TOTAL_BYTES = 100_000
+        with self.assertRaises(ArchiveRejected):
+            self.engine.extract(archive, str(self.out))
+        self.assertEqual((self.out / "project" / "big.bin").read_bytes(), b"old")  # not clobbered mid-stream
+        self.assertEqual(sorted(os.listdir(self.out / "project")), ["big.bin"])
+
+        # A successful extraction does replace the existing file
+        self.engine.MAX_TOTAL_BYTES = ArchiveEngine.MAX_TOTAL_BYTES
+        self.engine.extract(archive, str(self.out))
+        self.assertEqual((self.out / "project" / "big.bin").read_bytes(), (self.src / "big.bin").read_bytes())
+        self.assertFalse([p for p in (self.out / "project").iterdir() if p.name.endswith(".part")])
+
+    def test_output_limit_during_tar_stream(self):
+        archive = shutil.make_archive(str(self.test_dir / "project"), "tar", self.test_dir, "project")
+        self.engine.MAX_TOTAL_BYTES = 100_000
+        with self.assertRaises(ArchiveRejected):
+            self.engine.extract(archive, str(self.out))
+        self.assertFalse(self.out.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
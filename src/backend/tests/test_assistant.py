@@ -0,0 +1,177 @@
+import unittest
+import shutil
+import sys
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+
+from src.backend.core.assistant import OSAssistant
+
+
+class TestBatchExecution(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = Path("assistant_sandbox").resolve()
+        if self.test_dir.exists():
+            shutil.rmtree(self.test_dir)
+        (self.test_dir / "out").mkdir(parents=True)
+
+        self.targets = []
+        for i in range(20):
+            f = self.test_dir / f"file_{i:02d}.txt"
+            f.write_bytes(b"x" * 100)
+            self.targets.append(str(f))
+
+        # Keep the test away from the LLM and the real home-folder index
+        with patch('src.backend.core.assistant.LocalLLMClient', MagicMock()), \
+                patch('src.backend.core.assistant.FileCatalog', MagicMock()), \
+                patch('src.backend.core.assistant.CatalogWatcher', MagicMock()), \
+                patch('src.backend.core.assistant.HashCache', MagicMock()):
+            self.assistant = OSAssistant()
+
+    def tearDown(self):
+        if self.test_dir.exists():
+            shutil.rmtree(self.test_dir)
+
+    def test_batch_copy_report(self):
+        """All targets are copied and the report aggregates counts and bytes."""
+        intent = {
+            'action': 'copy_file',
+            'resolved_dst': str(self.test_dir / "out"),
+            'batch_targets': self.targets,
+        }
+        msg = self.assistant._run_execution(intent)
+        report = intent['batch_result']
+
+        self.assertIn("Batch Complete", msg)
+        self.assertEqual(report['total'], 20)
+        self.assertEqual(report['succeeded'], 20)
+        self.assertEqual(report['failed'], 0)
+        self.assertEqual(report['bytes_processed'], 2000)
+        self.assertEqual(len(list((self.test_dir / "out").iterdir())), 20)
+
+    def test_batch_results_keep_order_and_collect_failures(self):
+        """Results come back in target order; failures are listed, not raised."""
+        missing = str(self.test_dir / "ghost.txt")
+        targets = self.targets[:3] + [missing] + self.targets[3:6]
+        intent = {
+            'action': 'copy_file',
+            'resolved_dst': str(self.test_dir / "out"),
+            'batch_targets': targets,
+        }
+        self.assistant._run_execution(intent)
+        report = intent['batch_result']
+
+        self.assertEqual([r['path'] for r in report['results']], targets)
+        self.assertEqual(report['failed'], 1)
+        self.assertEqual(report['failures'][0]['path'], missing)
+        self.assertEqual(report['bytes_processed'], 600)
+
+    def test_only_success_messages_count_as_done(self):
+        """Tool answers that are not "Success" are failures or skips, and big batches drop per-item results."""
+        answers = {self.targets[0]: "Success: ok", self.targets[1]: "Download failed: timed out",
+                   self.targets[2]: "Cancelled: stopped", self.targets[3]: "Info: nothing to do"}
+        self.assistant.batch_report_items = 3
+        intent = {'action': 'copy_file', 'batch_targets': list(answers)}
+        with patch.object(self.assistant, '_run_single_tool', side_effect=lambda i: answers[i['resolved_src']]):
+            self.assistant._run_execution(intent)
+        report = intent['batch_result']
+
+        self.assertEqual((report['succeeded'], report['failed'], report['cancelled']), (1, 2, 1))
+        self.assertEqual(report['bytes_processed'], 100)
+        self.assertNotIn('results', report)
+
+    def test_batch_progress_events(self):
+        """The callback sees monotonically increasing progress ending at total."""
+        events = []
+        intent = {
+            'action': 'copy_file',
+            'resolved_dst': str(self.test_dir / "out"),
+            'batch_targets': self.targets,
+        }
+        self.assistant._run_execution(intent, progress_callback=events.append)
+
+        self.assertTrue(events)
+        done = [e['done'] for e in events]
+        self.assertEqual(done, sorted(done))
+        self.assertEqual(events[-1]['done'], 20)
+        self.assertEqual(events[-1]['bytes'], 2000)
+        self.assertEqual(events[-1]['eta'], 0.0)
+
+    def test_cancel_running_action(self):
+        """Cancelling mid-batch skips the items that have not started."""
+        intent = {
+            'action': 'copy_file',
+            'resolved_dst': str(self.test_dir / "out"),
+            'batch_targets': self.targets,
+        }
+        self.assistant._pending_actions["abc"] = intent
+        self.assistant.batch_concurrency['copy_file'] = 1
+
+        def cancel_after_first(progress):
+            self.assistant.cancel_running_action("abc")
+
+        response = self.assistant.execute_confirmed_action("abc", progress_callback=cancel_after_first)
+
+        report = intent['batch_result']
+        self.assertEqual(response['status'], "CANCELLED")
+        self.assertGreater(report['cancelled'], 0)
+        self.assertEqual(report['succeeded'] + report['cancelled'], 20)
+        self.assertFalse(self.assistant.cancel_running_action("abc"))
+
+    def test_cancel_before_the_run_starts(self):
+        """A Cancel that arrives between confirmation and the worker thread starting still wins."""
+        intent = {'action': 'copy_file', 'resolved_dst': str(self.test_dir / "out"), 'batch_targets': self.targets}
+        self.assistant._pending_actions["early"] = intent
+        self.assistant.register_run("early")
+        self.assertTrue(self.assistant.cancel_running_action("early"))
+
+        response = self.assistant.execute_confirmed_action("early")
+        self.assertEqual(response['status'], "CANCELLED")
+        self.assertEqual(list((self.test_dir / "out").iterdir()), [])
+        self.assertFalse(self.assistant.cancel_running_action("early"))
+
+    def test_duplicates_feed_batch_delete_confirmation(self):
+        """find_duplicates asks to trash every copy except the one kept per group."""
+        (self.test_dir / "dupe.txt").write_bytes(b"x" * 100)
+        intent = {'action': 'find_duplicates', 'path': str(self.test_dir), 'filters': {'extension': 'txt'}}
+        response = self.assistant._plan_duplicate_cleanup(intent)
+
+        self.assertEqual(response['status'], "NEEDS_CONFIRMATION")
+        self.assertEqual(intent['action'], 'delete_file')
+        self.assertEqual(len(intent['duplicate_groups']), 1)
+        self.assertEqual(len(intent['batch_targets']), 20)
+        kept = intent['duplicate_groups'][0]['paths'][0]
+        self.assertNotIn(kept, intent['batch_targets'])
+        self.assertIn(response['action_id'], self.assistant._pending_actions)
+
+    def test_duplicates_are_kept_when_the_kept_copy_changed(self):
+        """Copies are only trashed while the copy being kept still matches the scan."""
+        intent = {'action': 'find_duplicates', 'path': str(self.test_dir), 'filters': {'extension': 'txt'}}
+        response = self.assistant._plan_duplicate_cleanup(intent)
+        Path(intent['duplicate_groups'][0]['paths'][0]).write_bytes(b"y" * 100)
+
+        with patch('src.backend.tools.files.send2trash') as trash:
+            result = self.assistant.execute_confirmed_action(response['action_id'])
+        trash.assert_not_called()
+        self.assertEqual(intent['batch_result']['failed'], 19)
+        self.assertIn("changed since the scan", result['message'])
+
+    def test_changed_copies_are_not_trashed(self):
+        """A copy edited after the scan is no longer a known duplicate and is left in place."""
+        intent = {'action': 'find_duplicates', 'path': str(self.test_dir), 'filters': {'extension': 'txt'}}
+        response = self.assistant._plan_duplicate_cleanup(intent)
+        edited = intent['batch_targets'][0]
+        Path(edited).write_bytes(b"z" * 100)
+
+        with patch('src.backend.tools.files.send2trash') as trash:
+            self.assistant.execute_confirmed_action(response['action_id'])
+        trashed = {call.args[0] for call in trash.call_args_list}
+        self.assertEqual(len(trashed), 18)
+        self.assertNotIn(edited, trashed)
+        self.assertEqual(intent['batch_result']['failures'][0]['path'], edited)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+import unittest
+import shutil
+import os
+import sys
+from pathlib import Path
+from datetime import datetime
+
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+
+from src.backend.core.catalog import FileCatalog
+from src.backend.core.filter import FilterEngine
+from src.backend.tools.files import FileManager
+
+
+class TestFileCatalog(unittest.TestCase):
+
+    def setUp(self):
+        """A small home-like tree, catalogued into a sandbox database."""
+        self.test_dir = Path("catalog_sandbox").resolve()
+        if self.test_dir.exists():
+            shutil.rmtree(self.test_dir)
+        self.docs = self.test_dir / "Documents"
+        (self.docs / "reports" / "2024").mkdir(parents=True)
+        (self.docs / ".git").mkdir()
+
+        (self.docs / "big.pdf").write_bytes(b"\0" * 20_000)
+        (self.docs / "small.pdf").write_bytes(b"\0" * 10)
+        (self.docs / "reports" / "q1.pdf").write_bytes(b"\0" * 5_000)
+        (self.docs / "reports" / "2024" / "q2.PDF").write_bytes(b"\0" * 7_000)
+        (self.docs / "reports" / "notes.txt").write_text("hi")
+        (self.docs / ".git" / "packed.pdf").write_bytes(b"\0" * 50_000)
+
+        old = datetime(2020, 1, 1).timestamp()
+        os.utime(self.docs / "small.pdf", (old, old))
+
+        self.catalog = FileCatalog(db_path=str(self.test_dir / "catalog.db"), roots=[str(self.docs)])
+        self.catalog.refresh()
+        self.engine = FilterEngine(backend="catalog", catalog=self.catalog)
+        self.walker = FilterEngine()
+
+    def tearDown(self):
+        self.catalog.close()
+        if self.test_dir.exists():
+            shutil.rmtree(self.test_dir)
+
+    def _both(self, filters, **kwargs):
+        via_sql = self.engine.apply_filters(str(self.docs), filters, **kwargs)
+        via_walk = self.walker.apply_filters(str(self.docs), filters, **kwargs)
+        return via_sql, via_walk
+
+    def test_queries_match_walk(self):
+        """SQL answers are the same set the filesystem walk returns."""
+        cases = [
+            ({"extension": "pdf"}, {}),
+            ({"extension": "pdf"}, {"recursive": True}),
+            ({"extension": "pdf", "min_size": "6 kb"}, {"recursive": True}),
+            ({"modified_before": "2021-01-01"}, {"recursive": True}),
+            ({"name_contains": "Q"}, {"recursive": True, "max_depth": 1}),
+            ({"extension": "pdf"}, {"recursive": True, "exclude": []}),
+        ]
+        for filters, kwargs in cases:
+            via_sql, via_walk = self._both(filters, **kwargs)
+            self.assertEqual(sorted(via_sql), sorted(via_walk), msg=f"{filters} {kwargs}")
+
+    def test_sorted_top_k(self):
+        via_sql, via_walk = self._both({"extension": "pdf"}, recursive=True, sort_by="size", limit=2)
+        self.assertEqual([p.name for p in via_sql], ["big.pdf", "q2.PDF"])
+        self.assertEqual(via_sql, via_walk)
+
+    def test_staleness_and_refresh(self):
+        """A changed directory is reported stale until refreshed; queries refresh it."""
+        self.assertFalse(self.catalog.is_stale(str(self.docs / "reports")))
+
+        (self.docs / "reports" / "q3.pdf").write_bytes(b"\0" * 9_000)
+        st = os.stat(self.docs / "reports")
+        os.utime(self.docs / "reports", ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        self.assertTrue(self.catalog.is_stale(str(self.docs / "reports")))
+
+        results = self.engine.apply_filters(str(self.docs), {"min_size": "8 kb"}, recursive=True)
+        self.assertIn("q3.pdf", [p.name for p in results])
+        self.assertFalse(self.catalog.is_stale(str(self.docs / "reports")))
+
+    def test_uncovered_folder_falls_back_to_walk(self):
+        outside = self.test_dir / "Elsewhere"
+        outside.mkdir()
+        (outside / "x.pdf").touch()
+        results = self.engine.apply_filters(str(outside), {"extension": "pdf"})
+        self.assertEqual([p.name for p in results], ["x.pdf"])
+
+    def test_file_manager_uses_catalog(self):
+        fm = FileManager(catalog=self.catalog)
+        result = fm.find_files_by_name(str(self.docs), "q*.pdf")
+        self.assertIn("q1.pdf", result)
+        self.assertNotIn("q2.PDF", result)
+
+    def test_ranked_search_tiers(self):
+        """Exact > Starts With > Contains, shorter names first within a tier."""
+        for name in ["report.pdf", "report_final.pdf", "annual_report.pdf", "report"]:
+            (self.docs / "reports" / name).touch()
+        self.catalog.refresh()
+
+        total, hits = self.catalog.search_ranked("report")
+        self.assertEqual(total, 4)
+        self.assertEqual([(score, name) for score, _, name in hits],
+                         [(100, "report"), (80, "report.pdf"), (80, "report_final.pdf"),
+                          (50, "annual_report.pdf")])
+        self.assertEqual(self.catalog.search_ranked("REPORT.PDF")[1][0][0], 100)
+        # Too short for a trigram: answered by a scan, same ranking
+        self.assertEqual([name for _, _, name in self.catalog.search_ranked("q1")[1]], ["q1.pdf"])
+
+    def test_ranked_search_tolerates_typos(self):
+        (self.docs / "reports" / "quarterly_budget.xlsx").touch()
+        self.catalog.refresh()
+
+        for typo in ["quartelry", "quartrly", "quarterlly", "quaxterly"]:
+            total, hits = self.catalog.search_ranked(typo)
+            self.assertEqual([(score, name) for score, _, name in hits],
+                             [(30, "quarterly_budget.xlsx")], msg=typo)
+        self.assertEqual(self.catalog.search_ranked("quartelry", fuzzy=False), (0, []))
+        self.assertEqual(self.catalog.search_ranked("zzzzzz")[0], 0)
+
+    def test_name_index_follows_refresh(self):
+        (self.docs / "small.pdf").unlink()
+        (self.docs / "tiny.pdf").touch()
+        self.catalog.refresh()
+        self.assertEqual(self.catalog.search_ranked("small")[0], 0)
+        self.assertEqual(self.catalog.search_ranked("tiny")[1][0][2], "tiny.pdf")
+        # Directories are catalogued but not ranked as files
+        self.assertEqual(self.catalog.search_ranked("reports")[0], 0)
+
+    def test_name_index_backfilled_for_existing_catalog(self):
+        """A catalog created before the trigram index gets it built on open."""
+        self.catalog._conn.executescript("""
+            DROP TRIGGER files_names_insert; DROP TRIGGER files_names_delete; DROP TABLE names_fts;
+        """)
+        self.catalog.close()
+        self.catalog = FileCatalog(db_path=str(self.test_dir / "catalog.db"), roots=[str(self.docs)])
+        self.assertEqual([name for _, _, name in self.catalog.search_ranked("notes")[1]], ["notes.txt"])
+
+    def test_file_manager_ranked_search(self):
+        fm = FileManager(catalog=self.catalog)
+        result = fm.search_files_ranked("notes")
+        self.assertTrue(result.startswith("Found 1 matches."))
+        self.assertIn(f"{self.docs / 'reports' / 'notes.txt'} (Rank: 80)", result)
+
+
+if __name__ == "__main__":
+    unittest.main()
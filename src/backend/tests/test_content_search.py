@@ -0,0 +1,230 @@
+import unittest
+import shutil
+import threading
+import time
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+
+from src.backend.core.content_search import ContentSearchEngine, _LiteralMatcher, _MultiMatcher
+from src.backend.tools.files import FileManager
+
+
+class TestContentSearch(unittest.TestCase):
+
+    def setUp(self):
+        """A small tree with text, binary, empty and oversized files."""
+        self.test_dir = Path("content_sandbox").resolve()
+        if self.test_dir.exists():
+            shutil.rmtree(self.test_dir)
+        (self.test_dir / "src" / "deep").mkdir(parents=True)
+        (self.test_dir / "node_modules").mkdir()
+
+        (self.test_dir / "notes.txt").write_text("alpha\nbeta TODO one\ngamma\ndelta TODO two\nepsilon\n")
+        (self.test_dir / "src" / "main.py").write_text("import os\n\n# todo: lowercase\nprint('x')")
+        (self.test_dir / "src" / "deep" / "crlf.txt").write_bytes(b"first\r\nsecond TODO\r\n")
+        (self.test_dir / "src" / "image.bin").write_bytes(b"\x89PNG\0\0TODO")
+        (self.test_dir / "src" / "empty.txt").touch()
+        (self.test_dir / "node_modules" / "dep.js").write_text("TODO in a dependency")
+
+        self.engine = ContentSearchEngine(backend="serial")
+
+    def tearDown(self):
+        self.engine.close()
+        if self.test_dir.exists():
+            shutil.rmtree(self.test_dir)
+
+    def _found(self, hits):
+        return {Path(h["path"]).relative_to(self.test_dir).as_posix(): [m["line"] for m in h["matches"]]
+                for h in hits}
+
+    def test_full_paths_and_line_numbers(self):
+        hits = self.engine.search(str(self.test_dir), "TODO")
+        self.assertEqual(self._found(hits), {"notes.txt": [2, 4], "src/deep/crlf.txt": [2]})
+        self.assertTrue(Path(hits[0]["path"]).is_absolute())
+        crlf = next(h for h in hits if h["path"].endswith("crlf.txt"))
+        self.assertEqual(crlf["matches"][0]["text"], "second TODO")
+
+    def test_context_lines(self):
+        hits = self.engine.search(str(self.test_dir), "epsilon", context=2)
+        match = hits[0]["matches"][0]
+        self.assertEqual((match["line"], match["before"], match["after"]), (5, ["gamma", "delta TODO two"], []))
+
+    def test_early_exit_per_file(self):
+        hits = self.engine.search(str(self.test_dir), "TODO", max_matches_per_file=1)
+        self.assertEqual(self._found(hits)["notes.txt"], [2])
+
+    def test_skips_binary_and_oversized_files(self):
+        engine = ContentSearchEngine(backend="serial", max_file_size=30)
+        self.assertEqual(self._found(engine.search(str(self.test_dir), "TODO")), {"src/deep/crlf.txt": [2]})
+        # Binary files are skipped whatever their size
+        self.assertNotIn("src/image.bin", self._found(self.engine.search(str(self.test_dir), "PNG")))
+
+    def test_case_insensitive(self):
+        hits = self.engine.search(str(self.test_dir), "todo", case_sensitive=False)
+        self.assertEqual(set(self._found(hits)), {"notes.txt", "src/deep/crlf.txt", "src/main.py"})
+
+        (self.test_dir / "accents.txt").write_text("Café CRÈME\n", encoding="utf-8")
+        hits = self.engine.search(str(self.test_dir), "café crème", case_sensitive=False)
+        self.assertEqual(set(self._found(hits)), {"accents.txt"})
+
+    def test_match_across_chunk_boundary(self):
+        with patch.object(_LiteralMatcher, "CHUNK", 8):
+            matcher = _LiteralMatcher("needle", case_sensitive=False)
+            self.assertEqual(list(matcher.iter_hits(b"abcdeNEEDLEfghneedle")), [(5, (0,)), (14, (0,))])
+
+    def test_process_pool_matches_serial(self):
+        for i in range(10):
+            (self.test_dir / "src" / f"gen_{i}.txt").write_text("line\n" * i + "TODO\n")
+        pooled = ContentSearchEngine(backend="process", workers=2)
+        pooled.BATCH_FILES = 2
+        try:
+            self.assertEqual(pooled.search(str(self.test_dir), "TODO"),
+                             self.engine.search(str(self.test_dir), "TODO"))
+            # Workers are not forked from this (multi-threaded) process
+            self.assertNotEqual(pooled._pool._mp_context.get_start_method(), "fork")
+        finally:
+            pooled.close()
+
+    def test_pool_yields_before_the_window_fills(self):
+        """A finished batch is handed over while the walk is still producing batches."""
+        pooled = ContentSearchEngine(backend="process", workers=2)  # window of 4 batches
+        paths = [str(self.test_dir / "notes.txt")]
+        produced = []
+
+        def batches():
+            for i in range(3):
+                produced.append(i)
+                yield paths
+                time.sleep(0.5)  # a slow walk; the first batch finishes meanwhile
+
+        matcher = _LiteralMatcher("TODO", case_sensitive=True)
+        options = {"context": 0, "max_matches": 5, "multi": False, "require_all": False,
+                   "max_size": pooled.max_file_size, "sniff": pooled.SNIFF_BYTES}
+        try:
+            hits = pooled._iter_pool(batches(), matcher, options, threading.Event())
+            next(hits)
+            self.assertLess(len(produced), 3)
+            hits.close()
+        finally:
+            pooled.close()
+
+    def test_file_manager_close(self):
+        fm = FileManager()
+        fm.content_search._get_pool()
+        fm.close()
+        self.assertIsNone(fm.content_search._pool)
+
+    def test_stream_pages_and_summary(self):
+        for i in range(7):
+            (self.test_dir / "src" / f"gen_{i}.txt").write_text("TODO\n" * 3)
+        pages = []
+        summary = self.engine.stream(str(self.test_dir), "TODO", pages.append, page_size=5, interval=60)
+        records = [r for page in pages for r in page]
+
+        # The first hit goes out on its own, then full pages, then the remainder
+        self.assertEqual([len(p) for p in pages], [1, 5, 5, 5, 5, 3])
+        self.assertEqual(sorted(records), sorted(self.engine.iter_lines(str(self.test_dir), "TODO")))
+        self.assertIn((str(self.test_dir / "notes.txt"), 4, "delta TODO two"), records)
+        self.assertEqual((summary["records"], summary["files"], summary["cancelled"]), (24, 9, False))
+
+        capped = self.engine.stream(str(self.test_dir), "TODO", lambda page: None, max_results=10)
+        self.assertEqual((capped["records"], capped["truncated"]), (10, True))
+
+    def test_stream_cancel(self):
+        for i in range(20):
+            (self.test_dir / "src" / f"gen_{i}.txt").write_text("TODO\n")
+        cancel = threading.Event()
+        pages = []
+
+        def on_page(page):
+            pages.append(page)
+            cancel.set()  # e.g. the user pressed stop after the first page
+
+        summary = self.engine.stream(str(self.test_dir), "TODO", on_page, page_size=1, cancel_event=cancel)
+        self.assertTrue(summary["cancelled"])
+        self.assertEqual(len(pages), 1)
+
+    def test_pool_stops_when_cancelled(self):
+        for i in range(12):
+            (self.test_dir / "src" / f"gen_{i}.txt").write_text("TODO\n")
+        pooled = ContentSearchEngine(backend="process", workers=2)
+        pooled.BATCH_FILES, pooled.FIRST_BATCH = 4, 1
+        cancel = threading.Event()
+        try:
+            hits = pooled.iter_search(str(self.test_dir), "TODO", cancel_event=cancel)
+            next(hits)
+            cancel.set()
+            self.assertLess(len(list(hits)), 14)
+        finally:
+            pooled.close()
+
+    def test_multi_pattern_single_pass(self):
+        hits = self.engine.search(str(self.test_dir), ["TODO", "gamma", "lowercase", "absent"])
+        by_name = {Path(h["path"]).name: h for h in hits}
+        self.assertEqual(set(by_name), {"notes.txt", "main.py", "crlf.txt"})
+        self.assertEqual(by_name["notes.txt"]["patterns"], {"TODO": 2, "gamma": 3})
+        self.assertEqual([(m["line"], m["patterns"]) for m in by_name["notes.txt"]["matches"]],
+                         [(2, ["TODO"]), (3, ["gamma"]), (4, ["TODO"])])
+
+        both = self.engine.search(str(self.test_dir), ["TODO", "gamma"], require_all=True)
+        self.assertEqual([Path(h["path"]).name for h in both], ["notes.txt"])
+
+    def test_multi_pattern_overlaps_and_case(self):
+        """Every occurrence is reported, including patterns nested in or overlapping others."""
+        text = "uSHErs his HERS".encode()
+        expected = [(1, {1}), (2, {0, 2}), (7, {3}), (11, {0, 2})]
+        for find_limit in (16, 0):  # bytes.find path, then the trie-regex path
+            with patch.object(_MultiMatcher, "FIND_LIMIT", find_limit), patch.object(_MultiMatcher, "CHUNK", 4):
+                matcher = _MultiMatcher(["he", "she", "hers", "his"], case_sensitive=False)
+                hits = {}
+                for start, ids in matcher.iter_hits(text):
+                    hits.setdefault(start, set()).update(ids)
+                self.assertEqual(sorted(hits.items()), expected, msg=f"FIND_LIMIT={find_limit}")
+
+    def test_regex_mode(self):
+        hits = self.engine.search(str(self.test_dir), [r"TODO \w+", r"^# \w+"], regex=True)
+        found = {Path(h["path"]).name: h["patterns"] for h in hits}
+        self.assertEqual(found["notes.txt"], {r"TODO \w+": 2})
+        self.assertEqual(found["main.py"], {r"^# \w+": 3})
+
+    def test_regex_backreferences_keep_their_groups(self):
+        """Patterns that refer to their own groups still match when combined with others."""
+        matcher = _MultiMatcher([r"(a)(b)", r"(\w)\1", r"(?P<q>x)y(?P=q)"], regex=True)
+        self.assertEqual(list(matcher.iter_hits(b"ab ee xyx xyz")), [(0, (0,)), (3, (1,)), (6, (2,))])
+
+    def test_file_manager_reports_lines(self):
+        result = FileManager().find_files_containing_text(str(self.test_dir), "TODO")
+        self.assertIn(str(self.test_dir / "notes.txt"), result)
+        self.assertIn("  4: delta TODO two", result)
+        self.assertTrue(FileManager().find_files_containing_text("no_such_dir", "x").startswith("Error"))
+
+    def test_file_manager_header_counts_exactly(self):
+        """Exactly 20 matching files are reported as 20; only a 21st makes it "20+"."""
+        many = self.test_dir / "many"
+        many.mkdir()
+        for i in range(20):
+            (many / f"f{i:02}.txt").write_text("needle\n")
+        fm = FileManager()
+        result = fm.find_files_containing_text(str(many), "needle")
+        self.assertTrue(result.startswith("Found in 20 files:"), result)
+
+        (many / "f20.txt").write_text("needle\n")
+        result = fm.find_files_containing_text(str(many), "needle")
+        self.assertTrue(result.startswith("Found in 20+ files (first 20 shown):"), result)
+        self.assertEqual(result.count("  1: needle"), 20)
+        result = fm.find_files_containing_patterns(str(many), ["needle"])
+        self.assertTrue(result.startswith("Found in 20+ files (first 20 shown):"), result)
+
+    def test_file_manager_multi_pattern(self):
+        fm = FileManager()
+        result = fm.find_files_containing_patterns(str(self.test_dir), ["todo", "GAMMA"], case_sensitive=False)
+        self.assertIn(f"{self.test_dir / 'notes.txt'} -> 'todo' (line 2), 'GAMMA' (line 3)", result)
+        self.assertTrue(fm.find_files_containing_patterns(str(self.test_dir), ["(unclosed"], regex=True)
+                        .startswith("Error: Invalid pattern"))
+
+
+if __name__ == "__main__":
+    unittest.main()
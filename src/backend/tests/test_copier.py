@@ -0,0 +1,157 @@
+import unittest
+import shutil
+import errno
+import os
+import sys
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+
+from src.backend.core.copier import CopyEngine, CopyCancelled
+from src.backend.tools.files import FileManager
+
+
+class TestCopyEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = Path("copier_sandbox").resolve()
+        if self.test_dir.exists():
+            shutil.rmtree(self.test_dir)
+        (self.test_dir / "out").mkdir(parents=True)
+        self.src = self.test_dir / "data.bin"
+        self.data = os.urandom(300_000)
+        self.src.write_bytes(self.data)
+        os.chmod(self.src, 0o640)
+        os.utime(self.src, (1_000_000_000, 1_000_000_000))
+        self.engine = CopyEngine()
+        self.engine.CHUNK = self.engine.BUFFER = 64 * 1024  # several steps for a small file
+
+    def tearDown(self):
+        if self.test_dir.exists():
+            shutil.rmtree(self.test_dir)
+
+    def _check_copy(self, dst: Path):
+        self.assertEqual(dst.read_bytes(), self.data)
+        self.assertEqual(dst.stat().st_mtime, 1_000_000_000)
+        self.assertEqual(dst.stat().st_mode & 0o777, 0o640)
+
+    def test_fast_path_and_metadata(self):
+        stats = self.engine.copy(str(self.src), str(self.test_dir / "out"))
+        self._check_copy(self.test_dir / "out" / "data.bin")
+        self.assertEqual(stats["bytes"], len(self.data))
+        expected = "copy_file_range" if hasattr(os, "copy_file_range") else \
+            "sendfile" if sys.platform.startswith("linux") else "buffered"
+        self.assertEqual(stats["method"], expected)
+
+    def test_falls_back_when_kernel_refuses(self):
+        refuse = OSError(errno.EXDEV, "Invalid cross-device link")
+        with patch.object(CopyEngine, "_step_copy_file_range", side_effect=refuse), \
+                patch.object(CopyEngine, "_step_sendfile", side_effect=refuse):
+            stats = self.engine.copy(str(self.src), str(self.test_dir / "copy.bin"))
+        self.assertEqual(stats["method"], "buffered")
+        self._check_copy(self.test_dir / "copy.bin")
+
+    def test_progress_reports_bytes(self):
+        events = []
+        self.engine.PROGRESS_INTERVAL = 0
+        self.engine.copy(str(self.src), str(self.test_dir / "copy.bin"), progress_callback=events.append)
+        done = [e["done"] for e in events]
+        self.assertGreater(len(events), 2)
+        self.assertEqual(done, sorted(done))
+        self.assertEqual((events[-1]["done"], events[-1]["total"], events[-1]["unit"]),
+                         (len(self.data), len(self.data), "bytes"))
+
+    def test_cancel_removes_partial_copy(self):
+        cancel = threading.Event()
+        self.engine.PROGRESS_INTERVAL = 0
+        dst = self.test_dir / "copy.bin"
+        with self.assertRaises(CopyCancelled):
+            self.engine.copy(str(self.src), str(dst), progress_callback=lambda p: cancel.set(),
+                             cancel_event=cancel)
+        self.assertFalse(dst.exists())
+        self.assertIn("Cancelled", FileManager().copy_file(str(self.src), str(dst), cancel_event=cancel))
+
+    def test_failed_copy_keeps_existing_destination(self):
+        dst = self.test_dir / "keep.bin"
+        dst.write_bytes(b"old")
+        with self.assertRaises(IsADirectoryError):
+            self.engine.copy(str(self.test_dir / "out"), str(dst))
+        with patch.object(CopyEngine, "_copy_data", side_effect=OSError(errno.EIO, "I/O error")), \
+                self.assertRaises(OSError):
+            self.engine.copy(str(self.src), str(dst))
+        self.assertEqual(dst.read_bytes(), b"old")
+        self.assertEqual(sorted(os.listdir(self.test_dir)), ["data.bin", "keep.bin", "out"])  # no temp files
+
+    def test_same_file_is_refused(self):
+        with self.assertRaises(shutil.SameFileError):
+            self.engine.copy(str(self.src), str(self.test_dir))
+        self.assertEqual(self.src.read_bytes(), self.data)
+
+
+class TestTreeTransfer(unittest.TestCase):
+
+    def setUp(self):
+        """A nested tree with an extension-less file, an empty folder and a relative symlink."""
+        self.test_dir = Path("tree_sandbox").resolve()
+        if self.test_dir.exists():
+            shutil.rmtree(self.test_dir)
+        self.src = self.test_dir / "project"
+        (self.src / "docs" / "img").mkdir(parents=True)
+        (self.src / "empty").mkdir()
+        (self.src / "Makefile").write_bytes(b"all:\n")
+        (self.src / "docs" / "readme.md").write_bytes(b"# readme")
+        (self.src / "docs" / "img" / "logo.png").write_bytes(os.urandom(50_000))
+        os.symlink("docs/readme.md", self.src / "README")
+        (self.test_dir / "out").mkdir()
+        self.engine = CopyEngine(workers=4)
+
+    def tearDown(self):
+        if self.test_dir.exists():
+            shutil.rmtree(self.test_dir)
+
+    def _snapshot(self, root: Path):
+        return {p.relative_to(root).as_posix(): (p.is_symlink() and os.readlink(p)) or
+                (p.read_bytes() if p.is_file() else None) for p in root.rglob("*")}
+
+    def test_copy_tree(self):
+        events = []
+        stats = self.engine.copy_tree(str(self.src), str(self.test_dir / "copy"), progress_callback=events.append)
+        self.assertEqual(self._snapshot(self.test_dir / "copy"), self._snapshot(self.src))
+        self.assertTrue((self.test_dir / "copy" / "README").is_symlink())
+        self.assertEqual((stats["files"], stats["links"], stats["failures"]), (3, 1, []))
+        self.assertEqual((events[-1]["done"], events[-1]["total"]), (3, 3))
+
+    def test_cross_device_move_verifies_then_removes_source(self):
+        before = self._snapshot(self.src)
+        dst = self.test_dir / "moved"
+        with patch("src.backend.core.copier.os.rename", side_effect=OSError(errno.EXDEV, "cross-device")):
+            stats = self.engine.move(str(self.src), str(dst))
+        self.assertEqual(stats["method"], "copy")
+        self.assertEqual(self._snapshot(dst), before)
+        self.assertFalse(self.src.exists())
+
+    def test_failed_move_keeps_source(self):
+        with patch("src.backend.core.copier.os.rename", side_effect=OSError(errno.EXDEV, "cross-device")), \
+                patch("src.backend.core.copier._same_content", return_value=False):
+            stats = self.engine.move(str(self.src), str(self.test_dir / "moved"))
+        self.assertEqual(len(stats["failures"]), 3)
+        self.assertTrue((self.src / "docs" / "readme.md").exists())
+
+    def test_file_manager_uses_filesystem_not_suffix(self):
+        fm = FileManager()
+        out = self.test_dir / "out"
+        self.assertIn("3 files", fm.copy_file(str(self.src), str(out)))
+        self.assertTrue((out / "project" / "docs" / "img" / "logo.png").exists())
+        # An extension-less destination that does not exist is the new name, not a folder
+        fm.copy_file(str(self.src / "Makefile"), str(out / "Makefile2"))
+        self.assertEqual((out / "Makefile2").read_bytes(), b"all:\n")
+        with self.assertRaises(FileNotFoundError):
+            fm.copy_file(str(self.src / "Makefile"), str(self.test_dir / "nowhere") + os.sep)
+        self.assertTrue(fm.move_file(str(self.src), str(out / "renamed")).startswith("Success"))
+        self.assertTrue((out / "renamed" / "README").is_symlink())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import shutil
+import os
+import sys
+from pathlib import Path
+from datetime import datetime
+from unittest.mock import patch
+
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+
+from src.backend.core.dir_listing import DirectoryLister
+from src.backend.tools.files import FileManager
+
+
+class TestDirectoryLister(unittest.TestCase):
+
+    def setUp(self):
+        """Two folders and 50 files whose size and mtime run in opposite directions."""
+        self.test_dir = Path("listing_sandbox").resolve()
+        if self.test_dir.exists():
+            shutil.rmtree(self.test_dir)
+        self.test_dir.mkdir()
+        (self.test_dir / "b_dir").mkdir()
+        (self.test_dir / "A_dir").mkdir()
+        for i in range(50):
+            f = self.test_dir / f"file{i:02d}.txt"
+            f.write_bytes(b"x" * (i * 10))
+            os.utime(f, (1_700_000_000 - i * 60, 1_700_000_000 - i * 60))
+        self.lister = DirectoryLister()
+
+    def tearDown(self):
+        if self.test_dir.exists():
+            shutil.rmtree(self.test_dir)
+
+    def _names(self, page):
+        return [e["name"] for e in page["entries"]]
+
+    def test_name_pages_cover_everything_once(self):
+        names = []
+        offset = 0
+        while True:
+            page = self.lister.list_page(str(self.test_dir), offset=offset, limit=7)
+            names += self._names(page)
+            offset += len(page["entries"])
+            if not page["has_more"]:
+                break
+        self.assertEqual(page["total"], 52)
+        self.assertEqual(names[:3], ["A_dir", "b_dir", "file00.txt"])
+        self.assertEqual(names, ["A_dir", "b_dir"] + [f"file{i:02d}.txt" for i in range(50)])
+        self.assertNotIn("size", page["entries"][0])
+
+    def test_size_and_mtime_sorting_keep_folders_first(self):
+        page = self.lister.list_page(str(self.test_dir), limit=4, sort_by="size")
+        self.assertEqual(self._names(page)[2:], ["file49.txt", "file48.txt"])
+        self.assertEqual([e["size"] for e in page["entries"]], [None, None, 490, 480])
+
+        page = self.lister.list_page(str(self.test_dir), offset=2, limit=2, sort_by="mtime", ascending=True)
+        self.assertEqual(self._names(page), ["file49.txt", "file48.txt"])
+        page = self.lister.list_page(str(self.test_dir), offset=2, limit=1, sort_by="mtime")
+        self.assertEqual((self._names(page), page["entries"][0]["mtime"]), (["file00.txt"], 1_700_000_000))
+
+        with self.assertRaises(ValueError):
+            self.lister.list_page(str(self.test_dir), sort_by="color")
+
+    def test_scan_is_cached_until_the_directory_changes(self):
+        self.lister.list_page(str(self.test_dir), limit=5)
+        with patch("src.backend.core.dir_listing.os.scandir", side_effect=AssertionError("rescanned")):
+            self.lister.list_page(str(self.test_dir), offset=5, limit=5)
+        (self.test_dir / "new.txt").touch()
+        self.assertEqual(self.lister.list_page(str(self.test_dir))["total"], 53)
+
+    def test_file_manager_output(self):
+        fm = FileManager()
+        result = fm.list_directory(str(self.test_dir), limit=3, details=True)
+        lines = result.splitlines()
+        self.assertTrue(lines[0].startswith("[DIR]  A_dir/"))
+        self.assertIn(datetime.fromtimestamp(1_700_000_000).strftime("%Y-%m-%d %H:%M"), lines[2])
+        self.assertEqual(lines[-1], "Showing 1-3 of 52 items (sorted by name). Use offset=3 for the next page.")
+        self.assertTrue(fm.list_directory(str(self.test_dir), offset=99).startswith("Info"))
+        self.assertTrue(fm.list_directory(str(self.test_dir), sort_by="color").startswith("Error"))
+        with self.assertRaises(FileNotFoundError):
+            fm.list_directory(str(self.test_dir / "missing"))
+
+
+if __name__ == "__main__":
+    unittest.main()
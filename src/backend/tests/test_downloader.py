@@ -0,0 +1,190 @@
+import unittest
+import shutil
+import os
+import sys
+import hashlib
+import threading
+from pathlib import Path
+from unittest.mock import patch
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+
+from src.backend.core.downloader import DownloadEngine, DownloadCancelled, DownloadError
+from src.backend.tools.files import FileManager
+
+
+class _RangeHandler(BaseHTTPRequestHandler):
+    """Serves server.payload at any path, with keep-alive and (optionally) single byte ranges."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append((self.client_address, self.headers.get("Range")))
+        server.paths.append(self.path)
+        if "/old" in self.path:
+            self.send_response(302)
+            self.send_header("Location", "/data.bin")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        data, status = server.payload, 200
+        start, end = 0, len(data) - 1
+        rng = self.headers.get("Range")
+        if server.ranges and rng:
+            first, _, last = rng[len("bytes="):].partition("-")
+            start, end, status = int(first), min(int(last), len(data) - 1), 206
+        self.send_response(status)
+        self.send_header("Content-Length", str(end - start + 1))
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+            self.send_header("ETag", server.etag)
+        self.end_headers()
+        body = data[start:end + 1]
+        if server.drop_once and start > 0:
+            server.drop_once = False
+            self.wfile.write(body[:len(body) // 2])
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestDownloadEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = Path("download_sandbox").resolve()
+        if self.test_dir.exists():
+            shutil.rmtree(self.test_dir)
+        self.test_dir.mkdir()
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _RangeHandler)
+        self.server.daemon_threads = True
+        self.server.payload = os.urandom(1_000_000)
+        self.server.ranges, self.server.drop_once, self.server.etag = True, False, '"v1"'
+        self.server.requests, self.server.paths = [], []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/data.bin"
+
+        self.engine = DownloadEngine(workers=3)
+        self.engine.CHUNK = 100_000  # ten ranges
+        self.engine.PARALLEL_BYTES = 0
+        self.engine.PROGRESS_INTERVAL = 0
+        self.engine.RETRY_DELAY = 0.01
+        self.dst = self.test_dir / "data.bin"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if self.test_dir.exists():
+            shutil.rmtree(self.test_dir)
+
+    def test_parallel_ranges_over_keep_alive_connections(self):
+        events = []
+        checksum = "sha256:" + hashlib.sha256(self.server.payload).hexdigest()
+        stats = self.engine.download(self.url, str(self.dst), len(self.server.payload), checksum,
+                                     progress_callback=events.append)
+
+        self.assertEqual(self.dst.read_bytes(), self.server.payload)
+        self.assertEqual(os.listdir(self.test_dir), ["data.bin"])
+        self.assertEqual((stats["ranged"], stats["connections"], stats["resumed"]), (True, 3, 0))
+        ranges = [r for _, r in self.server.requests]
+        self.assertEqual(len(ranges), 11)  # the probe plus one request per chunk
+        self.assertIn("bytes=900000-999999", ranges)
+        self.assertLessEqual(len({addr for addr, _ in self.server.requests}), 3)  # connections were reused
+        self.assertEqual((events[-1]["done"], events[-1]["action"]), (1_000_000, "download_file"))
+
+    def test_cancel_then_resume(self):
+        cancel = threading.Event()
+        self.engine.workers = 1
+
+        def stop_midway(progress):
+            if progress["done"] >= 300_000:
+                cancel.set()
+
+        with self.assertRaises(DownloadCancelled):
+            self.engine.download(self.url, str(self.dst), progress_callback=stop_midway, cancel_event=cancel)
+        self.assertTrue(Path(str(self.dst) + ".part").exists())
+        self.server.requests.clear()
+
+        stats = self.engine.download(self.url, str(self.dst))
+        self.assertEqual(self.dst.read_bytes(), self.server.payload)
+        self.assertGreaterEqual(stats["resumed"], 300_000)
+        self.assertNotIn("bytes=0-99999", [r for _, r in self.server.requests])
+
+        # A changed file on the server (new ETag) is not mixed with the old partial data
+        Path(str(self.dst) + ".part").write_bytes(b"stale")
+        self.server.payload, self.server.etag = os.urandom(500_000), '"v2"'
+        self.assertEqual(self.engine.download(self.url, str(self.dst))["resumed"], 0)
+        self.assertEqual(self.dst.read_bytes(), self.server.payload)
+
+    def test_dropped_connection_is_retried(self):
+        self.server.drop_once = True
+        waits = []
+
+        class RecordingEvent(threading.Event):
+            def wait(self, timeout=None):
+                waits.append(timeout)
+                return super().wait(timeout)
+
+        self.engine.download(self.url, str(self.dst), cancel_event=RecordingEvent())
+        self.assertEqual(self.dst.read_bytes(), self.server.payload)
+        self.assertEqual(waits, [0.01])  # backed off once before the retry
+
+    def test_truncated_part_is_not_resumed(self):
+        cancel = threading.Event()
+        self.engine.workers = 1
+
+        def stop_midway(progress):
+            if progress["done"] >= 300_000:
+                cancel.set()
+
+        with self.assertRaises(DownloadCancelled):
+            self.engine.download(self.url, str(self.dst), progress_callback=stop_midway, cancel_event=cancel)
+        part = Path(str(self.dst) + ".part")
+        part.write_bytes(part.read_bytes()[:1000])  # the recorded chunks are no longer there
+
+        stats = self.engine.download(self.url, str(self.dst))
+        self.assertEqual(stats["resumed"], 0)
+        self.assertEqual(self.dst.read_bytes(), self.server.payload)
+
+    def test_server_without_ranges_and_redirect(self):
+        self.server.ranges = False
+        stats = self.engine.download(self.url.replace("data.bin", "old"), str(self.dst))
+        self.assertEqual(self.dst.read_bytes(), self.server.payload)
+        self.assertEqual((stats["ranged"], stats["connections"]), (False, 1))
+
+    def test_http_proxy_from_environment(self):
+        """With http_proxy set, requests go to the proxy in absolute form."""
+        proxy = f"http://127.0.0.1:{self.server.server_port}"
+        with patch.dict(os.environ, {"http_proxy": proxy, "no_proxy": ""}):
+            self.engine.download("http://files.example/data.bin", str(self.dst))
+        self.assertEqual(self.dst.read_bytes(), self.server.payload)
+        self.assertTrue(all(p.startswith("http://files.example/data.bin") for p in self.server.paths))
+
+    def test_cancel_without_range_support_is_not_resumable(self):
+        self.server.ranges = False
+        cancel = threading.Event()
+        cancel.set()
+        msg = FileManager().download_file(self.url, str(self.dst), cancel_event=cancel)
+        self.assertTrue(msg.startswith("Cancelled"), msg)
+        self.assertNotIn("run it again", msg)
+        self.assertEqual(os.listdir(self.test_dir), [])
+
+    def test_checksum_mismatch_discards_download(self):
+        with self.assertRaises(DownloadError):
+            self.engine.download(self.url, str(self.dst), checksum="0" * 64)
+        self.assertEqual(os.listdir(self.test_dir), [])
+
+    def test_file_manager_download_into_folder(self):
+        msg = FileManager().download_file(self.url + "?token=1", str(self.test_dir), expected_size="1000000")
+        self.assertTrue(msg.startswith("Success: Downloaded to"), msg)
+        self.assertEqual(self.dst.read_bytes(), self.server.payload)
+        self.assertIn("Download failed", FileManager().download_file(self.url, str(self.test_dir / "no" / "x")))
+
+
+if __name__ == "__main__":
+    unittest.main()
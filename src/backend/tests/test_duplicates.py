@@ -0,0 +1,91 @@
+import unittest
+import shutil
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+
+from src.backend.core.duplicates import DuplicateFinder
+from src.backend.core.hash_cache import HashCache
+
+
+class TestDuplicateFinder(unittest.TestCase):
+
+    def setUp(self):
+        """Small and large duplicates, near-duplicates, a hard link and an empty pair."""
+        self.test_dir = Path("dupes_sandbox").resolve()
+        if self.test_dir.exists():
+            shutil.rmtree(self.test_dir)
+        (self.test_dir / "photos" / "backup").mkdir(parents=True)
+        self.cache = HashCache(db_path=":memory:")
+        self.finder = DuplicateFinder(hash_cache=self.cache, workers=4)
+
+        block = DuplicateFinder.PARTIAL_BYTES
+        big = os.urandom(block) + b"m" * (2 * block) + os.urandom(block)
+        self._write("photos/a.jpg", big, age=300)
+        self._write("photos/backup/a copy.jpg", big)
+        # Same size, head and tail: only the full hash tells it apart
+        self._write("photos/near.jpg", big[:2 * block] + b"X" + big[2 * block + 1:])
+        self._write("notes.txt", b"hello", age=200)
+        self._write("photos/notes (1).txt", b"hello")
+        self._write("other.txt", b"world")  # same size, different content
+        self._write("empty1", b"")
+        self._write("empty2", b"")
+        os.link(self.test_dir / "notes.txt", self.test_dir / "photos" / "hardlink.txt")
+
+    def tearDown(self):
+        self.cache.close()
+        if self.test_dir.exists():
+            shutil.rmtree(self.test_dir)
+
+    def _write(self, rel: str, data: bytes, age: float = 100):
+        p = self.test_dir / rel
+        p.write_bytes(data)
+        past = time.time() - age
+        os.utime(p, (past, past))
+
+    def _rel(self, groups):
+        return [[Path(p).relative_to(self.test_dir).as_posix() for p in g["paths"]] for g in groups]
+
+    def test_groups_keep_oldest_first(self):
+        groups = self.finder.find(str(self.test_dir))
+        self.assertEqual(self._rel(groups), [["photos/a.jpg", "photos/backup/a copy.jpg"],
+                                             ["notes.txt", "photos/notes (1).txt"]])
+        self.assertEqual(groups[0]["size"], 4 * DuplicateFinder.PARTIAL_BYTES)
+
+    def test_full_hash_only_for_partial_collisions(self):
+        self.finder.find(str(self.test_dir))
+        # The three big same-size files collide on head/tail; small files never need a full hash
+        self.assertEqual(self.cache.misses, 3)
+
+    def test_filters(self):
+        groups = self.finder.find(str(self.test_dir), {"extension": "txt"})
+        self.assertEqual(self._rel(groups), [["notes.txt", "photos/notes (1).txt"]])
+        self.assertEqual(self.finder.find(str(self.test_dir), {"extension": "png"}), [])
+
+    def test_keeper_unchanged(self):
+        big, small = self.finder.find(str(self.test_dir))
+        self.assertTrue(self.finder.keeper_unchanged(big) and self.finder.keeper_unchanged(small))
+
+        # Same size and mtime but different bytes: only the digest catches it
+        keeper = Path(small["paths"][0])
+        st = keeper.stat()
+        keeper.write_bytes(b"HELLO")
+        os.utime(keeper, ns=(st.st_atime_ns, st.st_mtime_ns))
+        self.assertFalse(self.finder.keeper_unchanged(small))
+
+        os.remove(big["paths"][0])
+        self.assertFalse(self.finder.keeper_unchanged(big))
+
+    def test_copy_unchanged(self):
+        big, small = self.finder.find(str(self.test_dir))
+        copy = small["paths"][1]
+        self.assertTrue(DuplicateFinder.copy_unchanged(small, copy))
+        Path(copy).write_bytes(b"HELLO")  # same size, new mtime
+        self.assertFalse(DuplicateFinder.copy_unchanged(small, copy))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -11,6 +11,7 @@ sys.path.append(str(Path(__file__).parent.parent.parent.parent))
 
 # Now we import using the full path from the root
 from src.backend.tools.files import FileManager
+from src.backend.core.atomic import atomic_rewrite
 
 
 class TestFileManager(unittest.TestCase):
@@ -100,6 +101,40 @@ class TestFileManager(unittest.TestCase):
         self.assertEqual(len(result), 50 + len("\n...[Content Truncated]..."))
         self.assertTrue(result.startswith("AAAAA"))
 
+    def test_read_file_head_tail_and_range(self):
+        """Test the line and byte-range modes, including on a file over the old 10MB limit."""
+        target = self.test_dir / "app.log"
+        with open(target, "wb") as f:
+            f.write(b"\xff" * 11 * 1024 * 1024 + b"\n")  # a huge first line of invalid UTF-8
+            f.write(b"".join(b"line %d\n" % i for i in range(1, 101)))
+        path = str(target)
+
+        self.assertEqual(self.fm.read_file(path, tail=3),
+                         "...[Earlier Content Omitted]...\nline 98\nline 99\nline 100\n")
+        self.assertEqual(self.fm.read_file(path, tail=1), "...[Earlier Content Omitted]...\nline 100\n")
+        self.assertEqual(self.fm.read_file(path, offset=-9), "line 100\n")
+        self.assertEqual(self.fm.read_file(path, offset=-17, length=7), "line 99")
+        self.assertTrue(self.fm.read_file(path, head=2, max_chars=10).endswith("[Content Truncated]..."))
+
+        small = self.test_dir / "small.txt"
+        small.write_bytes(b"a\r\nb\r\nc")
+        self.assertEqual(self.fm.read_file(str(small), head=2), "a\r\nb\r\n")
+        self.assertEqual(self.fm.read_file(str(small), tail=5), "a\r\nb\r\nc")
+        self.assertIn("Error", self.fm.read_file(str(small), head=1, tail=1))
+
+    @unittest.skipUnless(os.path.exists("/proc/version"), "needs procfs")
+    def test_read_file_with_zero_reported_size(self):
+        """Files that report size 0 but have content (procfs) are read without mmap."""
+        with open("/proc/version", "rb") as f:
+            expected = f.read().decode("utf-8", errors="replace")
+        self.assertEqual(self.fm.read_file("/proc/version"), expected[:5000])
+        self.assertEqual(self.fm.read_file("/proc/version", tail=1), expected)
+        self.assertEqual(self.fm.read_file("/proc/version", offset=0, length=5), expected[:5])
+
+        small = self.test_dir / "small.txt"
+        small.write_text("a\nb\n")
+        self.assertEqual(self.fm.read_file(str(small), tail=0), "")
+
     # ==========================================
     # 3. TEST MANIPULATION (Move, Copy, Rename)
     # ==========================================
@@ -145,6 +180,35 @@ class TestFileManager(unittest.TestCase):
         self.assertTrue(dest.exists())  # Copy exists
         self.assertEqual(dest.read_text(), "copy me")
 
+    def test_prepend_to_file_streams_atomically(self):
+        """Test prepending to a multi-chunk file keeps its bytes and mode; a failed rewrite changes nothing."""
+        target = self.test_dir / "big.log"
+        body = b"line\r\n\xff" * 400_000  # ~2.8MB, CRLF and non-UTF-8 bytes kept as-is
+        target.write_bytes(body)
+        os.chmod(target, 0o600)
+
+        msg = self.fm.prepend_to_file(str(target), "HEADER")
+
+        self.assertIn("Success", msg)
+        self.assertEqual(target.read_bytes(), b"HEADER\n" + body)
+        self.assertEqual(target.stat().st_mode & 0o777, 0o600)
+
+        with patch('src.backend.core.atomic.os.replace', side_effect=OSError("disk full")):
+            msg = self.fm.prepend_to_file(str(target), "AGAIN")
+        self.assertIn("Error", msg)
+        self.assertEqual(target.read_bytes(), b"HEADER\n" + body)
+        self.assertEqual(os.listdir(self.test_dir), ["big.log"])  # no temp file left behind
+
+    def test_atomic_rewrite_new_file_follows_current_umask(self):
+        """A file created through atomic_rewrite gets 0o666 minus the umask in effect at the time."""
+        old = os.umask(0o027)
+        try:
+            with atomic_rewrite(str(self.test_dir / "new.bin")) as f:
+                f.write(b"data")
+        finally:
+            os.umask(old)
+        self.assertEqual((self.test_dir / "new.bin").stat().st_mode & 0o777, 0o640)
+
     # ==========================================
     # 4. TEST DELETION (Mocked)
     # ==========================================
@@ -5,6 +5,7 @@ import sys
 import time
 from pathlib import Path
 from datetime import datetime
+from unittest.mock import patch
 
 # --- Fix Imports to find the 'src' folder ---
 sys.path.append(str(Path(__file__).parent.parent.parent.parent))
@@ -155,6 +156,151 @@ class TestFilterEngine(unittest.TestCase):
         self.assertEqual(len(results), 1)
         self.assertEqual(results[0].name, "target.jpg")
 
+    def test_recursive_scan(self):
+        """Recursive mode finds nested files; the default stays one level deep."""
+        nested = self.test_dir / "a" / "b"
+        nested.mkdir(parents=True)
+        (nested / "deep.jpg").touch()
+
+        flat = self.engine.apply_filters(str(self.test_dir), {"extension": "jpg"})
+        self.assertEqual([f.name for f in flat], ["image.jpg"])
+
+        deep = self.engine.apply_filters(str(self.test_dir), {"extension": "jpg"}, recursive=True)
+        self.assertEqual(sorted(f.name for f in deep), ["deep.jpg", "image.jpg"])
+
+    def test_recursive_max_depth(self):
+        """max_depth limits how many levels below the root are scanned."""
+        (self.test_dir / "a" / "b").mkdir(parents=True)
+        (self.test_dir / "a" / "one.jpg").touch()
+        (self.test_dir / "a" / "b" / "two.jpg").touch()
+
+        results = self.engine.apply_filters(str(self.test_dir), {"extension": "jpg"},
+                                            recursive=True, max_depth=1)
+        self.assertEqual(sorted(f.name for f in results), ["image.jpg", "one.jpg"])
+
+    def test_recursive_excludes_and_hidden(self):
+        """Excluded directories are pruned; hidden files follow the policy."""
+        (self.test_dir / "node_modules").mkdir()
+        (self.test_dir / "node_modules" / "pkg.jpg").touch()
+        (self.test_dir / ".hidden.jpg").touch()
+
+        results = self.engine.apply_filters(str(self.test_dir), {"extension": "jpg"},
+                                            recursive=True, include_hidden=False)
+        self.assertEqual([f.name for f in results], ["image.jpg"])
+
+        results = self.engine.apply_filters(str(self.test_dir), {"extension": "jpg"},
+                                            recursive=True, exclude=[])
+        self.assertEqual(sorted(f.name for f in results), [".hidden.jpg", "image.jpg", "pkg.jpg"])
+
+    def test_compile_precomputes(self):
+        """compile() parses sizes/dates/extensions once; the predicate is reusable."""
+        compiled = self.engine.compile({"extensions": ["JPG", " .png"], "min_size": "1 kb",
+                                        "modified_after": "2024-01-01"})
+        self.assertEqual(compiled.extensions, frozenset({".jpg", ".png"}))
+        self.assertEqual(compiled.min_size, 1024)
+        self.assertEqual(compiled.modified_after, datetime(2024, 1, 1).timestamp())
+        self.assertTrue(compiled.needs_stat)
+
+        self.assertTrue(compiled.match_name("a.Jpg"))
+        self.assertFalse(compiled.match_name(".png"))
+
+        # A compiled predicate can be passed straight to apply_filters
+        results = self.engine.apply_filters(str(self.test_dir), self.engine.compile({"extension": "pdf"}))
+        self.assertEqual([f.name for f in results], ["document.pdf"])
+
+    def test_parallel_backend_matches_serial(self):
+        """The parallel walker returns exactly the serial result set."""
+        for i in range(5):
+            sub = self.test_dir / f"dir_{i}" / "inner"
+            sub.mkdir(parents=True)
+            (sub / f"pic_{i}.jpg").touch()
+            (sub.parent / f"doc_{i}.pdf").touch()
+
+        filters = {"extensions": ["jpg", "pdf"]}
+        serial = self.engine.apply_filters(str(self.test_dir), filters, recursive=True)
+        parallel = FilterEngine(backend="parallel", workers=4).apply_filters(
+            str(self.test_dir), filters, recursive=True)
+
+        self.assertEqual(len(serial), 12)
+        self.assertEqual(sorted(serial), sorted(parallel))
+
+        with self.assertRaises(ValueError):
+            FilterEngine(backend="gpu")
+
+    def test_parallel_backend_skips_entries_not_directories(self):
+        """An unreadable file is skipped on its own by both backends; a real bug is raised, not printed."""
+        sub = self.test_dir / "deep"
+        sub.mkdir()
+        for i in range(3):
+            (sub / f"pic_{i}.jpg").write_bytes(b"x")
+        real_list_dir = FilterEngine._list_dir
+
+        class Unreadable:
+            def __init__(self, entry):
+                self.name, self.path = entry.name, entry.path
+
+            def stat(self):
+                raise PermissionError(self.path)
+
+        def list_dir(engine, *args):
+            files, subdirs = real_list_dir(engine, *args)
+            return [Unreadable(e) if e.name == "pic_0.jpg" else e for e in files], subdirs
+
+        filters = {"extension": "jpg", "min_size": "1"}
+        parallel = FilterEngine(backend="parallel", workers=4)
+        with patch.object(FilterEngine, "_list_dir", list_dir):
+            serial = list(self.engine.iter_filters(str(self.test_dir), filters, recursive=True))
+            found = list(parallel.iter_filters(str(self.test_dir), filters, recursive=True))
+        self.assertEqual(sorted(p.name for p in serial), ["pic_1.jpg", "pic_2.jpg"])
+        self.assertEqual(sorted(found), sorted(serial))
+
+        with patch("src.backend.core.filter.CompiledFilter.match_name", side_effect=RuntimeError("bug")):
+            with self.assertRaises(RuntimeError):
+                list(parallel.iter_filters(str(self.test_dir), filters, recursive=True))
+
+    def test_streaming_and_limit(self):
+        """iter_filters yields lazily; limit stops early."""
+        it = self.engine.iter_filters(str(self.test_dir), {"extension": "txt"})
+        first = next(it)
+        self.assertEqual(first.suffix, ".txt")
+        it.close()
+
+        results = self.engine.apply_filters(str(self.test_dir), {}, limit=2)
+        self.assertEqual(len(results), 2)
+
+    def test_sort_by_size_top_k(self):
+        """sort_by + limit returns the k largest (or smallest) files."""
+        results = self.engine.apply_filters(str(self.test_dir), {}, sort_by="size", limit=2)
+        self.assertEqual([f.name for f in results], ["large_1mb.dat", "small_1kb.dat"])
+
+        results = self.engine.apply_filters(str(self.test_dir), {"extension": "txt"},
+                                            sort_by="mtime", ascending=True, limit=1)
+        self.assertEqual(results[0].name, "old_2020.txt")
+
+    def test_sort_and_limit_options_are_checked(self):
+        """LLM-style values are coerced; anything else is an error instead of an empty result."""
+        results = self.engine.apply_filters(str(self.test_dir), {"extension": "txt"},
+                                            sort_by="Date", ascending=True, limit="1")
+        self.assertEqual(results[0].name, "old_2020.txt")
+        self.assertEqual(self.engine.check_options("", " "), (None, None))
+        for sort_by, limit in (("color", None), (None, "ten"), (None, 0)):
+            with self.assertRaises(ValueError):
+                self.engine.apply_filters(str(self.test_dir), {}, sort_by=sort_by, limit=limit)
+
+    def test_count_only(self):
+        count = self.engine.apply_filters(str(self.test_dir), {"extension": "txt"}, count_only=True)
+        self.assertEqual(count, 3)
+
+    def test_parallel_streaming_early_exit(self):
+        """The parallel backend also honours limit and stops its workers."""
+        for i in range(10):
+            (self.test_dir / f"d{i}").mkdir()
+            (self.test_dir / f"d{i}" / f"x{i}.jpg").touch()
+
+        engine = FilterEngine(backend="parallel", workers=4)
+        results = engine.apply_filters(str(self.test_dir), {"extension": "jpg"}, recursive=True, limit=3)
+        self.assertEqual(len(results), 3)
+
     def test_parse_helpers(self):
         """Directly test the helper functions for edge cases."""
         # Test Size Parser
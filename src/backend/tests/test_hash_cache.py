@@ -0,0 +1,95 @@
+import unittest
+import shutil
+import hashlib
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+
+from src.backend.core.hash_cache import HashCache
+from src.backend.tools.files import FileManager
+
+
+class TestHashCache(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = Path("hash_sandbox").resolve()
+        if self.test_dir.exists():
+            shutil.rmtree(self.test_dir)
+        self.test_dir.mkdir()
+        self.cache = HashCache(db_path=str(self.test_dir / "hashes.db"))
+
+    def tearDown(self):
+        self.cache.close()
+        if self.test_dir.exists():
+            shutil.rmtree(self.test_dir)
+
+    def _write(self, name: str, data: bytes, age: float = 60) -> Path:
+        """Writes a file with an mtime 'age' seconds in the past (outside the racy window)."""
+        p = self.test_dir / name
+        p.write_bytes(data)
+        past = time.time() - age
+        os.utime(p, (past, past))
+        return p
+
+    def test_digests_and_cache_hits(self):
+        p = self._write("data.bin", b"hello world" * 1000)
+        for algorithm in ("sha256", "blake2b"):
+            expected = hashlib.new(algorithm, p.read_bytes()).hexdigest()
+            self.assertEqual(self.cache.file_hash(str(p), algorithm), expected)
+            self.assertEqual(self.cache.file_hash(str(p), algorithm), expected)
+        self.assertEqual((self.cache.misses, self.cache.hits), (2, 2))
+        self.assertEqual(self.cache.file_hash(str(self._write("empty", b""))), hashlib.sha256().hexdigest())
+        with self.assertRaises(ValueError):
+            self.cache.file_hash(str(p), "crc32")
+
+    def test_change_invalidates_entry(self):
+        p = self._write("data.txt", b"version one")
+        first = self.cache.file_hash(str(p))
+        p.write_bytes(b"version two")  # same size, new mtime
+        past = time.time() - 30
+        os.utime(p, (past, past))
+        self.assertEqual(self.cache.cached(str(p)), None)
+        self.assertNotEqual(self.cache.file_hash(str(p)), first)
+        self.assertEqual(len(self.cache), 1)  # the stale entry was replaced
+
+    def test_recently_modified_files_are_not_cached(self):
+        p = self._write("fresh.txt", b"still being written", age=0)
+        self.cache.file_hash(str(p))
+        self.assertIsNone(self.cache.cached(str(p)))
+
+    def test_lru_eviction_and_persistence(self):
+        cache = HashCache(db_path=str(self.test_dir / "small.db"), max_entries=2)
+        a, b, c = (self._write(n, n.encode()) for n in ("a", "b", "c"))
+        cache.file_hash(str(a))
+        cache.file_hash(str(b))
+        cache.file_hash(str(a))  # 'a' is now more recently used than 'b'
+        cache.file_hash(str(c))
+        self.assertEqual([cache.cached(str(p)) is not None for p in (a, b, c)], [True, False, True])
+        cache.close()
+
+        reopened = HashCache(db_path=str(self.test_dir / "small.db"), max_entries=2)
+        self.assertEqual(reopened.cached(str(c)), hashlib.sha256(b"c").hexdigest())
+        reopened.close()
+
+    def test_file_manager_hash_and_compare(self):
+        fm = FileManager(hash_cache=self.cache)
+        a = self._write("a.txt", b"same content")
+        b = self._write("b.txt", b"same content")
+        c = self._write("c.txt", b"diff content")
+        d = self._write("d.txt", b"longer content here")
+
+        self.assertEqual(fm.get_file_hash(str(a)), f"SHA256: {hashlib.sha256(b'same content').hexdigest()}")
+        self.assertTrue(fm.get_file_hash(str(a), "blake2b").startswith("BLAKE2B: "))
+        # Files without cached digests are compared byte by byte, never hashed
+        misses = self.cache.misses
+        self.assertEqual(fm.compare_files(str(a), str(b)), "Files are identical.")
+        self.assertEqual(fm.compare_files(str(a), str(c)), "Files are different.")
+        self.assertEqual(fm.compare_files(str(a), str(d)), "Files are different.")
+        self.assertEqual(self.cache.misses, misses)
+
+
+if __name__ == "__main__":
+    unittest.main()
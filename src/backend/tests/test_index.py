@@ -0,0 +1,98 @@
+import unittest
+import shutil
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+
+from src.backend.core.index import FileIndex
+
+
+class TestFileIndex(unittest.TestCase):
+
+    def setUp(self):
+        """Creates two fake home folders and an index over them."""
+        self.test_dir = Path("index_sandbox").resolve()
+        if self.test_dir.exists():
+            shutil.rmtree(self.test_dir)
+        self.desktop = self.test_dir / "Desktop"
+        self.docs = self.test_dir / "Documents"
+        (self.desktop / "work").mkdir(parents=True)
+        (self.docs / "deep" / "er").mkdir(parents=True)
+
+        (self.desktop / "work" / "report.pdf").touch()
+        (self.docs / "deep" / "er" / "notes.txt").touch()
+        (self.docs / "report").touch()
+
+        self.index = FileIndex(db_path=str(self.test_dir / "index.db"),
+                               roots=[str(self.desktop), str(self.docs)])
+        self.index.refresh()
+
+    def tearDown(self):
+        self.index.close()
+        if self.test_dir.exists():
+            shutil.rmtree(self.test_dir)
+
+    def test_lookup_exact_and_stem(self):
+        """Exact names (from any root) win over 'name.*' matches."""
+        self.assertEqual(self.index.lookup("notes.txt"), self.docs / "deep" / "er" / "notes.txt")
+        self.assertEqual(self.index.lookup("notes"), self.docs / "deep" / "er" / "notes.txt")
+        self.assertEqual(self.index.lookup("report"), self.docs / "report")
+        self.assertIsNone(self.index.lookup("missing"))
+
+    def test_lookup_is_case_insensitive(self):
+        self.assertEqual(self.index.lookup("NOTES.TXT"), self.docs / "deep" / "er" / "notes.txt")
+
+    def test_incremental_refresh(self):
+        """Only directories whose mtime changed are re-listed."""
+        self.assertEqual(self.index.refresh(), 0)
+
+        new_file = self.desktop / "work" / "fresh.md"
+        new_file.touch()
+        # Make sure the mtime differs even on coarse-grained filesystems
+        st = os.stat(new_file.parent)
+        os.utime(new_file.parent, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+        self.assertEqual(self.index.refresh(), 1)
+        self.assertEqual(self.index.lookup("fresh.md"), new_file)
+
+    def test_shallow_refresh(self):
+        """max_depth limits both what is re-listed and what may be dropped."""
+        (self.docs / "top.txt").touch()
+        (self.docs / "deep" / "er" / "hidden_deeper.txt").touch()
+        for d in (self.docs, self.docs / "deep" / "er"):
+            st = os.stat(d)
+            os.utime(d, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+        self.assertEqual(self.index.refresh(str(self.docs), max_depth=0), 1)
+        self.assertEqual(self.index.lookup("top.txt"), self.docs / "top.txt")
+        self.assertIsNone(self.index.lookup("hidden_deeper.txt"))
+        self.assertIsNotNone(self.index.lookup("notes.txt"))  # not reached, but not forgotten either
+
+    def test_lookups_are_served_during_refresh(self):
+        """The walk does not hold the lock; only the batched writes do."""
+        index = FileIndex(db_path=str(self.test_dir / "fresh.db"), roots=[str(self.desktop), str(self.docs)])
+        list_dir = index._list_dir
+        lock_free = []
+
+        def listing_while_checking_lock(d):
+            lock_free.append(index._lock.acquire(blocking=False))
+            if lock_free[-1]:
+                index._lock.release()
+            return list_dir(d)
+
+        index._list_dir = listing_while_checking_lock
+        index.refresh()
+        self.assertTrue(lock_free and all(lock_free))
+        self.assertEqual(index.lookup("notes.txt"), self.docs / "deep" / "er" / "notes.txt")
+        index.close()
+
+    def test_removed_directory_is_dropped(self):
+        shutil.rmtree(self.docs / "deep")
+        self.index.refresh()
+        self.assertIsNone(self.index.lookup("notes.txt"))
+
+
+if __name__ == "__main__":
+    unittest.main()
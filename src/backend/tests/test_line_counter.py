@@ -0,0 +1,65 @@
+import unittest
+import shutil
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+
+from src.backend.core.line_counter import LineCounter
+from src.backend.tools.files import FileManager
+
+
+class TestLineCounter(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = Path("lines_sandbox").resolve()
+        if self.test_dir.exists():
+            shutil.rmtree(self.test_dir)
+        self.test_dir.mkdir()
+        self.log = self.test_dir / "app.log"
+        # Invalid UTF-8, CRLF, empty lines, a long line and no trailing newline
+        lines = [b"ok \xff\xfe", b"", b"x" * 5000, b"crlf\r"] * 50 + [b"y" * 7000, b"last"]
+        self.log.write_bytes(b"\n".join(lines))
+        self.expected = {"lines": 202, "bytes": self.log.stat().st_size,
+                         "longest_line": 7000, "longest_line_number": 201}
+
+    def tearDown(self):
+        if self.test_dir.exists():
+            shutil.rmtree(self.test_dir)
+
+    def _count(self, counter: LineCounter) -> dict:
+        stats = counter.count(str(self.log))
+        stats.pop("elapsed")
+        return stats
+
+    def test_serial(self):
+        counter = LineCounter(workers=1)
+        counter.BLOCK = 1000  # lines cross block boundaries
+        self.assertEqual(self._count(counter), self.expected)
+
+    def test_parallel_ranges_stitch_lines(self):
+        counter = LineCounter(workers=3)
+        counter.PARALLEL_BYTES, counter.BLOCK = 0, 777
+        try:
+            self.assertEqual(self._count(counter), self.expected)
+            pool = counter._pool
+            self.assertEqual(self._count(counter), self.expected)
+            self.assertIs(counter._pool, pool)  # started once, reused by later calls
+            self.assertNotEqual(pool._mp_context.get_start_method(), "fork")
+        finally:
+            counter.close()
+        self.assertIsNone(counter._pool)
+
+    def test_file_manager_report(self):
+        fm = FileManager()
+        self.assertEqual(fm.count_lines(str(self.log)),
+                         f"File 'app.log' has 202 lines ({self.expected['bytes']} bytes, "
+                         f"longest line is #201 (7000 bytes)).")
+        empty = self.test_dir / "empty.txt"
+        empty.touch()
+        self.assertEqual(fm.count_lines(str(empty)), "File 'empty.txt' has 0 lines (0 bytes).")
+
+
+if __name__ == "__main__":
+    unittest.main()
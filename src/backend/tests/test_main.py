@@ -0,0 +1,64 @@
+import unittest
+import shutil
+import io
+import os
+import sys
+from pathlib import Path
+from contextlib import redirect_stdout
+
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+
+from main import render_progress
+from src.backend.core.copier import CopyEngine, ByteProgress
+from src.backend.core.archiver import ArchiveEngine
+
+
+class TestRenderProgress(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = Path("cli_sandbox").resolve()
+        if self.test_dir.exists():
+            shutil.rmtree(self.test_dir)
+        self.test_dir.mkdir()
+        self.src = self.test_dir / "data.bin"
+        self.src.write_bytes(os.urandom(3 * 1024 * 1024))
+
+    def tearDown(self):
+        if self.test_dir.exists():
+            shutil.rmtree(self.test_dir)
+
+    def _render(self, run) -> str:
+        out = io.StringIO()
+        with redirect_stdout(out):
+            run()
+        return out.getvalue()
+
+    def test_byte_progress_from_real_engines(self):
+        """Single copies, archives and extraction report bytes, not item counts."""
+        engine = CopyEngine()
+        copied = self._render(lambda: engine.copy(str(self.src), str(self.test_dir / "copy.bin"),
+                                                  progress_callback=render_progress))
+        self.assertIn("Copying 3.0/3.0 MB", copied)
+
+        archiver = ArchiveEngine(workers=1)
+        archive = str(self.test_dir / "data.zip")
+        zipped = self._render(lambda: archiver.create_zip(str(self.src), archive, progress_callback=render_progress))
+        self.assertIn("Compressing 3.0/3.0 MB", zipped)
+        extracted = self._render(lambda: archiver.extract(archive, str(self.test_dir / "out"),
+                                                          progress_callback=render_progress))
+        self.assertIn("Extracting 3.0/3.0 MB", extracted)
+
+    def test_download_and_unknown_total(self):
+        progress = ByteProgress(0, render_progress, 0, action="download_file")
+        line = self._render(lambda: (progress.advance(1024 * 1024), progress.finish()))
+        self.assertIn("Downloading 1.0 MB", line)
+
+    def test_batch_progress(self):
+        line = self._render(lambda: render_progress({"done": 2, "total": 2, "failed": 1, "bytes": 0,
+                                                     "throughput": 0.0, "eta": 0.0}))
+        self.assertIn("[2/2] 0.0 MB @ 0.0 MB/s | failed: 1", line)
+        self.assertTrue(line.endswith("\n"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+import shutil
+import os
+import re
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+
+from src.backend.core.replace import ReplaceEngine
+from src.backend.tools.files import FileManager
+
+
+class TestReplaceEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = Path("replace_sandbox").resolve()
+        if self.test_dir.exists():
+            shutil.rmtree(self.test_dir)
+        self.test_dir.mkdir()
+        self.target = self.test_dir / "config.txt"
+        self.engine = ReplaceEngine()
+        self.engine.CHUNK, self.engine.WINDOW = 7, 6  # tiny chunks: most matches cross a boundary
+
+    def tearDown(self):
+        if self.test_dir.exists():
+            shutil.rmtree(self.test_dir)
+
+    def _run(self, text: str, *args, **kwargs):
+        self.target.write_text(text, encoding="utf-8", newline="")
+        count = self.engine.replace(str(self.target), *args, **kwargs)
+        return count, self.target.read_bytes().decode("utf-8")
+
+    def test_literal_matches_across_chunks(self):
+        text = "host=old-server\r\nbackup=old-server\r\nold-serverold-server é\n" * 5
+        self.assertEqual(self._run(text, "old-server", "new"), (20, text.replace("old-server", "new")))
+
+    def test_regex_mode_with_groups_and_anchors(self):
+        self.engine.WINDOW = 12  # longest match below
+        text = "port = 80\nport=8080\n  port = 1\nairport = 5\n" * 4
+        repl = r"port = \1\1"
+        for pattern in (r"^port\s*=\s*(\d+)", r"(?m)^port\s*=\s*(\d+)", r"(?<!air)port\s*=\s*(\d+)"):
+            expected, n = re.subn(pattern, repl, text)
+            self.assertEqual(self._run(text, pattern, repl, regex=True), (n, expected))
+        self.assertEqual(self._run("aaa", "x*", "-", regex=True), (4, "-a-a-a-"))
+
+    def test_max_replacements(self):
+        self.assertEqual(self._run("ab " * 20, "ab", "X", max_replacements=3),
+                         (3, "X X X " + "ab " * 17))
+
+    def test_no_match_leaves_file_untouched(self):
+        self.target.write_text("nothing here")
+        before = self.target.stat().st_ino
+        self.assertEqual(self.engine.replace(str(self.target), "missing", "x"), 0)
+        self.assertEqual(self.target.stat().st_ino, before)
+        self.assertEqual(os.listdir(self.test_dir), ["config.txt"])
+
+    def test_file_manager_messages(self):
+        fm = FileManager()
+        self.target.write_text("a.b a.b axb")
+        self.assertIn("Replaced 2 occurrences", fm.replace_text(str(self.target), "a.b", "c"))
+        self.assertIn("Replaced 1 occurrence ", fm.replace_text(str(self.target), "a.b", "c", regex=True))
+        self.assertTrue(fm.replace_text(str(self.target), "zzz", "c").startswith("Info"))
+        self.assertTrue(fm.replace_text(str(self.target), "(", "c", regex=True).startswith("Error"))
+        self.assertEqual(self.target.read_text(), "c c c")
+
+
+if __name__ == "__main__":
+    unittest.main()
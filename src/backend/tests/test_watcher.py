@@ -0,0 +1,112 @@
+import unittest
+import shutil
+import time
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+
+from src.backend.core.catalog import FileCatalog
+from src.backend.core.watcher import CatalogWatcher, _Inotify
+from src.backend.core.filter import FilterEngine
+
+
+class TestCatalogWatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = Path("watcher_sandbox").resolve()
+        if self.test_dir.exists():
+            shutil.rmtree(self.test_dir)
+        self.docs = self.test_dir / "Documents"
+        (self.docs / "sub").mkdir(parents=True)
+        (self.docs / "sub" / "existing.txt").write_text("x")
+
+        self.catalog = FileCatalog(db_path=str(self.test_dir / "catalog.db"), roots=[str(self.docs)])
+        self.watcher = None
+
+    def tearDown(self):
+        if self.watcher:
+            self.watcher.stop()
+        self.catalog.close()
+        if self.test_dir.exists():
+            shutil.rmtree(self.test_dir)
+
+    def _wait_for(self, condition, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if condition():
+                return True
+            time.sleep(0.02)
+        return False
+
+    def _start(self, backend, debounce=0.05, poll_interval=0.1):
+        self.watcher = CatalogWatcher(self.catalog, backend=backend, debounce=debounce, poll_interval=poll_interval)
+        self.watcher.start()
+        # Initial catch-up done once the watcher has installed itself as the freshness hook
+        self.assertTrue(self._wait_for(lambda: self.catalog.freshness_hook is not None))
+
+    @unittest.skipUnless(_Inotify.available(), "inotify not available on this platform")
+    def test_inotify_applies_events(self):
+        """Creates, deletes, new subtrees and modifications reach the catalog."""
+        self._start("inotify")
+        self.assertIsNotNone(self.catalog.lookup("existing.txt"))
+
+        (self.docs / "sub" / "new.txt").write_text("hello")
+        (self.docs / "fresh" / "deeper").mkdir(parents=True)
+        (self.docs / "fresh" / "deeper" / "inner.md").write_text("x")
+        (self.docs / "sub" / "existing.txt").unlink()
+
+        self.assertTrue(self._wait_for(lambda: self.catalog.lookup("new.txt") is not None))
+        self.assertTrue(self._wait_for(lambda: self.catalog.lookup("inner.md") is not None))
+        self.assertTrue(self._wait_for(lambda: self.catalog.lookup("existing.txt") is None))
+
+        # Content modification updates the size without touching the directory
+        (self.docs / "sub" / "new.txt").write_text("hello, much longer now")
+        big = FilterEngine().compile({"min_size": "20"})
+        self.assertTrue(self._wait_for(
+            lambda: list(self.catalog.query(str(self.docs), big, recursive=True)) == [str(self.docs / "sub" / "new.txt")]))
+
+        m = self.watcher.metrics()
+        self.assertEqual(m["backend"], "inotify")
+        self.assertGreater(m["events_received"], 0)
+        self.assertGreater(m["watches"], 0)
+
+    @unittest.skipUnless(_Inotify.available(), "inotify not available on this platform")
+    def test_event_storm_is_coalesced(self):
+        self._start("inotify")
+        target = self.docs / "sub" / "log.txt"
+        target.write_text("")
+        for i in range(200):
+            with open(target, "a") as f:
+                f.write(f"line {i}\n")
+        self.assertTrue(self._wait_for(lambda: self.watcher.metrics()["events_coalesced"] > 0))
+        self.assertTrue(self._wait_for(lambda: self.watcher.metrics()["backlog"] == 0))
+
+        # Hundreds of events, only a handful of catalog updates
+        m = self.watcher.metrics()
+        self.assertLess(m["batches_applied"] * 10, m["events_received"])
+
+    @unittest.skipUnless(_Inotify.available(), "inotify not available on this platform")
+    def test_query_sees_changes_without_waiting(self):
+        """ensure_fresh drains queued events itself instead of waiting for the debounce."""
+        self._start("inotify", debounce=1.0)
+        (self.docs / "sub" / "instant.txt").write_text("x")
+        self.catalog.ensure_fresh(str(self.docs / "sub"))
+        self.assertIsNotNone(self.catalog.lookup("instant.txt"))
+
+    def test_polling_queries_refresh(self):
+        """Between polls, a query still catches up with its subtree."""
+        self._start("polling", poll_interval=30)
+        (self.docs / "sub" / "between_polls.txt").write_text("x")
+        self.catalog.ensure_fresh(str(self.docs))
+        self.assertIsNotNone(self.catalog.lookup("between_polls.txt"))
+
+    def test_polling_fallback(self):
+        self._start("polling")
+        (self.docs / "polled.txt").write_text("x")
+        self.assertTrue(self._wait_for(lambda: self.catalog.lookup("polled.txt") is not None))
+        self.assertEqual(self.watcher.metrics()["backend"], "polling")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,15 +1,26 @@
 import os
+import re
 import shutil
 import subprocess
 import platform
-import hashlib
-import filecmp
-import urllib.request
+from urllib.parse import urlsplit, unquote
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Union, List, Optional
 from send2trash import send2trash
 
+from src.backend.core.content_search import ContentSearchEngine
+from src.backend.core.hash_cache import HashCache
+from src.backend.core.duplicates import DuplicateFinder
+from src.backend.core.copier import CopyEngine, CopyCancelled
+from src.backend.core.atomic import CHUNK, atomic_rewrite, copy_stream
+from src.backend.core.replace import ReplaceEngine
+from src.backend.core.line_counter import LineCounter
+from src.backend.core.ranged_read import read_range, head_lines, tail_lines
+from src.backend.core.archiver import ArchiveEngine, ArchiveCancelled, ArchiveRejected
+from src.backend.core.downloader import DownloadEngine, DownloadCancelled
+from src.backend.core.dir_listing import DirectoryLister
+
 
 class FileManager:
     """
@@ -20,8 +31,33 @@ class FileManager:
     3. Content Modification (Edit, Append, Replace)
     4. Search & Organization (Find, Archive, Empty)
     5. System & Network (Open, Download, Links)
+
+    An optional FileCatalog makes the ranked name search an SQL query
+    instead of a walk of the user folders. An optional
+    persistent HashCache makes re-hashing unchanged files free; without
+    one, digests are cached for the life of the process.
     """
 
+    def __init__(self, catalog=None, hash_cache: Optional[HashCache] = None):
+        self.catalog = catalog
+        self.hash_cache = hash_cache if hash_cache is not None else HashCache(db_path=":memory:")
+        # Content and duplicate candidates come from a live scandir walk, not the catalog: the catalog
+        # only notices directory changes, so a file rewritten in place keeps its old size there.
+        self.content_search = ContentSearchEngine()
+        self.duplicates = DuplicateFinder(hash_cache=self.hash_cache)
+        self.copier = CopyEngine()
+        self.replacer = ReplaceEngine()
+        self.line_counter = LineCounter()
+        self.archiver = ArchiveEngine()
+        self.downloader = DownloadEngine()
+        self.lister = DirectoryLister()
+
+    def close(self):
+        """Shuts down the content search and line counting process pools and closes the hash cache."""
+        self.content_search.close()
+        self.line_counter.close()
+        self.hash_cache.close()
+
     # ==========================================
     # 1. CORE OPERATIONS (CRUD)
     # ==========================================
@@ -49,45 +85,72 @@ class FileManager:
         folder_path.mkdir(parents=True, exist_ok=True)
         return f"Success: Folder created at {folder_path.absolute()}"
 
-    def copy_file(self, source: str, destination: str) -> str:
-        """Copies a file. Raises errors if paths are invalid."""
+    def copy_file(self, source: str, destination: str, progress_callback=None, cancel_event=None) -> str:
+        """
+        Copies a file with its metadata (like copy2), through the kernel fast path where available,
+        or a whole folder with its files copied in parallel.
+        progress_callback receives byte progress for a file, file counts for a folder (see CopyEngine).
+        Raises errors if paths are invalid.
+        """
         src_path = Path(source)
-        dst_path = Path(destination)
-
         if not src_path.exists():
             raise FileNotFoundError(f"Source '{src_path.name}' not found.")
+        dst_path = self._transfer_target(src_path, destination)
 
-        # Logic to ensure destination folder exists
-        if src_path.suffix and not dst_path.suffix:
-            # Destination is a folder
-            if not dst_path.exists():
-                raise FileNotFoundError(f"Destination folder '{destination}' not found.")
-        elif dst_path.suffix:
-            # Destination is a file
-            if not dst_path.parent.exists():
-                raise FileNotFoundError(f"Destination directory '{dst_path.parent}' not found.")
-
-        shutil.copy2(str(src_path), str(dst_path))
-        return f"Success: Copied '{src_path.name}' to '{destination}'"
-
-    def move_file(self, source: str, destination: str) -> str:
-        """Moves a file. Checks destination validity."""
+        try:
+            if src_path.is_dir():
+                stats = self.copier.copy_tree(str(src_path), str(dst_path), progress_callback, cancel_event)
+                return self._tree_report("Copied", src_path, dst_path, stats)
+            stats = self.copier.copy(str(src_path), str(dst_path), progress_callback, cancel_event)
+        except CopyCancelled:
+            return f"Cancelled: Copy of '{src_path.name}' stopped; the partial copy was removed."
+        rate = stats["throughput"] / (1024 * 1024)
+        return f"Success: Copied '{src_path.name}' to '{destination}' ({stats['bytes']} bytes, {rate:.1f} MB/s)"
+
+    def move_file(self, source: str, destination: str, progress_callback=None, cancel_event=None) -> str:
+        """
+        Moves a file or folder. A rename on the same filesystem; across filesystems the
+        data is copied (folders in parallel), verified, and only then removed from the source.
+        """
         src_path = Path(source)
-        dst_path = Path(destination)
-
         if not src_path.exists():
             raise FileNotFoundError(f"Source '{src_path.name}' not found.")
+        dst_path = self._transfer_target(src_path, destination)
 
-        if src_path.suffix and not dst_path.suffix:
-            if not dst_path.exists():
-                raise FileNotFoundError(f"Destination folder '{destination}' not found.")
-        elif dst_path.suffix:
-            if not dst_path.parent.exists():
-                raise FileNotFoundError(f"Destination directory '{dst_path.parent}' not found.")
-
-        shutil.move(str(src_path), str(dst_path))
+        try:
+            stats = self.copier.move(str(src_path), str(dst_path), progress_callback, cancel_event)
+        except CopyCancelled:
+            return f"Cancelled: Move of '{src_path.name}' stopped; the source was kept."
+        if stats["method"] == "copy" and src_path.is_dir():
+            return self._tree_report("Moved", src_path, dst_path, stats)
         return f"Success: Moved '{src_path.name}' to '{dst_path.name}'"
 
+    def _transfer_target(self, src_path: Path, destination: str) -> Path:
+        """
+        Final path for a copy/move. An existing folder (or a path ending in a separator)
+        means "into this folder"; anything else is the new path itself.
+        """
+        dst_path = Path(destination)
+        if dst_path.is_dir():
+            return dst_path / src_path.name
+        if destination.endswith(("/", os.sep)):
+            raise FileNotFoundError(f"Destination folder '{destination}' not found.")
+        if not dst_path.parent.exists():
+            raise FileNotFoundError(f"Destination directory '{dst_path.parent}' not found.")
+        return dst_path
+
+    def _tree_report(self, verb: str, src_path: Path, dst_path: Path, stats: Dict) -> str:
+        mb = stats["bytes"] / (1024 * 1024)
+        summary = f"{stats['files']} files, {mb:.2f} MB"
+        if stats["cancelled"]:
+            return f"Cancelled: {verb} {summary} of '{src_path.name}' before stopping; the source was kept."
+        if stats["failures"]:
+            first = stats["failures"][0]
+            kept = "; the source was kept" if verb == "Moved" else ""
+            return (f"Error: {verb} {summary} to '{dst_path}', but {len(stats['failures'])} items failed{kept} "
+                    f"(first: {first['path']}: {first['error']})")
+        return f"Success: {verb} folder '{src_path.name}' to '{dst_path}' ({summary})"
+
     def rename_item(self, old_path: str, new_name: str) -> str:
         """Renames a file or folder in place."""
         target_path = Path(old_path)
@@ -154,43 +217,105 @@ class FileManager:
     # 2. READING & INSPECTION
     # ==========================================
 
-    def list_directory(self, path: str) -> str:
-        """Lists directory contents."""
+    def list_directory(self, path: str, offset: int = 0, limit: int = 200, sort_by: str = "name",
+                       ascending: Optional[bool] = None, details: bool = False) -> str:
+        """
+        Lists one page of directory contents (folders first, marked with a trailing '/').
+        sort_by: 'name', 'size' or 'mtime' (largest/newest first unless ascending=True).
+        details=True adds size and modified-date columns. See list_directory_page for the raw data.
+        """
+        try:
+            page = self.list_directory_page(path, offset, limit, sort_by, ascending, details)
+        except ValueError as e:
+            return f"Error: {str(e)}"
+
+        if not page["total"]:
+            return "Directory is empty."
+        if not page["entries"]:
+            return f"Info: Offset {page['offset']} is past the end ({page['total']} items)."
+
+        items = []
+        for entry in page["entries"]:
+            prefix = "[DIR] " if entry["is_dir"] else "[FILE]"
+            line = f"{prefix} {entry['name']}{'/' if entry['is_dir'] else ''}"
+            if details:
+                size = "" if entry["size"] is None or entry["size"] < 0 else self._format_size(entry["size"])
+                modified = datetime.fromtimestamp(entry["mtime"]).strftime('%Y-%m-%d %H:%M') \
+                    if entry["mtime"] and entry["mtime"] > 0 else ""
+                line = f"{line:<50} {size:>10}  {modified}"
+            items.append(line)
+
+        first, last = page["offset"] + 1, page["offset"] + len(page["entries"])
+        if page["has_more"] or page["offset"]:
+            footer = f"Showing {first}-{last} of {page['total']} items (sorted by {page['sort_by']})."
+            if page["has_more"]:
+                footer += f" Use offset={last} for the next page."
+            items.append(footer)
+        return "\n".join(items)
+
+    def list_directory_page(self, path: str, offset: int = 0, limit: int = 200, sort_by: str = "name",
+                            ascending: Optional[bool] = None, details: bool = False) -> Dict:
+        """Structured page of a directory listing (see DirectoryLister.list_page), for the GUI."""
         target_path = Path(path)
         if not target_path.exists():
             raise FileNotFoundError(f"Directory '{path}' not found.")
-
-        items = []
         try:
-            for item in sorted(target_path.iterdir(), key=lambda x: (not x.is_dir(), x.name.lower())):
-                prefix = "[DIR] " if item.is_dir() else "[FILE]"
-                items.append(f"{prefix} {item.name}")
+            return self.lister.list_page(str(target_path), offset, limit, sort_by, ascending, details)
         except PermissionError:
             raise PermissionError(f"Access denied: '{path}'")
 
-        if not items:
-            return "Directory is empty."
-        return "\n".join(items)
+    @staticmethod
+    def _format_size(size: int) -> str:
+        for unit in ("B", "KB", "MB", "GB"):
+            if size < 1024 or unit == "GB":
+                return f"{size} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+            size /= 1024
 
-    def read_file(self, path: str, max_chars: int = 5000) -> str:
-        """Reads text content. Caps output size."""
+    def read_file(self, path: str, max_chars: int = 5000, offset: Optional[int] = None,
+                  length: Optional[int] = None, head: Optional[int] = None, tail: Optional[int] = None) -> str:
+        """
+        Reads text content. Caps output size (max_chars).
+        By default returns the start of the file; other modes (one at a time):
+        - head=N / tail=N: the first / last N lines,
+        - offset=B (negative = from the end), length=B: a byte range (length defaults to max_chars).
+        Only the requested part is read (see ranged_read), so the size of the file does not matter.
+        """
         target_path = Path(path)
         if not target_path.exists():
             raise FileNotFoundError(f"File '{path}' not found.")
 
-        if target_path.stat().st_size > 10 * 1024 * 1024:
-            return "Error: File is too large (over 10MB)."
+        modes = [offset is not None or length is not None, head is not None, tail is not None]
+        if sum(modes) > 1:
+            return "Error: Use only one of offset/length, head or tail."
 
+        max_bytes = max_chars * 4  # UTF-8 is at most 4 bytes per character
         try:
-            with open(target_path, 'r', encoding='utf-8') as f:
-                content = f.read(max_chars)
-
-            if len(content) == max_chars:
-                content += "\n\n...[Content Truncated]..."
-            return content
+            if head is not None:
+                data, start, end = head_lines(str(target_path), head, max_bytes)
+            elif tail is not None:
+                data, start, end = tail_lines(str(target_path), tail, max_bytes)
+            else:
+                span = max_bytes if length is None else min(length, max_bytes)
+                data, start, end = read_range(str(target_path), offset or 0, span)
+            size = target_path.stat().st_size
         except Exception as e:
             return f"Error reading file: {str(e)}"
 
+        content = data.decode('utf-8', errors='replace')
+        if tail is not None:
+            omitted = bool(content) and (start > 0 or len(content) > max_chars)
+            return ("...[Earlier Content Omitted]...\n" if omitted else "") + content[-max_chars:]
+
+        if head is not None:
+            truncated = end < size and not data.endswith(b"\n")  # stopped by max_bytes mid-line
+        elif offset is not None or length is not None:
+            truncated = length is not None and end < min(size, start + length)
+        else:
+            truncated = end < size
+        if truncated or len(content) > max_chars:
+            content = content[:max_chars] + "\n...[Content Truncated]..."
+        return content
+
     def get_file_info(self, path: str) -> Dict:
         """Returns detailed metadata."""
         p = Path(path)
@@ -209,41 +334,65 @@ class FileManager:
         }
 
     def count_lines(self, path: str) -> str:
-        """Counts lines in a text file."""
+        """
+        Counts lines in a file (any encoding; newline bytes are counted without decoding).
+        Also reports the size and the longest line. Very large files are scanned in parallel.
+        """
         p = Path(path)
         if not p.exists() or p.is_dir():
             raise FileNotFoundError("Target is not a file.")
 
         try:
-            with open(p, 'r', encoding='utf-8') as f:
-                count = sum(1 for _ in f)
-            return f"File '{p.name}' has {count} lines."
+            stats = self.line_counter.count(str(p))
         except Exception as e:
             return f"Error: {str(e)}"
+        longest = ""
+        if stats["lines"]:
+            longest = f", longest line is #{stats['longest_line_number']} ({stats['longest_line']} bytes)"
+        return f"File '{p.name}' has {stats['lines']} lines ({stats['bytes']} bytes{longest})."
 
-    def get_file_hash(self, path: str) -> str:
-        """Calculates SHA256 hash of a file."""
+    def get_file_hash(self, path: str, algorithm: str = "sha256") -> str:
+        """Calculates the hash of a file (sha256 by default, or blake2b, ...); unchanged files come from the cache."""
         p = Path(path)
         if not p.exists() or p.is_dir():
             return "Error: Invalid file for hashing."
 
-        sha256 = hashlib.sha256()
         try:
-            with open(p, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    sha256.update(chunk)
-            return f"SHA256: {sha256.hexdigest()}"
+            digest = self.hash_cache.file_hash(str(p), algorithm)
+            return f"{algorithm.upper()}: {digest}"
         except Exception as e:
             return f"Error hashing: {str(e)}"
 
     def compare_files(self, file1: str, file2: str) -> str:
-        """Checks if two files have identical content."""
+        """
+        Checks if two files have identical content.
+        Different sizes settle it at once. Digests are used only when both are already
+        cached; otherwise the files are compared block by block, stopping at the first
+        difference, so an early mismatch costs one read instead of two full hashes.
+        """
         if not (Path(file1).exists() and Path(file2).exists()):
             return "Error: One or both files not found."
 
-        match = filecmp.cmp(file1, file2, shallow=False)
+        st1, st2 = os.stat(file1), os.stat(file2)
+        if (st1.st_dev, st1.st_ino) == (st2.st_dev, st2.st_ino):
+            match = True
+        elif st1.st_size != st2.st_size:
+            match = False
+        else:
+            d1, d2 = self.hash_cache.cached(file1), self.hash_cache.cached(file2)
+            match = d1 == d2 if d1 and d2 else self._same_bytes(file1, file2)
         return "Files are identical." if match else "Files are different."
 
+    @staticmethod
+    def _same_bytes(file1: str, file2: str) -> bool:
+        with open(file1, "rb") as f1, open(file2, "rb") as f2:
+            while True:
+                b1, b2 = f1.read(CHUNK), f2.read(CHUNK)
+                if b1 != b2:
+                    return False
+                if not b1:
+                    return True
+
     # ==========================================
     # 3. CONTENT MODIFICATION
     # ==========================================
@@ -262,41 +411,46 @@ class FileManager:
             return f"Error: {str(e)}"
 
     def prepend_to_file(self, path: str, content: str) -> str:
-        """Adds text to the beginning of a file."""
+        """
+        Adds text to the beginning of a file.
+        The file is rewritten as a stream (text first, then the original in chunks) into a temp file
+        that atomically replaces it, so memory stays flat on large logs and a crash never truncates it.
+        """
         p = Path(path)
         if not p.exists():
             raise FileNotFoundError(f"File '{path}' not found.")
 
         try:
-            with open(p, 'r', encoding='utf-8') as f:
-                original = f.read()
-            with open(p, 'w', encoding='utf-8') as f:
-                f.write(content + "\n" + original)
+            with open(p, 'rb') as src, atomic_rewrite(str(p)) as dst:
+                dst.write(f"{content}\n".encode('utf-8'))
+                copy_stream(src, dst)
             return f"Success: Prepended to '{p.name}'"
         except Exception as e:
             return f"Error: {str(e)}"
 
-    def replace_text(self, path: str, old_text: str, new_text: str) -> str:
-        """Replaces all occurrences of a string in a file."""
+    def replace_text(self, path: str, old_text: str, new_text: str, regex: bool = False,
+                     max_replacements: Optional[int] = None) -> str:
+        """
+        Replaces occurrences of a string (or a regex, with regex=True) in a file.
+        Streams the file through a temp file that atomically replaces it (see ReplaceEngine),
+        so large files need no more memory than small ones. max_replacements caps the count.
+        """
         p = Path(path)
         if not p.exists():
             raise FileNotFoundError(f"File '{path}' not found.")
 
         try:
-            with open(p, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            if old_text not in content:
-                return f"Info: Text '{old_text}' not found in file."
-
-            new_content = content.replace(old_text, new_text)
-
-            with open(p, 'w', encoding='utf-8') as f:
-                f.write(new_content)
-            return f"Success: Replaced text in '{p.name}'"
+            count = self.replacer.replace(str(p), old_text, new_text, regex=regex,
+                                          max_replacements=max_replacements)
+        except re.error as e:
+            return f"Error: Invalid pattern '{old_text}': {e}"
         except Exception as e:
             return f"Error: {str(e)}"
 
+        if count == 0:
+            return f"Info: Text '{old_text}' not found in file."
+        return f"Success: Replaced {count} occurrence{'s' if count != 1 else ''} in '{p.name}'"
+
     # ==========================================
     # 4. SEARCH & ORGANIZATION
     # ==========================================
@@ -305,6 +459,7 @@ class FileManager:
         """
         Smart search: Scans User folders (Desktop, Documents, etc.)
         Ranks results: Exact Match > Starts With > Contains.
+        With a catalog, near misses (typos) are ranked below those.
         """
         term = term.lower()
         candidates = []
@@ -312,6 +467,15 @@ class FileManager:
         # Directories to scan (recursive)
         search_dirs = ["Desktop", "Documents", "Downloads", "Pictures", "Music", "Videos"]
 
+        if self.catalog is not None:
+            # Catalog path: trigram index lookup, ranked (and typo-tolerant) in SQL
+            self.catalog.ensure_fresh()
+            total, hits = self.catalog.search_ranked(term, limit=15)
+            if not hits:
+                return f"No files found matching '{term}'."
+            top_results = [f"{path} (Rank: {score})" for score, path, _ in hits]
+            return f"Found {total} matches. Top results:\n" + "\n".join(top_results)
+
         for d_name in search_dirs:
             d_path = home / d_name
             if not d_path.exists(): continue
@@ -352,40 +516,96 @@ class FileManager:
         if not matches: return "No matching files found."
         return "\n".join([str(p) for p in matches[:50]])
 
-    def find_files_containing_text(self, root_path: str, text: str) -> str:
-        """Simple grep: Finds files containing specific text."""
+    def find_files_containing_text(self, root_path: str, text: str, case_sensitive: bool = True) -> str:
+        """Grep: Finds files containing specific text, with the matching line numbers."""
+        root = Path(root_path)
+        if not root.exists(): return "Error: Root path not found."
+        # One extra hit tells whether there are more than 20 without scanning the whole tree.
+        hits = self.content_search.search(str(root), text, limit=21, case_sensitive=case_sensitive,
+                                          max_matches_per_file=3)
+        if not hits: return f"No files containing '{text}'."
+
+        header = f"Found in {len(hits)} files:" if len(hits) <= 20 else "Found in 20+ files (first 20 shown):"
+        lines = [header]
+        for hit in hits[:20]:
+            lines.append(hit["path"])
+            lines.extend(f"  {m['line']}: {m['text'].strip()}" for m in hit["matches"])
+        return "\n".join(lines)
+
+    def find_files_containing_patterns(self, root_path: str, patterns: List[str], case_sensitive: bool = True,
+                                       regex: bool = False, match_all: bool = False) -> str:
+        """
+        Multi-pattern grep: each file is scanned once for all patterns.
+        Reports which patterns hit in which file, and where.
+        """
         root = Path(root_path)
-        matches = []
-        for path in root.rglob('*'):
-            if path.is_file():
-                try:
-                    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-                        if text in f.read(): matches.append(path.name)
-                except:
-                    continue
-        return f"Found in: {', '.join(matches[:20])}" if matches else f"No files containing '{text}'."
-
-    def compress_item(self, path: str, format: str = "zip") -> str:
-        """Compresses a file or folder."""
+        if not root.exists(): return "Error: Root path not found."
+        if isinstance(patterns, str): patterns = [patterns]
+        patterns = [p for p in (patterns or []) if p]
+        if not patterns: return "Error: No search patterns given."
+        try:
+            hits = self.content_search.search(str(root), patterns, limit=21, case_sensitive=case_sensitive,
+                                              regex=regex, require_all=match_all, max_matches_per_file=3)
+        except re.error as e:
+            return f"Error: Invalid pattern ({e})."
+        joiner = " and " if match_all else " or "
+        if not hits: return f"No files containing {joiner.join(repr(p) for p in patterns)}."
+
+        header = f"Found in {len(hits)} files:" if len(hits) <= 20 else "Found in 20+ files (first 20 shown):"
+        lines = [header]
+        for hit in hits[:20]:
+            found = ", ".join(f"'{p}' (line {line})" for p, line in hit["patterns"].items())
+            lines.append(f"{hit['path']} -> {found}")
+            lines.extend(f"  {m['line']}: {m['text'].strip()}" for m in hit["matches"])
+        return "\n".join(lines)
+
+    def compress_item(self, path: str, format: str = "zip", mode: str = "deflate",
+                      progress_callback=None, cancel_event=None) -> str:
+        """
+        Compresses a file or folder.
+        Zip archives are built by the ArchiveEngine (parallel deflate, byte progress, cancellable);
+        mode="store" skips compression for already-compressed media. Other formats use shutil.
+        """
         src = Path(path)
         if not src.exists(): return "Error: Source not found."
+        if format != "zip":
+            try:
+                base_name = str(src.parent / src.name)
+                archive_path = shutil.make_archive(base_name, format, src.parent, src.name)
+                return f"Success: Created archive '{Path(archive_path).name}'"
+            except Exception as e:
+                return f"Error compressing: {str(e)}"
+
+        archive_path = src.parent / f"{src.name}.zip"
         try:
-            base_name = str(src.parent / src.name)
-            archive_path = shutil.make_archive(base_name, format, src.parent, src.name)
-            return f"Success: Created archive '{Path(archive_path).name}'"
+            stats = self.archiver.create_zip(str(src), str(archive_path), mode, progress_callback, cancel_event)
+        except ArchiveCancelled:
+            return f"Cancelled: Compression of '{src.name}' stopped; the partial archive was removed."
         except Exception as e:
             return f"Error compressing: {str(e)}"
+        mb = lambda n: n / (1024 * 1024)
+        return (f"Success: Created archive '{archive_path.name}' ({stats['files']} files, "
+                f"{mb(stats['bytes']):.1f} MB -> {mb(stats['compressed']):.1f} MB)")
 
-    def extract_archive(self, path: str, destination: str) -> str:
-        """Extracts a zip/tar archive."""
+    def extract_archive(self, path: str, destination: str, progress_callback=None, cancel_event=None) -> str:
+        """
+        Extracts a zip/tar archive, member by member, with byte progress.
+        Archives that would expand past the size/ratio/member limits or the free disk space,
+        or write outside the destination, are refused (see ArchiveEngine.extract).
+        """
         src = Path(path)
         dst = Path(destination)
         if not src.exists(): return "Error: Archive not found."
         try:
-            shutil.unpack_archive(str(src), str(dst))
-            return f"Success: Extracted to '{dst.name}'"
+            stats = self.archiver.extract(str(src), str(dst), progress_callback, cancel_event)
+        except ArchiveRejected as e:
+            return f"Error: Refused to extract '{src.name}': {e} Nothing was extracted and existing files are unchanged."
+        except ArchiveCancelled:
+            return f"Cancelled: Extraction of '{src.name}' stopped; the extracted files were removed."
         except Exception as e:
             return f"Error extracting: {str(e)}"
+        return (f"Success: Extracted {stats['files']} files "
+                f"({stats['bytes'] / (1024 * 1024):.1f} MB) to '{dst.name}'")
 
     # ==========================================
     # 5. SYSTEM & NETWORK
@@ -408,18 +628,32 @@ class FileManager:
         except Exception as e:
             return f"Error opening file: {str(e)}"
 
-    def download_file(self, url: str, destination: str) -> str:
-        """Downloads a file from a URL."""
+    def download_file(self, url: str, destination: str, expected_size: Optional[int] = None,
+                      checksum: Optional[str] = None, progress_callback=None, cancel_event=None) -> str:
+        """
+        Downloads a file from a URL, in parallel ranges when the server allows it.
+        An interrupted ranged download leaves '<name>.part' behind and is resumed by the next call.
+        checksum is 'sha256:<hex>' (any hashlib algorithm) or a bare sha256 digest.
+        """
         try:
             dst = Path(destination)
             if dst.is_dir():
-                filename = url.split('/')[-1] or "downloaded_file"
+                filename = unquote(urlsplit(url).path.rstrip('/').split('/')[-1]) or "downloaded_file"
                 dst = dst / filename
-
-            urllib.request.urlretrieve(url, str(dst))
-            return f"Success: Downloaded to '{dst.absolute()}'"
+            if not dst.parent.exists():
+                return f"Download failed: Folder '{dst.parent}' does not exist."
+
+            size = int(expected_size) if expected_size is not None else None
+            stats = self.downloader.download(url, str(dst), size, checksum, progress_callback, cancel_event)
+        except DownloadCancelled as e:
+            if e.resumable:
+                return f"Cancelled: Download of '{url}' stopped; run it again to resume from the partial file."
+            return f"Cancelled: Download of '{url}' stopped (the server does not support resuming)."
         except Exception as e:
             return f"Download failed: {str(e)}"
+        resumed = f", {stats['resumed'] / (1024 * 1024):.1f} MB resumed" if stats['resumed'] else ""
+        return (f"Success: Downloaded to '{dst.absolute()}' "
+                f"({stats['bytes'] / (1024 * 1024):.1f} MB{resumed})")
 
     def create_symlink(self, target: str, link_path: str) -> str:
         """Creates a symbolic link (Shortcut)."""
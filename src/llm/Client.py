@@ -26,31 +26,36 @@ class LocalLLMClient:
         --- FILE OPERATIONS (Core) ---
         - create_file(path, content) - Creates new file (overwrites if exists).
         - create_folder(path)
-        - move_file(source, destination)
-        - copy_file(source, destination)
+        - move_file(source, destination) - source may be a file or a whole folder
+        - copy_file(source, destination) - source may be a file or a whole folder
         - rename_item(path, new_name) - new_name is filename only (e.g. "new.txt")
         - delete_file(path) - Moves to Trash (Recoverable).
         - permanently_delete(path) - WARNING: Unrecoverable delete.
         - empty_folder(path) - Deletes all files inside a folder.
 
         --- FILE OPERATIONS (Content & Edit) ---
-        - read_file(path) - Returns text content.
+        - read_file(path, head=null, tail=null, offset=null, length=null) - Returns text content. Use tail=N for "last N lines", head=N for "first N lines", offset/length (bytes) for a range.
         - append_to_file(path, content) - Adds text to the end of a file.
         - prepend_to_file(path, content) - Adds text to the beginning of a file.
-        - replace_text(path, old_text, new_text) - Replaces specific string in file.
-        - count_lines(path) - Returns the number of lines.
+        - replace_text(path, old_text, new_text, regex=false, max_replacements=null) - Replaces specific string in file (or a regex pattern with regex=true).
+        - count_lines(path) - Returns the number of lines, the size and the longest line.
 
         --- FILE OPERATIONS (Advanced) ---
-        - list_directory(path)
+        - list_directory(path, offset, limit, sort_by, details) - One page (default 200 items). sort_by: 'name' (default), 'size', 'mtime'. details: true adds size/date columns. For the next page use the offset given in the output.
         - get_file_info(path) - Size, created date, etc.
-        - get_file_hash(path) - Returns SHA256 hash.
+        - get_file_hash(path, algorithm) - Returns the file hash. algorithm: 'sha256' (default), 'blake2b', 'md5'.
         - compare_files(path, destination) - Returns True if content is identical.
         - search_files(term) - Smart search (ranked by relevance).
         - find_files_by_name(path, pattern) - Recursive search (e.g. pattern="*.py").
-        - find_files_containing_text(path, text) - Search inside files.
-        - compress_item(path, format) - format: 'zip', 'tar'.
+        - find_files_containing_text(path, text) - Search inside files (paths + matching line numbers).
+        - find_files_containing_patterns(path, patterns, case_sensitive, regex, match_all) - One pass for several terms,
+          e.g. "files mentioning invoice, receipt or refund" -> patterns=["invoice", "receipt", "refund"].
+          match_all=true for "mentioning all of"; regex=true only if the user gives a regular expression.
+        - find_duplicates(path, filters) - Finds identical files (e.g. "duplicate photos in Pictures") and offers
+          to move the extra copies to Trash. "filters" is optional and uses the batch filter keys below.
+        - compress_item(path, format, mode) - format: 'zip', 'tar'. mode: 'deflate' (default) or 'store' (no compression, fast; for photos/videos/archives).
         - extract_archive(path, destination)
-        - download_file(url, destination) - Downloads from internet.
+        - download_file(url, destination, checksum, expected_size) - Downloads from internet; resumes interrupted downloads. checksum (optional): 'sha256:<hex>'.
         - create_symlink(source, destination) - Creates a shortcut/link.
         - open_file(path) - Opens in default OS app (Preview, Word, etc).
 
@@ -108,6 +113,12 @@ class LocalLLMClient:
            - "modified_before": Date String (YYYY-MM-DD)
            - "created_after": Date String (YYYY-MM-DD)
            - "created_before": Date String (YYYY-MM-DD)
+           - "recursive": true to include subfolders (e.g. "all PDFs under Documents", "anywhere in")
+           - "max_depth": Integer, how many subfolder levels to descend (only with "recursive")
+           - "include_hidden": true only if the user explicitly asks for hidden/dot files in subfolders
+           - "sort_by": "size" or "mtime" - for "biggest", "largest", "newest", "latest" requests
+           - "ascending": true for "smallest" / "oldest" (used with "sort_by")
+           - "limit": Integer, maximum number of files (e.g. "the 10 biggest videos" -> 10)
 
            Set "source" to the folder to search in (default "cwd" if not specified).
 
@@ -143,7 +154,11 @@ class LocalLLMClient:
         Response: {"action": "compress_item", "path": "Photos", "format": "zip"}
 
         
-        EXAMPLE 6 (Batch Move):
+        EXAMPLE 6 (Duplicates):
+        User: "Clean up duplicate jpgs in Downloads"
+        Response: {"action": "find_duplicates", "path": "Downloads", "filters": {"extension": "jpg"}}
+
+        EXAMPLE 7 (Batch Move):
         User: "Move all pdf files from Desktop to Documents"
         Response: {
           "action": "move_file",